@@ -0,0 +1,339 @@
+"""
+TCP server for sql APIs which does not hold a thread for every client connection.
+
+Idle connections are watched by one selector thread. When a connection has data to read, one step of its
+handler (handshake or one command) is executed in a bounded pool of workers, after that the connection returns
+to the selector. Handler has to implement:
+  - handle_connect() -> bool: handshake and authentication, False if connection has to be closed
+  - handle_command() -> bool: read and answer one command, False if connection has to be closed
+  - has_buffered_data() -> bool: there is already received data which is not visible to the selector
+  - close(): release resources of the handler
+  - socket: current socket of connection (can be replaced by ssl socket during handshake)
+
+Every connection has its own contextvars.Context, so context of the session is kept between steps executed in
+different workers.
+
+Limits:
+  - max_connections: new connections are not accepted (and wait in the listen backlog) while the limit is reached
+  - max_workers: how many commands are executed at the same time
+  - tenant_max_workers: how many commands of one company are executed at the same time, other commands
+        of the company are waiting in the queue
+  - handshake_timeout, read_timeout: seconds, max time of one read from (or one send to) socket during handshake
+        and during command. Reads are blocking and executed in workers, so without timeouts stalled clients
+        could take all workers. Timeout is applied to every send of sendall (see ConnectionSocket): sending of
+        a big result to slow client is not limited while the client receives data.
+
+Long commands also take workers, so count of commands which are executed at the same time is limited by max_workers.
+Because of it the server is enabled by option 'server': 'selector' in config of API, the default is
+server with thread for every connection.
+"""
+import contextvars
+import os
+import selectors
+import socket
+import socketserver
+import threading
+import time
+from collections import defaultdict, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from mindsdb.metrics import metrics
+from mindsdb.utilities import log
+from mindsdb.utilities.context import context as ctx
+
+logger = log.getLogger(__name__)
+
+DEFAULT_MAX_CONNECTIONS = 10000
+DEFAULT_HANDSHAKE_TIMEOUT = 10
+DEFAULT_READ_TIMEOUT = 60
+
+
+class ConnectionSocket(socket.socket):
+    """
+    Socket of client connection: timeout of sendall is applied to every send, not to the whole call
+    """
+
+    @classmethod
+    def from_socket(cls, sock: socket.socket) -> 'ConnectionSocket':
+        return cls(sock.family, sock.type, sock.proto, fileno=sock.detach())
+
+    def sendall(self, data, flags=0):
+        with memoryview(data) as view, view.cast('B') as bytes_view:
+            sent = 0
+            while sent < len(bytes_view):
+                sent += self.send(bytes_view[sent:], flags)
+
+
+class Connection:
+    def __init__(self, handler):
+        self.handler = handler
+        self.context = contextvars.Context()
+        self.connected = False
+        self.company_id = None
+        self.queued_at = None
+
+    @property
+    def socket(self):
+        return self.handler.socket
+
+
+class ConnectionServer:
+    # handlers do not serve connection in constructor if this flag is set on server
+    dispatches_commands = True
+    request_queue_size = 128
+
+    def __init__(
+        self,
+        server_address: tuple,
+        handler_class,
+        api_name: str,
+        max_connections: Optional[int] = None,
+        max_workers: Optional[int] = None,
+        tenant_max_workers: Optional[int] = None,
+        handshake_timeout: Optional[float] = DEFAULT_HANDSHAKE_TIMEOUT,
+        read_timeout: Optional[float] = DEFAULT_READ_TIMEOUT,
+    ):
+        self.server_address = server_address
+        self.handler_class = handler_class
+        self.api_name = api_name
+        self.max_connections = max_connections or DEFAULT_MAX_CONNECTIONS
+        if max_workers is None:
+            max_workers = min(32, (os.cpu_count() or 1) + 4)
+        self.max_workers = max_workers
+        self.tenant_max_workers = tenant_max_workers
+        self.handshake_timeout = handshake_timeout
+        self.read_timeout = read_timeout
+
+        self.socket = socket.create_server(server_address, backlog=self.request_queue_size)
+        self.socket.setblocking(False)
+        self.server_address = self.socket.getsockname()
+
+        self._selector = selectors.DefaultSelector()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f'{api_name}_worker')
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._wakeup_recv.setblocking(False)
+        self._wakeup_send.setblocking(False)
+
+        self._lock = threading.Lock()
+        self._connections = set()
+        # connections which finished step in worker and have to be returned to selector
+        self._returned = deque()
+        self._tenant_running = defaultdict(int)
+        self._tenant_queue = defaultdict(deque)
+        self._is_accepting = False
+        self._shutdown = threading.Event()
+
+    def serve_forever(self):
+        self._selector.register(self._wakeup_recv, selectors.EVENT_READ, None)
+        self._start_accepting()
+        try:
+            while not self._shutdown.is_set():
+                for key, _ in self._selector.select(timeout=1):
+                    if key.fileobj is self.socket:
+                        self._accept()
+                    elif key.fileobj is self._wakeup_recv:
+                        self._drain_wakeup()
+                    else:
+                        self._selector.unregister(key.fileobj)
+                        self._dispatch(key.data)
+                self._process_returned()
+        finally:
+            self._selector.close()
+
+    def shutdown(self):
+        self._shutdown.set()
+        self._wakeup()
+
+    def server_close(self):
+        self.shutdown()
+        self.socket.close()
+        self._executor.shutdown(wait=False)
+        with self._lock:
+            connections = list(self._connections)
+        for connection in connections:
+            self._close(connection)
+
+    def _start_accepting(self):
+        if not self._is_accepting:
+            self._selector.register(self.socket, selectors.EVENT_READ, None)
+            self._is_accepting = True
+
+    def _stop_accepting(self):
+        if self._is_accepting:
+            self._selector.unregister(self.socket)
+            self._is_accepting = False
+
+    def _accept(self):
+        try:
+            request, client_address = self.socket.accept()
+        except (BlockingIOError, InterruptedError):
+            return
+        request = ConnectionSocket.from_socket(request)
+        request.setblocking(True)
+        try:
+            handler = self.handler_class(request, client_address, self)
+        except Exception:
+            logger.exception('Error on connection initialization:')
+            request.close()
+            return
+
+        connection = Connection(handler)
+        with self._lock:
+            self._connections.add(connection)
+            if len(self._connections) >= self.max_connections:
+                # the rest are waiting in listen backlog
+                self._stop_accepting()
+        metrics.API_CONNECTIONS.labels(self.api_name).inc()
+        self._dispatch(connection)
+
+    def _dispatch(self, connection: Connection):
+        connection.queued_at = time.monotonic()
+        company_id = connection.company_id
+        with self._lock:
+            if (
+                connection.connected
+                and self.tenant_max_workers
+                and self._tenant_running[company_id] >= self.tenant_max_workers
+            ):
+                self._tenant_queue[company_id].append(connection)
+                return
+            if connection.connected:
+                self._tenant_running[company_id] += 1
+        self._executor.submit(self._run_step, connection)
+
+    def _run_step(self, connection: Connection):
+        metrics.API_COMMAND_QUEUE_TIME.labels(self.api_name).observe(time.monotonic() - connection.queued_at)
+
+        was_connected = connection.connected
+        company_id = connection.company_id
+        try:
+            connection.socket.settimeout(self.read_timeout if was_connected else self.handshake_timeout)
+            if was_connected:
+                keep_open = connection.context.run(connection.handler.handle_command)
+            else:
+                keep_open = connection.context.run(connection.handler.handle_connect)
+                connection.connected = True
+                connection.company_id = connection.context.run(getattr, ctx, 'company_id', None)
+            keep_open = keep_open is not False and connection.socket.fileno() != -1
+        except socket.timeout:
+            logger.warning(f'Connection to {self.api_name} API is closed: timeout of reading from client')
+            keep_open = False
+        except Exception:
+            logger.exception('Error on processing of connection:')
+            keep_open = False
+
+        if was_connected:
+            with self._lock:
+                self._tenant_running[company_id] -= 1
+                queue = self._tenant_queue.get(company_id)
+                next_connection = None
+                if queue:
+                    next_connection = queue.popleft()
+                    self._tenant_running[company_id] += 1
+                if not queue:
+                    self._tenant_queue.pop(company_id, None)
+                if self._tenant_running[company_id] == 0:
+                    del self._tenant_running[company_id]
+            if next_connection is not None:
+                self._executor.submit(self._run_step, next_connection)
+
+        if not keep_open:
+            self._close(connection)
+            self._wakeup()
+            return
+
+        try:
+            has_data = connection.handler.has_buffered_data()
+        except Exception:
+            has_data = False
+        if has_data:
+            # selector will not notify about data which is already read from socket
+            self._dispatch(connection)
+            return
+
+        self._returned.append(connection)
+        self._wakeup()
+
+    def _process_returned(self):
+        while True:
+            try:
+                connection = self._returned.popleft()
+            except IndexError:
+                break
+            try:
+                self._selector.register(connection.socket, selectors.EVENT_READ, connection)
+            except (ValueError, OSError):
+                # socket is closed
+                self._close(connection)
+
+        with self._lock:
+            has_free_slots = len(self._connections) < self.max_connections
+        if has_free_slots and not self._shutdown.is_set():
+            self._start_accepting()
+
+    def _close(self, connection: Connection):
+        with self._lock:
+            if connection not in self._connections:
+                return
+            self._connections.remove(connection)
+        metrics.API_CONNECTIONS.labels(self.api_name).dec()
+        try:
+            connection.handler.close()
+        except Exception:
+            logger.exception('Error on closing of connection:')
+        try:
+            connection.socket.close()
+        except OSError:
+            pass
+
+    def _wakeup(self):
+        try:
+            self._wakeup_send.send(b'\0')
+        except (BlockingIOError, OSError):
+            # buffer is full, loop will be woken up anyway
+            pass
+
+    def _drain_wakeup(self):
+        try:
+            while self._wakeup_recv.recv(4096):
+                pass
+        except (BlockingIOError, OSError):
+            pass
+
+
+class ThreadingServer(socketserver.ThreadingTCPServer):
+    allow_reuse_address = True
+
+
+def create_server(server_address: tuple, handler_class, api_name: str, api_config: dict):
+    """
+    Create server of sql API using its config:
+      - server: 'threading' (default) or 'selector'
+      - max_connections: max count of open connections
+      - workers: size of pool which executes commands
+      - tenant_workers: max count of commands of one company which are executed at the same time
+      - handshake_timeout, read_timeout: seconds, timeouts of socket operations of handshake and commands
+
+    :param server_address: (host, port)
+    :param handler_class: MysqlProxy or PostgresProxyHandler
+    :param api_name: name of API for logs and metrics
+    :param api_config: config of API
+    :return: server
+    """
+    server_type = api_config.get('server', 'threading')
+    if server_type == 'threading':
+        return ThreadingServer(server_address, handler_class)
+    if server_type != 'selector':
+        raise ValueError(f"Unknown server type of {api_name} API: {server_type}")
+
+    return ConnectionServer(
+        server_address,
+        handler_class,
+        api_name=api_name,
+        max_connections=api_config.get('max_connections'),
+        max_workers=api_config.get('workers'),
+        tenant_max_workers=api_config.get('tenant_workers'),
+        handshake_timeout=api_config.get('handshake_timeout', DEFAULT_HANDSHAKE_TIMEOUT),
+        read_timeout=api_config.get('read_timeout', DEFAULT_READ_TIMEOUT),
+    )
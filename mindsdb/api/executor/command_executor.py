@@ -72,6 +72,7 @@ from mindsdb_sql.parser.dialects.mindsdb import (
 import mindsdb.utilities.profiler as profiler
 from mindsdb.api.executor import Column, SQLQuery, ResultSet
 from mindsdb.api.executor.data_types.answer import ExecuteAnswer
+from mindsdb.api.executor.utilities.statements import RefreshSchema
 from mindsdb.api.mysql.mysql_proxy.libs.constants.mysql import (
     CHARSET_NUMBERS,
     SERVER_VARIABLES,
@@ -94,6 +95,7 @@ from mindsdb.integrations.libs.const import (
 from mindsdb.integrations.libs.response import HandlerStatusResponse
 from mindsdb.interfaces.chatbot.chatbot_controller import ChatBotController
 from mindsdb.interfaces.database.projects import ProjectController
+from mindsdb.interfaces.database.schema_catalog import schema_catalog_controller
 from mindsdb.interfaces.jobs.jobs_controller import JobsController
 from mindsdb.interfaces.model.functions import (
     get_model_record,
@@ -535,6 +537,20 @@ class ExecuteCommands:
                         query_context_controller.drop_query_context(None)
                 elif param == "show_secrets":
                     self.session.show_secrets = value in (1, True)
+                elif param == "stream_batch_size":
+                    try:
+                        if not isinstance(statement.value, Constant):
+                            # expressions are not accepted, including negative numbers
+                            raise ValueError
+                        batch_size = 0 if value in (False, None) else int(str(value))
+                        if batch_size < 0:
+                            raise ValueError
+                    except ValueError:
+                        raise WrongArgumentError(
+                            f'stream_batch_size must be a non-negative integer, got: {statement.value}'
+                        )
+                    # 0 disables streaming
+                    self.session.stream_batch_size = batch_size or None
 
                 return ExecuteAnswer()
             elif category == "autocommit":
@@ -641,6 +657,8 @@ class ExecuteCommands:
             return self.answer_drop_agent(statement, database_name)
         elif type(statement) is UpdateAgent:
             return self.answer_update_agent(statement, database_name)
+        elif type(statement) is RefreshSchema:
+            return self.answer_refresh_schema(statement)
         elif type(statement) is Evaluate:
             statement.data = parse_sql(statement.query_str, dialect="mindsdb")
             return self.answer_evaluate_metric(statement, database_name)
@@ -1198,6 +1216,18 @@ class ExecuteCommands:
                 raise
         return ExecuteAnswer()
 
+    def answer_refresh_schema(self, statement):
+        """answer on 'refresh schema {database}': reload schema catalog of integration"""
+        db_name = statement.name.parts[-1].lower()
+        databases = self.session.database_controller.get_dict()
+        if db_name not in databases:
+            raise BadDbError(f"Database does not exist: {statement.name.parts[-1]}")
+        if databases[db_name]['type'] != 'data':
+            raise WrongArgumentError(f"Schema catalog is used only for integrations: {db_name}")
+
+        schema_catalog_controller.refresh(db_name, self.session.datahub[db_name])
+        return ExecuteAnswer()
+
     def answer_drop_tables(self, statement, database_name):
         """answer on 'drop table [if exists] {name}'
         Args:
@@ -1 +1 @@
-from .session_controller import SessionController
+from .session_controller import SessionController, SessionPool, session_pool
@@ -8,8 +8,14 @@
  * permission of MindsDB Inc
  *******************************************************
 """
+import threading
+from collections import OrderedDict, defaultdict
+from contextlib import contextmanager
+from functools import cached_property
+
 from mindsdb.api.executor.datahub.datahub import init_datahub
 from mindsdb.utilities.config import Config
+from mindsdb.utilities.context import context as ctx
 from mindsdb.interfaces.agents.agents_controller import AgentsController
 from mindsdb.interfaces.model.model_controller import ModelController
 from mindsdb.interfaces.database.database import DatabaseController
@@ -20,10 +26,14 @@ from mindsdb.utilities import log
 
 logger = log.getLogger(__name__)
 
+DEFAULT_MAX_OPEN_CURSORS = 10
+DEFAULT_SESSION_POOL_SIZE = 8
+
 
 class SessionController:
     """
-    This class manages the server session
+    This class manages the server session.
+    Controllers and datahub are created on first access: simple queries don't need most of them
     """
 
     def __init__(self, api_type='http') -> object:
@@ -31,35 +41,74 @@ class SessionController:
         Initialize the session
         """
         self.api_type = api_type
+        self.logging = logger
+        self.config = Config()
+        self.reset()
+
+    def reset(self):
+        """
+        Set state of the session to initial.
+        Datahub and function_controller are dropped: they keep state of the previous user (handlers of the
+        datahub, loaded user functions). Other created controllers are shared with the next user of the session:
+        model_controller, integration_controller, database_controller, skills_controller, agents_controller
+        and kb_controller don't keep state between calls and read the company from context on every call
+        """
         self.username = None
         self.auth = False
-        self.logging = logger
         self.database = None
 
-        self.config = Config()
+        self.prepared_stmts = {}
+        for cursor in getattr(self, 'cursors', {}).values():
+            cursor.close()
+        # server-side cursors of the connection, the oldest are closed if there are too many
+        self.cursors = OrderedDict()
+        self.packet_sequence_number = 0
+        self.profiling = False
+        self.predictor_cache = False if self.config.get('cache')['type'] == 'none' else True
+        self.show_secrets = False
+        # if set: predictor and project steps and wire senders of APIs process results by batches of this size.
+        # Fetch steps still return whole results: data handlers don't return data by parts
+        self.stream_batch_size = self.config.get('executor', {}).get('stream_batch_size')
+
+        # these keep state which can be outdated for the next user of the session
+        for name in ('datahub', 'function_controller'):
+            self.__dict__.pop(name, None)
 
-        self.model_controller = ModelController()
+    @cached_property
+    def model_controller(self):
+        return ModelController()
 
+    @cached_property
+    def integration_controller(self):
         # to prevent circular imports
         from mindsdb.interfaces.database.integrations import integration_controller
-        self.integration_controller = integration_controller
+        return integration_controller
+
+    @cached_property
+    def database_controller(self):
+        return DatabaseController()
+
+    @cached_property
+    def skills_controller(self):
+        return SkillsController()
 
-        self.database_controller = DatabaseController()
-        self.skills_controller = SkillsController()
-        self.function_controller = FunctionController(self)
+    @cached_property
+    def function_controller(self):
+        return FunctionController(self)
 
+    @cached_property
+    def kb_controller(self):
         # to prevent circular imports
         from mindsdb.interfaces.knowledge_base.controller import KnowledgeBaseController
-        self.kb_controller = KnowledgeBaseController(self)
+        return KnowledgeBaseController(self)
 
-        self.datahub = init_datahub(self)
-        self.agents_controller = AgentsController()
+    @cached_property
+    def datahub(self):
+        return init_datahub(self)
 
-        self.prepared_stmts = {}
-        self.packet_sequence_number = 0
-        self.profiling = False
-        self.predictor_cache = False if self.config.get('cache')['type'] == 'none' else True
-        self.show_secrets = False
+    @cached_property
+    def agents_controller(self):
+        return AgentsController()
 
     def inc_packet_sequence_number(self):
         self.packet_sequence_number = (self.packet_sequence_number + 1) % 256
@@ -76,6 +125,24 @@ class SessionController:
 
     def unregister_stmt(self, stmt_id):
         del self.prepared_stmts[stmt_id]
+        self.close_cursor(stmt_id)
+
+    def register_cursor(self, key, cursor):
+        self.close_cursor(key)
+        self.cursors[key] = cursor
+
+        max_cursors = self.config.get('executor', {}).get('max_open_cursors', DEFAULT_MAX_OPEN_CURSORS)
+        while len(self.cursors) > max_cursors:
+            _, oldest_cursor = self.cursors.popitem(last=False)
+            oldest_cursor.close()
+
+    def get_cursor(self, key):
+        return self.cursors.get(key)
+
+    def close_cursor(self, key):
+        cursor = self.cursors.pop(key, None)
+        if cursor is not None:
+            cursor.close()
 
     def to_json(self):
         return {
@@ -89,3 +156,46 @@ class SessionController:
     def from_json(self, updated):
         for key in updated:
             setattr(self, key, updated[key])
+
+
+class SessionPool:
+    """
+    Sessions which are reused between requests of the same company
+    """
+
+    def __init__(self, max_size: int = None):
+        """
+        :param max_size: max count of idle sessions of one company, 'api.http.session_pool_size' in config by default
+        """
+        self.max_size = max_size
+        self._sessions = defaultdict(list)
+        self._lock = threading.Lock()
+
+    def acquire(self, api_type: str = 'http') -> SessionController:
+        key = (ctx.company_id, api_type)
+        with self._lock:
+            sessions = self._sessions.get(key)
+            if sessions:
+                return sessions.pop()
+        return SessionController(api_type=api_type)
+
+    def release(self, session: SessionController):
+        session.reset()
+        max_size = self.max_size
+        if max_size is None:
+            max_size = Config().get('api', {}).get('http', {}).get('session_pool_size', DEFAULT_SESSION_POOL_SIZE)
+        key = (ctx.company_id, session.api_type)
+        with self._lock:
+            if len(self._sessions[key]) < max_size:
+                self._sessions[key].append(session)
+
+    @contextmanager
+    def session(self, api_type: str = 'http'):
+        session = self.acquire(api_type)
+        try:
+            yield session
+        finally:
+            self.release(session)
+
+
+session_pool = SessionPool()
@@ -0,0 +1,60 @@
+from typing import List, Optional
+
+import pandas as pd
+
+from mindsdb.api.executor.sql_query.result_set import ResultSet
+
+
+class ResultCursor:
+    """
+    Server-side cursor over the result of query.
+    Rows are pulled from the result by pages on request of the client, only the fetched page is converted for output.
+    The result is released as soon as all rows are fetched or the cursor is closed.
+    """
+
+    def __init__(self, result_set: ResultSet, json_types: bool = False):
+        self.result_set = result_set
+        self.json_types = json_types
+        self.total = len(result_set)
+        self.position = 0
+        self.closed = False
+
+    @property
+    def is_exhausted(self) -> bool:
+        return self.position >= self.total
+
+    def fetch_df(self, limit: Optional[int] = None) -> pd.DataFrame:
+        """
+        Get next page of rows as raw dataframe of the result
+
+        :param limit: max count of rows, all remaining rows if not set
+        :return: dataframe
+        """
+        if self.is_exhausted:
+            return pd.DataFrame()
+        if self.closed:
+            raise RuntimeError('Cursor is closed')
+
+        end = self.total
+        if limit:
+            end = min(self.position + limit, self.total)
+
+        df = self.result_set.get_raw_df().iloc[self.position: end]
+        self.position = end
+        if self.is_exhausted:
+            # data is not needed anymore
+            self.result_set = None
+        return df
+
+    def fetch(self, limit: Optional[int] = None) -> List[list]:
+        """
+        Get next page of rows
+
+        :param limit: max count of rows, all remaining rows if not set
+        :return: list of rows
+        """
+        return ResultSet._raw_df_to_lists(self.fetch_df(limit), json_types=self.json_types)
+
+    def close(self):
+        self.closed = True
+        self.result_set = None
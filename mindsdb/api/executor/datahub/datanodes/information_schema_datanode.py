@@ -1,4 +1,6 @@
 
+from functools import cached_property
+
 import pandas as pd
 from mindsdb_sql.parser.ast.base import ASTNode
 
@@ -13,6 +15,7 @@ from mindsdb.api.executor import exceptions as exc
 from mindsdb.api.executor.utilities.sql import query_df
 from mindsdb.api.executor.utilities.sql import get_query_tables
 from mindsdb.interfaces.database.projects import ProjectController
+from mindsdb.interfaces.database.schema_catalog import schema_catalog_controller
 
 from mindsdb.utilities import log
 
@@ -45,24 +48,35 @@ class InformationSchemaDataNode(DataNode):
         self.project_controller = ProjectController()
         self.database_controller = session.database_controller
 
-        self.persis_datanodes = {
+        self.tables = {t.name: t for t in self.tables_list}
+
+    @cached_property
+    def persis_datanodes(self):
+        # list of databases is requested only when it is needed
+        persis_datanodes = {
             'log': self.database_controller.logs_db_controller
         }
 
         databases = self.database_controller.get_dict()
         if "files" in databases:
-            self.persis_datanodes["files"] = IntegrationDataNode(
+            persis_datanodes["files"] = IntegrationDataNode(
                 "files",
                 ds_type="file",
                 integration_controller=self.session.integration_controller,
             )
-
-        self.tables = {t.name: t for t in self.tables_list}
+        return persis_datanodes
 
     def __getitem__(self, key):
         return self.get(key)
 
-    def get(self, name):
+    def get(self, name, catalog=None):
+        """
+        Get datanode of database
+
+        :param name: name of database
+        :param catalog: CatalogSnapshot of the query, used instead of requests to catalog
+        :return: datanode or None
+        """
         name_lower = name.lower()
 
         if name_lower == "information_schema":
@@ -74,9 +88,12 @@ class InformationSchemaDataNode(DataNode):
         if name_lower in self.persis_datanodes:
             return self.persis_datanodes[name_lower]
 
-        existing_databases_meta = (
-            self.database_controller.get_dict()
-        )  # filter_type='project'
+        if catalog is not None:
+            existing_databases_meta = catalog.get_databases_dict()
+        else:
+            existing_databases_meta = (
+                self.database_controller.get_dict()
+            )  # filter_type='project'
         database_name = None
         for key in existing_databases_meta:
             if key.lower() == name_lower:
@@ -87,15 +104,17 @@ class InformationSchemaDataNode(DataNode):
             return None
 
         database_meta = existing_databases_meta[database_name]
-        if database_meta["type"] == "integration":
-            integration = self.integration_controller.get(name=database_name)
+        if database_meta["type"] in ("integration", "data"):
             return IntegrationDataNode(
                 database_name,
-                ds_type=integration["engine"],
+                ds_type=database_meta["engine"],
                 integration_controller=self.session.integration_controller,
             )
         if database_meta["type"] == "project":
-            project = self.database_controller.get_project(name=database_name)
+            if catalog is not None:
+                project = catalog.get_project(database_name)
+            else:
+                project = self.database_controller.get_project(name=database_name)
             return ProjectDataNode(
                 project=project,
                 integration_controller=self.session.integration_controller,
@@ -136,6 +155,22 @@ class InformationSchemaDataNode(DataNode):
         # remove files from list to prevent doubling in 'select from INFORMATION_SCHEMA.TABLES'
         return [x.lower() for x in integration_names if x not in ("files",)]
 
+    def get_integration_schema(self, name, table_names=None, with_columns=True):
+        """
+        Tables of integration from schema catalog
+
+        :param name: name of integration
+        :param table_names: return only these tables
+        :param with_columns: columns of tables are required
+        :return: list of tables: {'name', 'type', 'columns': [{'name', 'type'}]}
+        """
+        return schema_catalog_controller.get_tables(
+            name,
+            lambda: self.get(name),
+            table_names=table_names,
+            with_columns=with_columns,
+        )
+
     def get_projects_names(self):
         projects = self.database_controller.get_dict(filter_type="project")
         return [x.lower() for x in projects]
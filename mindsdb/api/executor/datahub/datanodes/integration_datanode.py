@@ -15,6 +15,7 @@ from mindsdb.api.executor.data_types.response_type import RESPONSE_TYPE
 from mindsdb.api.executor.datahub.classes.tables_row import TablesRow
 from mindsdb.api.executor.sql_query.result_set import ResultSet
 from mindsdb.integrations.utilities.utils import get_class_name
+from mindsdb.interfaces.database.schema_catalog import schema_catalog_controller
 from mindsdb.metrics import metrics
 from mindsdb.utilities import log
 from mindsdb.utilities.profiler import profiler
@@ -33,13 +34,20 @@ class IntegrationDataNode(DataNode):
         self.integration_name = integration_name
         self.ds_type = ds_type
         self.integration_controller = integration_controller
-        self.integration_handler = self.integration_controller.get_data_handler(self.integration_name)
+
+    def data_handler(self):
+        """
+        Handler from pool of integration, it has to be used for one operation:
+            with self.data_handler() as handler:
+        """
+        return self.integration_controller.data_handler(self.integration_name)
 
     def get_type(self):
         return self.type
 
     def get_tables(self):
-        response = self.integration_handler.get_tables()
+        with self.data_handler() as handler:
+            response = handler.get_tables()
         if response.type == RESPONSE_TYPE.TABLE:
             result_dict = response.data_frame.to_dict(orient='records')
             result = []
@@ -54,7 +62,8 @@ class IntegrationDataNode(DataNode):
         return True
 
     def get_table_columns(self, tableName):
-        response = self.integration_handler.get_columns(tableName)
+        with self.data_handler() as handler:
+            response = handler.get_columns(tableName)
         if response.type == RESPONSE_TYPE.TABLE:
             df = response.data_frame
             # case independent
@@ -97,6 +106,7 @@ class IntegrationDataNode(DataNode):
         result = self._query(drop_ast)
         if result.type == RESPONSE_TYPE.ERROR:
             raise Exception(result.error_message)
+        schema_catalog_controller.invalidate(self.integration_name)
 
     def create_table(self, table_name: Identifier, result_set: ResultSet = None, columns=None,
                      is_replace=False, is_create=False):
@@ -146,17 +156,19 @@ class IntegrationDataNode(DataNode):
             result = self._query(create_table_ast)
             if result.type == RESPONSE_TYPE.ERROR:
                 raise Exception(result.error_message)
+            schema_catalog_controller.invalidate(self.integration_name)
 
         if result_set is None:
             # it is just a 'create table'
             return
 
         # native insert
-        if hasattr(self.integration_handler, 'insert'):
-            df = result_set.to_df()
+        with self.data_handler() as handler:
+            if hasattr(handler, 'insert'):
+                df = result_set.to_df()
 
-            self.integration_handler.insert(table_name.parts[-1], df)
-            return
+                handler.insert(table_name.parts[-1], df)
+                return
 
         insert_columns = [Identifier(parts=[x.alias]) for x in result_set.columns]
 
@@ -198,34 +210,36 @@ class IntegrationDataNode(DataNode):
             raise Exception(result.error_message)
 
     def _query(self, query):
-        time_before_query = time.perf_counter()
-        result = self.integration_handler.query(query)
-        elapsed_seconds = time.perf_counter() - time_before_query
+        with self.data_handler() as handler:
+            time_before_query = time.perf_counter()
+            result = handler.query(query)
+            elapsed_seconds = time.perf_counter() - time_before_query
         query_time_with_labels = metrics.INTEGRATION_HANDLER_QUERY_TIME.labels(
-            get_class_name(self.integration_handler), result.type)
+            get_class_name(handler), result.type)
         query_time_with_labels.observe(elapsed_seconds)
 
         num_rows = 0
         if result.data_frame is not None:
             num_rows = len(result.data_frame.index)
         response_size_with_labels = metrics.INTEGRATION_HANDLER_RESPONSE_SIZE.labels(
-            get_class_name(self.integration_handler), result.type)
+            get_class_name(handler), result.type)
         response_size_with_labels.observe(num_rows)
         return result
 
     def _native_query(self, native_query):
-        time_before_query = time.perf_counter()
-        result = self.integration_handler.native_query(native_query)
-        elapsed_seconds = time.perf_counter() - time_before_query
+        with self.data_handler() as handler:
+            time_before_query = time.perf_counter()
+            result = handler.native_query(native_query)
+            elapsed_seconds = time.perf_counter() - time_before_query
         query_time_with_labels = metrics.INTEGRATION_HANDLER_QUERY_TIME.labels(
-            get_class_name(self.integration_handler), result.type)
+            get_class_name(handler), result.type)
         query_time_with_labels.observe(elapsed_seconds)
 
         num_rows = 0
         if result.data_frame is not None:
             num_rows = len(result.data_frame.index)
         response_size_with_labels = metrics.INTEGRATION_HANDLER_RESPONSE_SIZE.labels(
-            get_class_name(self.integration_handler), result.type)
+            get_class_name(handler), result.type)
         response_size_with_labels.observe(num_rows)
         return result
 
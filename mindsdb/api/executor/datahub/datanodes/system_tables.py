@@ -1,8 +1,7 @@
 
 import pandas as pd
-from mindsdb_sql.parser.ast import BinaryOperation, Constant, Identifier, Select
+from mindsdb_sql.parser.ast import BinaryOperation, Constant, Identifier, Select, Tuple
 from mindsdb_sql.parser.ast.base import ASTNode
-from mindsdb.integrations.utilities.sql_utils import extract_comparison_conditions
 
 from mindsdb.api.executor.datahub.classes.tables_row import (
     TABLES_ROW_TYPE,
@@ -13,6 +12,49 @@ from mindsdb.utilities import log
 logger = log.getLogger(__name__)
 
 
+def get_schema_filters(query: ASTNode) -> tuple:
+    """
+    Get filters on TABLE_SCHEMA and TABLE_NAME from 'where' of query to information_schema.
+    Filters are used only to skip databases and tables, the whole condition is applied to the result later.
+
+    :param query: query to information_schema table
+    :return: (list of schemas, list of tables), None if there is no filter
+    """
+    filters = {'table_schema': None, 'table_name': None}
+    if not isinstance(query, Select):
+        return None, None
+
+    def _add_filters(node):
+        if not isinstance(node, BinaryOperation):
+            return
+        op = node.op.lower()
+        if op == 'and':
+            # only conditions which must be true: 'or', 'not' and others are skipped
+            _add_filters(node.args[0])
+            _add_filters(node.args[1])
+            return
+        arg1, arg2 = node.args
+        if not isinstance(arg1, Identifier) or arg1.parts[-1].lower() not in filters:
+            return
+        if op == '=' and isinstance(arg2, Constant):
+            values = [arg2.value]
+        elif op == 'in' and isinstance(arg2, Tuple) and all(isinstance(x, Constant) for x in arg2.items):
+            values = [x.value for x in arg2.items]
+        else:
+            return
+        key = arg1.parts[-1].lower()
+        values = {str(value).lower(): str(value) for value in values}
+        if filters[key] is not None:
+            values = {k: v for k, v in values.items() if k in filters[key]}
+        filters[key] = values
+
+    _add_filters(query.where)
+    return tuple(
+        None if filters[key] is None else list(filters[key].values())
+        for key in ('table_schema', 'table_name')
+    )
+
+
 class Table:
 
     deletable: bool = False
@@ -73,32 +115,19 @@ class TablesTable(Table):
     @classmethod
     def get_data(cls, query: ASTNode = None, inf_schema=None, **kwargs):
 
-        target_table = None
-        if (
-            type(query) is Select
-            and type(query.where) is BinaryOperation
-            and query.where.op == "and"
-        ):
-            for arg in query.where.args:
-                if (
-                    type(arg) is BinaryOperation
-                    and arg.op == "="
-                    and type(arg.args[0]) is Identifier
-                    and arg.args[0].parts[-1].upper() == "TABLE_SCHEMA"
-                    and type(arg.args[1]) is Constant
-                ):
-                    target_table = arg.args[1].value
-                    break
+        schemas, table_names = get_schema_filters(query)
+        if schemas is not None:
+            schemas = {x.lower() for x in schemas}
 
         data = []
         for name in inf_schema.tables.keys():
-            if target_table is not None and target_table != name:
-                continue
+            if schemas is not None and 'information_schema' not in schemas:
+                break
             row = TablesRow(TABLE_TYPE=TABLES_ROW_TYPE.SYSTEM_VIEW, TABLE_NAME=name)
             data.append(row.to_list())
 
         for ds_name, ds in inf_schema.persis_datanodes.items():
-            if target_table is not None and target_table != ds_name:
+            if schemas is not None and ds_name.lower() not in schemas:
                 continue
             if hasattr(ds, 'get_tables_rows'):
                 ds_tables = ds.get_tables_rows()
@@ -127,19 +156,20 @@ class TablesTable(Table):
                 data.append(row.to_list())
 
         for ds_name in inf_schema.get_integrations_names():
-            if target_table is not None and target_table != ds_name:
+            if schemas is not None and ds_name not in schemas:
                 continue
             try:
-                ds = inf_schema.get(ds_name)
-                ds_tables = ds.get_tables()
-                for row in ds_tables:
-                    row.TABLE_SCHEMA = ds_name
+                ds_tables = inf_schema.get_integration_schema(ds_name, table_names=table_names, with_columns=False)
+                for table in ds_tables:
+                    row = TablesRow(TABLE_SCHEMA=ds_name, TABLE_NAME=table['name'])
+                    if table['type'] is not None:
+                        row.TABLE_TYPE = table['type']
                     data.append(row.to_list())
             except Exception:
                 logger.error(f"Can't get tables from '{ds_name}'")
 
         for project_name in inf_schema.get_projects_names():
-            if target_table is not None and target_table != project_name:
+            if schemas is not None and project_name not in schemas:
                 continue
             project_dn = inf_schema.get(project_name)
             project_tables = project_dn.get_tables()
@@ -279,25 +309,25 @@ class ColumnsTable(Table):
 
         result = []
 
-        databases = None
-        conditions = extract_comparison_conditions(query.where)
-        for op, arg1, arg2 in conditions:
-            if arg1.lower() == 'table_schema':
-                if op == '=':
-                    databases = [arg2]
-                elif op == 'in':
-                    if not isinstance(arg2, list):
-                        arg2 = [arg2]
-                    databases = arg2
-
+        databases, table_names = get_schema_filters(query)
         if databases is None:
             databases = ['information_schema', 'mindsdb', 'files']
 
+        integrations_names = inf_schema.get_integrations_names()
+        if table_names is not None:
+            table_names_lower = {x.lower() for x in table_names}
+
         for db_name in databases:
-            if db_name == 'information_schema':
+            if db_name.lower() == 'information_schema':
                 tables = {
                     table_name: table.columns
                     for table_name, table in inf_schema.tables.items()
+                    if table_names is None or table_name.lower() in table_names_lower
+                }
+            elif db_name.lower() in integrations_names:
+                tables = {
+                    table['name']: [col['name'] for col in table['columns']]
+                    for table in inf_schema.get_integration_schema(db_name.lower(), table_names=table_names)
                 }
             else:
                 dn = inf_schema.get(db_name)
@@ -305,6 +335,8 @@ class ColumnsTable(Table):
                     continue
                 tables = {}
                 for table_row in dn.get_tables():
+                    if table_names is not None and str(table_row.TABLE_NAME).lower() not in table_names_lower:
+                        continue
                     tables[table_row.TABLE_NAME] = [
                         col['name']
                         for col in dn.get_table_columns(table_row.TABLE_NAME)
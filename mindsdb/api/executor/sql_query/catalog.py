@@ -0,0 +1,162 @@
+from collections import OrderedDict, defaultdict
+from typing import Dict, List, Optional, Tuple
+
+import sqlalchemy as sa
+
+from mindsdb.interfaces.model.functions import MultiplePredictorRecordsFound
+from mindsdb.interfaces.storage import db
+from mindsdb.utilities.context import context as ctx
+
+from .plan_cache import catalog_cache, get_catalog_version
+
+
+class CatalogSnapshot:
+    """
+    Catalog objects which are used by one query: databases, models and agents.
+    Objects are loaded once for the query, by bulk requests to db, and are used by planner, datahub and datanodes
+    instead of separate request per object.
+    """
+
+    def __init__(self, session):
+        self.session = session
+        self._version = None
+        self._databases = None
+        self._projects = {}
+        # (project_name, agent_name) -> agent or None
+        self._agents = {}
+
+    @property
+    def version(self) -> Optional[tuple]:
+        if self._version is None and catalog_cache.enabled:
+            self._version = get_catalog_version()
+        return self._version
+
+    @property
+    def databases(self) -> List[dict]:
+        """
+        The same as DatabaseController.get_list()
+        """
+        if self._databases is None:
+            self._databases = catalog_cache.get_or_create(
+                ('databases', ctx.company_id),
+                self.session.database_controller.get_list,
+                version=self.version
+            )
+        return self._databases
+
+    def get_databases_dict(self) -> OrderedDict:
+        """
+        The same as DatabaseController.get_dict()
+        """
+        return OrderedDict(
+            (
+                x['name'].lower(),
+                {
+                    'type': x['type'],
+                    'engine': x['engine'],
+                    'id': x['id']
+                }
+            )
+            for x in self.databases
+        )
+
+    def get_project_ids(self) -> Dict[str, int]:
+        return {
+            x['name'].lower(): x['id']
+            for x in self.databases
+            if x['type'] == 'project'
+        }
+
+    def get_project(self, name: str):
+        """
+        The same as DatabaseController.get_project(), project is requested once for the query
+        """
+        key = name.lower()
+        if key not in self._projects:
+            self._projects[key] = self.session.database_controller.get_project(name=name)
+        return self._projects[key]
+
+    def get_model_records(self, query_tables: List[tuple]) -> Dict[tuple, Optional[db.Predictor]]:
+        """
+        Find records of models by one request
+
+        :param query_tables: list of (project_name, model_name, version), output of get_query_models
+        :return: record for every input item, None if model is not found
+        """
+        project_ids = self.get_project_ids()
+
+        names = set()
+        for project_name, table_name, _ in query_tables:
+            if project_name is None or project_name.lower() in project_ids:
+                names.add(table_name)
+
+        records_by_name = defaultdict(list)
+        if len(names) > 0:
+            records = db.session.query(db.Predictor).filter(
+                db.Predictor.company_id == ctx.company_id,
+                db.Predictor.deleted_at == sa.null(),
+                db.Predictor.name.in_(names),
+            ).all()
+            for record in records:
+                records_by_name[record.name].append(record)
+
+        result = {}
+        for item in query_tables:
+            project_name, table_name, table_version = item
+            matched = []
+            for record in records_by_name.get(table_name, []):
+                if project_name is not None and record.project_id != project_ids.get(project_name.lower()):
+                    continue
+                if table_version is None:
+                    if record.active is not True:
+                        continue
+                elif record.version != table_version:
+                    continue
+                matched.append(record)
+            if len(matched) > 1:
+                raise MultiplePredictorRecordsFound(name=table_name)
+            result[item] = matched[0] if matched else None
+        return result
+
+    def get_agents(self, names: List[Tuple[str, str]]) -> Dict[tuple, db.Agents]:
+        """
+        Find agents by one request, agents which were already requested by the query are not requested again
+
+        :param names: list of (project_name, agent_name)
+        :return: agents which are found
+        """
+        project_ids = self.get_project_ids()
+        to_load = []
+        for project_name, agent_name in names:
+            if (project_name, agent_name) in self._agents:
+                continue
+            if project_name is None or project_name.lower() not in project_ids:
+                self._agents[(project_name, agent_name)] = None
+                continue
+            to_load.append((project_name, agent_name))
+
+        if len(to_load) > 0:
+            records = db.session.query(db.Agents).filter(
+                db.Agents.company_id == ctx.company_id,
+                db.Agents.deleted_at == sa.null(),
+                db.Agents.name.in_({agent_name for _, agent_name in to_load}),
+            ).all()
+
+            for project_name, agent_name in to_load:
+                project_id = project_ids[project_name.lower()]
+                self._agents[(project_name, agent_name)] = next(
+                    (
+                        record for record in records
+                        if record.name == agent_name and record.project_id == project_id
+                    ),
+                    None
+                )
+
+        return {
+            key: self._agents[key]
+            for key in names
+            if self._agents.get(key) is not None
+        }
+
+    def get_agent(self, agent_name: str, project_name: str) -> Optional[db.Agents]:
+        return self.get_agents([(project_name, agent_name)]).get((project_name, agent_name))
@@ -0,0 +1,111 @@
+"""
+Caches of query planning which are shared by all sessions of the process:
+ - parsed queries, by text of query and dialect
+ - data for planner from catalog: list of databases and metadata of models used in the query.
+   Values are valid only for version of catalog, at which they were stored. Version of catalog is count and last
+   change of projects, models, integrations, views and agents of the company, it is read from db by one query.
+
+Values are returned as copies: planner and steps modify queries.
+Size of caches is set by 'executor.plan_cache_size' in config, 0 disables caches.
+"""
+import threading
+import time
+from collections import OrderedDict
+from copy import deepcopy
+from typing import Any, Callable, Hashable, Optional
+
+from sqlalchemy import func, select
+
+from mindsdb.interfaces.storage import db
+from mindsdb.metrics import metrics
+from mindsdb.utilities.config import Config
+from mindsdb.utilities.context import context as ctx
+
+DEFAULT_PLAN_CACHE_SIZE = 1000
+
+_CATALOG_TABLES = (db.Project, db.Predictor, db.Integration, db.View, db.Agents)
+
+def get_plan_cache_size() -> int:
+    return Config().get('executor', {}).get('plan_cache_size', DEFAULT_PLAN_CACHE_SIZE)
+
+
+class PlanCache:
+    """
+    LRU cache, every value can be bound to version
+    """
+
+    def __init__(self, name: str, max_size: Optional[int] = None):
+        self.name = name
+        self._max_size = max_size
+        self._values = OrderedDict()
+        self._lock = threading.Lock()
+
+    @property
+    def max_size(self) -> int:
+        if self._max_size is None:
+            return get_plan_cache_size()
+        return self._max_size
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_size > 0
+
+    def get_or_create(self, key: Hashable, create_fn: Callable[[], Any], version: Any = None) -> Any:
+        """
+        Get value from cache or create it by create_fn and store
+
+        :param key: key of value
+        :param create_fn: function to create value
+        :param version: value from cache is used only if it was stored with the same version
+        :return: copy of value
+        """
+        if not self.enabled:
+            return create_fn()
+
+        with self._lock:
+            item = self._values.get(key)
+            if item is not None and item[0] == version:
+                self._values.move_to_end(key)
+            else:
+                item = None
+
+        if item is not None:
+            _, value, cost = item
+            metrics.PLAN_CACHE_HITS.labels(self.name).inc()
+            metrics.PLAN_CACHE_SAVED_SECONDS.labels(self.name).inc(cost)
+            return deepcopy(value)
+
+        metrics.PLAN_CACHE_MISSES.labels(self.name).inc()
+        start = time.perf_counter()
+        value = create_fn()
+        cost = time.perf_counter() - start
+
+        with self._lock:
+            self._values[key] = (version, deepcopy(value), cost)
+            self._values.move_to_end(key)
+            while len(self._values) > self.max_size:
+                self._values.popitem(last=False)
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._values.clear()
+
+
+parse_cache = PlanCache('parse')
+catalog_cache = PlanCache('catalog')
+
+
+def get_catalog_version() -> tuple:
+    """
+    Version of catalog of current company: count of records and the last change of every catalog table.
+    Deleted records are also updated, so it is changed on creation, update and deletion of objects.
+    """
+    company_id = ctx.company_id
+    columns = []
+    for table in _CATALOG_TABLES:
+        condition = table.company_id == company_id
+        changed_column = getattr(table, 'updated_at', table.id)
+        columns.append(select(func.count(table.id)).where(condition).scalar_subquery())
+        columns.append(select(func.max(changed_column)).where(condition).scalar_subquery())
+    return tuple(db.session.execute(select(*columns)).one())
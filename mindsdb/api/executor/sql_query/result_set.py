@@ -74,8 +74,8 @@ class ResultSet:
                 type=columns_dtypes[i]
             ))
 
-        # rename columns to indexes
-        self._df = df.set_axis(range(len(df.columns)), axis=1)
+        # rename columns to indexes, without copying of data
+        self._df = df.set_axis(range(len(df.columns)), axis=1, copy=False)
 
         return self
 
@@ -98,13 +98,13 @@ class ResultSet:
                 column = Column(col)
             self._columns.append(column)
 
-        self._df = df.set_axis(range(len(df.columns)), axis=1)
+        self._df = df.set_axis(range(len(df.columns)), axis=1, copy=False)
 
         return self
 
     def to_df(self):
         columns = self.get_column_names()
-        return self.get_raw_df().set_axis(columns, axis=1)
+        return self.get_raw_df().set_axis(columns, axis=1, copy=False)
 
     def to_df_cols(self, prefix=''):
         # returns dataframe and dict of columns
@@ -117,7 +117,7 @@ class ResultSet:
             columns.append(name)
             col_names[name] = col
 
-        return self.get_raw_df().set_axis(columns, axis=1), col_names
+        return self.get_raw_df().set_axis(columns, axis=1, copy=False), col_names
 
     # --- tables ---
 
@@ -163,7 +163,7 @@ class ResultSet:
         self._columns.pop(idx)
 
         self._df.drop(idx, axis=1, inplace=True)
-        self._df = self._df.set_axis(range(len(self._df.columns)), axis=1)
+        self._df = self._df.set_axis(range(len(self._df.columns)), axis=1, copy=False)
 
     @property
     def columns(self):
@@ -215,7 +215,7 @@ class ResultSet:
         if len(df.columns) != len(self._columns):
             raise WrongArgumentError(f'Record length mismatch columns length: {len(df.columns)} != {len(self.columns)}')
 
-        df = df.set_axis(range(len(df.columns)), axis=1)
+        df = df.set_axis(range(len(df.columns)), axis=1, copy=False)
 
         if self._df is None:
             self._df = df
@@ -227,26 +227,49 @@ class ResultSet:
         df = pd.DataFrame(values)
         self.add_raw_df(df)
 
+    def iter_raw_chunks(self, batch_size=None):
+        """
+        Split raw dataframe to chunks. Chunks are slices of dataframe and don't copy data
+        :param batch_size: max count of rows in chunk, if not set: yield whole dataframe
+        :return: generator of dataframes
+        """
+        df = self.get_raw_df()
+        if not batch_size or len(df) <= batch_size:
+            yield df
+            return
+
+        for start in range(0, len(df), batch_size):
+            yield df.iloc[start: start + batch_size]
+
     def to_lists(self, json_types=False):
         """
         :param type_cast: cast numpy types
             array->list, datetime64->str
         :return: list of lists
         """
+        return self._raw_df_to_lists(self.get_raw_df(), json_types=json_types)
 
-        if len(self.get_raw_df()) == 0:
+    @staticmethod
+    def _raw_df_to_lists(df, json_types=False):
+        if len(df) == 0:
             return []
         # output for APIs. simplify types
         if json_types:
-            df = self.get_raw_df().copy()
-            for name, dtype in df.dtypes.to_dict().items():
-                if pd.api.types.is_datetime64_any_dtype(dtype):
+            datetime_cols = [
+                name
+                for name, dtype in df.dtypes.to_dict().items()
+                if pd.api.types.is_datetime64_any_dtype(dtype)
+            ]
+            if len(datetime_cols) > 0:
+                # copy only if we are going to modify frame, .replace makes a copy anyway
+                df = df.copy()
+                for name in datetime_cols:
                     df[name] = df[name].dt.strftime("%Y-%m-%d %H:%M:%S.%f")
             df = df.replace({np.nan: None})
             return df.to_records(index=False).tolist()
 
         # slower but keep timestamp type
-        return self._df.to_dict('split')['data']
+        return df.to_dict('split')['data']
 
     def get_column_values(self, col_idx):
         # get by column index
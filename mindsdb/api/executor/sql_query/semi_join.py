@@ -0,0 +1,192 @@
+import copy
+
+import pandas as pd
+
+from mindsdb_sql.parser.ast import (
+    BinaryOperation,
+    Identifier,
+    Constant,
+    Select,
+    Star,
+    Tuple,
+)
+from mindsdb_sql.planner.steps import FetchDataframeStep, JoinStep
+
+from mindsdb.api.executor.sql_query.result_set import ResultSet
+from mindsdb.api.executor.sql_query.steps.fetch_dataframe import get_table_alias
+from mindsdb.utilities.config import Config
+
+DEFAULT_MAX_KEYS = 10000
+DEFAULT_CHUNK_SIZE = 1000
+
+# join type: which sides can be filtered by keys of other side
+FILTERED_SIDES = {
+    'join': ('left', 'right'),
+    'inner join': ('left', 'right'),
+    'left join': ('right',),
+    'left outer join': ('right',),
+    'right join': ('left',),
+    'right outer join': ('left',),
+}
+
+
+class SemiJoin:
+    """
+    Join of two fetch steps from different integrations, where one side (probe) can be filtered
+    by distinct values of join key of another side (driver): 'key in (...)'
+    """
+
+    def __init__(self, driver_step_num, driver_alias, driver_column, probe_column):
+        self.driver_step_num = driver_step_num
+        self.driver_alias = driver_alias
+        self.driver_column = driver_column
+        self.probe_column = probe_column
+
+        config = Config().get('executor', {})
+        self.max_keys = config.get('semi_join_max_keys', DEFAULT_MAX_KEYS)
+        self.chunk_size = config.get('semi_join_chunk_size', DEFAULT_CHUNK_SIZE)
+
+    def get_keys(self, steps_data):
+        """
+        Distinct values of join column of the driver
+
+        :return: list of values or None if probe step shouldn't be filtered
+        """
+        driver_data = steps_data[self.driver_step_num]
+        columns = driver_data.find_columns(self.driver_column, table_alias=self.driver_alias)
+        if len(columns) != 1:
+            return None
+
+        values = driver_data.get_raw_df()[driver_data.get_col_index(columns[0])]
+        keys = pd.Series(values).dropna().unique().tolist()
+        if len(keys) == 0 or len(keys) > self.max_keys:
+            return None
+
+        for key in keys:
+            if not isinstance(key, (int, float, str)):
+                # don't know how to render it
+                return None
+        return keys
+
+    def execute(self, step: FetchDataframeStep, sql_query, steps_data) -> ResultSet:
+        """
+        Execute fetch step with filter by keys of the driver. Query is executed by chunks of keys
+
+        :param step: probe fetch step
+        :param sql_query: SQLQuery instance
+        :param steps_data: results of previous steps
+        :return: fetched data
+        """
+        keys = self.get_keys(steps_data)
+        if keys is None:
+            return sql_query.execute_step(step)
+
+        result = None
+        raw_dfs = []
+        for start in range(0, len(keys), self.chunk_size):
+            chunk = keys[start: start + self.chunk_size]
+            step2 = copy.deepcopy(step)
+
+            condition = BinaryOperation(op='in', args=[
+                Identifier(parts=[self.probe_column]),
+                Tuple([Constant(key) for key in chunk])
+            ])
+            if step2.query.where is None:
+                step2.query.where = condition
+            else:
+                step2.query.where = BinaryOperation(op='and', args=[step2.query.where, condition])
+
+            chunk_data = sql_query.execute_step(step2)
+            if result is None:
+                result = chunk_data
+            raw_dfs.append(chunk_data.get_raw_df())
+
+        if len(raw_dfs) > 1:
+            data = ResultSet(columns=result.columns)
+            data.add_raw_df(pd.concat(raw_dfs, ignore_index=True))
+            data.is_prediction = result.is_prediction
+            result = data
+        return result
+
+
+def _is_simple_fetch(step):
+    # select * from table [where ...]
+    if not isinstance(step, FetchDataframeStep) or not isinstance(step.query, Select):
+        return False
+    query = step.query
+    if not isinstance(query.from_table, Identifier):
+        return False
+    if query.group_by is not None or query.having is not None or query.limit is not None or query.offset is not None:
+        return False
+    if query.order_by:
+        # order of rows is lost when values are fetched by chunks
+        return False
+    if len(query.targets) != 1 or not isinstance(query.targets[0], Star):
+        return False
+    return True
+
+
+def find_semi_joins(steps: list, default_database: str) -> dict:
+    """
+    Find joins of two fetch steps where one of them has filter and another doesn't
+
+    :param steps: list of steps of the plan
+    :param default_database: current database
+    :return: dict {probe step_num: SemiJoin}
+    """
+    steps_idx = {step.step_num: step for step in steps}
+
+    semi_joins = {}
+    for step in steps:
+        if not isinstance(step, JoinStep) or step.query.condition is None:
+            continue
+
+        filtered_sides = FILTERED_SIDES.get(step.query.join_type.lower())
+        if filtered_sides is None:
+            continue
+
+        condition = step.query.condition
+        if not (
+            isinstance(condition, BinaryOperation) and condition.op == '='
+            and all(isinstance(arg, Identifier) and len(arg.parts) == 2 for arg in condition.args)
+        ):
+            continue
+
+        sides = {
+            'left': steps_idx.get(step.left.step_num),
+            'right': steps_idx.get(step.right.step_num),
+        }
+        if not all(_is_simple_fetch(side_step) for side_step in sides.values()):
+            continue
+        if sides['left'].integration.lower() == sides['right'].integration.lower():
+            continue
+
+        # find column of every side in condition
+        columns = {}
+        for side, side_step in sides.items():
+            alias = get_table_alias(side_step.query.from_table, default_database)[2]
+            for arg in condition.args:
+                if arg.parts[0].lower() == alias.lower():
+                    columns[side] = (alias, arg.parts[1])
+        if len(columns) != 2:
+            continue
+
+        for probe_side in filtered_sides:
+            driver_side = 'right' if probe_side == 'left' else 'left'
+            probe_step = sides[probe_side]
+            driver_step = sides[driver_side]
+            # filtered table is expected to be smaller
+            if driver_step.query.where is None or probe_step.query.where is not None:
+                continue
+            if probe_step.step_num in semi_joins:
+                continue
+
+            semi_joins[probe_step.step_num] = SemiJoin(
+                driver_step_num=driver_step.step_num,
+                driver_alias=columns[driver_side][0],
+                driver_column=columns[driver_side][1],
+                probe_column=columns[probe_side][1],
+            )
+            break
+
+    return semi_joins
@@ -12,7 +12,6 @@ import re
 import inspect
 from textwrap import dedent
 
-from mindsdb_sql import parse_sql
 from mindsdb_sql.planner.steps import (
     ApplyTimeseriesPredictorStep,
     ApplyPredictorRowStep,
@@ -24,7 +23,7 @@ from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
 from mindsdb_sql.planner import query_planner
 
 from mindsdb.api.executor.utilities.sql import query_df, get_query_models
-from mindsdb.interfaces.model.functions import get_model_record
+from mindsdb.api.executor.utilities.statements import parse_query
 from mindsdb.api.executor.exceptions import (
     BadTableError,
     UnknownError,
@@ -32,10 +31,13 @@ from mindsdb.api.executor.exceptions import (
 )
 import mindsdb.utilities.profiler as profiler
 from mindsdb.utilities.fs import create_process_mark, delete_process_mark
-from mindsdb.utilities.exception import EntityNotExistsError
+from mindsdb.utilities.context import context as ctx
 
 from . import steps
 from .result_set import ResultSet, Column
+from .steps_scheduler import StepsScheduler
+from .plan_cache import catalog_cache
+from .catalog import CatalogSnapshot
 from . steps.base import BaseStepCall
 
 superset_subquery = re.compile(r'from[\s\n]*(\(.*\))[\s\n]*as[\s\n]*virtual_table', flags=re.IGNORECASE | re.MULTILINE | re.S)
@@ -47,6 +49,8 @@ class SQLQuery:
 
     def __init__(self, sql, session, execute=True, database=None):
         self.session = session
+        # catalog objects used by this query
+        self.catalog = CatalogSnapshot(session)
 
         if database is not None:
             self.database = database
@@ -76,7 +80,7 @@ class SQLQuery:
                     self.outer_query = sql.replace(subquery, 'dataframe')
                     sql = subquery.strip('()')
             # endregion
-            self.query = parse_sql(sql, dialect='mindsdb')
+            self.query = parse_query(sql, dialect='mindsdb')
             self.context['query_str'] = sql
         else:
             self.query = sql
@@ -104,28 +108,49 @@ class SQLQuery:
 
     @profiler.profile()
     def create_planner(self):
-        databases = self.session.database_controller.get_list()
+        query_tables = get_query_models(self.query, default_database=self.database)
+
+        # catalog data is taken from cache if catalog was not changed
+        databases = self.catalog.databases
 
         predictor_metadata = []
+        if len(query_tables) > 0:
+            predictor_metadata = catalog_cache.get_or_create(
+                ('predictors', ctx.company_id, tuple(query_tables)),
+                lambda: self.get_predictor_metadata(query_tables),
+                version=self.catalog.version
+            )
 
-        query_tables = get_query_models(self.query, default_database=self.database)
+        database = None if self.database == '' else self.database.lower()
 
-        for project_name, table_name, table_version in query_tables:
-            args = {
-                'name': table_name,
-                'project_name': project_name
-            }
-            if table_version is not None:
-                args['active'] = None
-                args['version'] = table_version
+        self.context['predictor_metadata'] = predictor_metadata
+        self.planner = query_planner.QueryPlanner(
+            self.query,
+            integrations=databases,
+            predictor_metadata=predictor_metadata,
+            default_namespace=database,
+        )
+
+    def get_predictor_metadata(self, query_tables: list) -> list:
+        """
+        Metadata of models and agents which are used in query
+
+        :param query_tables: output of get_query_models
+        :return: list of metadata for planner
+        """
+        model_records = self.catalog.get_model_records(query_tables)
+        # tables which are not models can be agents
+        agents = self.catalog.get_agents([
+            (project_name, table_name)
+            for (project_name, table_name, _), record in model_records.items()
+            if record is None
+        ])
 
-            model_record = get_model_record(**args)
+        predictor_metadata = []
+        for project_name, table_name, table_version in query_tables:
+            model_record = model_records[(project_name, table_name, table_version)]
             if model_record is None:
-                # check if it is an agent
-                try:
-                    agent = self.session.agents_controller.get_agent(table_name, project_name)
-                except EntityNotExistsError:
-                    continue
+                agent = agents.get((project_name, table_name))
                 if agent is not None:
                     predictor = {
                         'name': table_name,
@@ -158,6 +183,7 @@ class SQLQuery:
                 'integration_name': project_name,   # integration_name,
                 'timeseries': False,
                 'id': model_record.id,
+                'integration_id': model_record.integration_id,
                 'to_predict': model_record.to_predict,
             }
             if ts_settings.get('is_timeseries') is True:
@@ -180,15 +206,7 @@ class SQLQuery:
 
             predictor_metadata.append(predictor)
 
-        database = None if self.database == '' else self.database.lower()
-
-        self.context['predictor_metadata'] = predictor_metadata
-        self.planner = query_planner.QueryPlanner(
-            self.query,
-            integrations=databases,
-            predictor_metadata=predictor_metadata,
-            default_namespace=database,
-        )
+        return predictor_metadata
 
     def fetch(self, view='result_set'):
         data = self.fetched_data
@@ -251,10 +269,7 @@ class SQLQuery:
             predict_steps = (ApplyPredictorRowStep, ApplyPredictorStep, ApplyTimeseriesPredictorStep)
             if any(s in predict_steps for s in steps_classes):
                 process_mark = create_process_mark('predict')
-            for step in steps:
-                with profiler.Context(f'step: {step.__class__.__name__}'):
-                    step_result = self.execute_step(step)
-                self.steps_data[step.step_num] = step_result
+            step_result = StepsScheduler(self).execute(steps)
         except PlanningException as e:
             raise LogicError(e)
         except Exception as e:
@@ -2,6 +2,7 @@ import datetime as dt
 import re
 
 import dateinfer
+import numpy as np
 import pandas as pd
 
 from mindsdb_sql.parser.ast import (
@@ -20,10 +21,25 @@ from mindsdb_sql.planner.steps import (
 )
 
 from mindsdb.api.executor.sql_query.result_set import ResultSet, Column
-from mindsdb.utilities.cache import get_cache, dataframe_checksum
+from mindsdb.utilities.cache import get_cache, dataframe_checksum, json_checksum, rows_hashes
 
 from .base import BaseStepCall
 
+# Cache of predictions per row is used only for models which predict every row independently of the others,
+# it is enabled in config:
+#   "cache": {
+#       "row_cache": {
+#           "engines": ["<ml engine>"],  # all models of the engine
+#           "models": ["<project>.<model>"],
+#           "max_rows": 10000,  # max size of input dataframe, bigger inputs are cached as whole
+#           "max_cached_rows": 100000  # max count of cached rows of one model
+#       }
+#   }
+DEFAULT_ROW_CACHE_MAX_ROWS = 10000
+DEFAULT_ROW_CACHE_MAX_CACHED_ROWS = 100000
+# rows of model are stored in this count of cache records, by hash of row
+ROW_CACHE_BUCKETS = 16
+
 
 def get_preditor_alias(step, mindsdb_database):
     predictor_name = '.'.join(step.predictor.parts)
@@ -35,7 +51,7 @@ class ApplyPredictorBaseCall(BaseStepCall):
 
     def apply_predictor(self, project_name, predictor_name, df, version, params):
         # is it an agent?
-        agent = self.session.agents_controller.get_agent(predictor_name, project_name)
+        agent = self.sql_query.catalog.get_agent(predictor_name, project_name)
         if agent is not None:
 
             messages = df.to_dict('records')
@@ -46,7 +62,7 @@ class ApplyPredictorBaseCall(BaseStepCall):
             )
 
         else:
-            project_datanode = self.session.datahub.get(project_name)
+            project_datanode = self.session.datahub.get(project_name, catalog=self.sql_query.catalog)
             predictions = project_datanode.predict(
                 model_name=predictor_name,
                 df=df,
@@ -55,6 +71,16 @@ class ApplyPredictorBaseCall(BaseStepCall):
             )
         return predictions
 
+    def apply_predictor_by_batches(self, project_name, predictor_name, df, version, params, batch_size):
+        # predict by chunks, size of input for model doesn't exceed batch_size
+        predictions = []
+        for start in range(0, len(df), batch_size):
+            df_chunk = df.iloc[start: start + batch_size]
+            predictions.append(
+                self.apply_predictor(project_name, predictor_name, df_chunk, version, params)
+            )
+        return pd.concat(predictions, ignore_index=True)
+
 
 class ApplyPredictorRowStepCall(ApplyPredictorBaseCall):
 
@@ -64,7 +90,7 @@ class ApplyPredictorRowStepCall(ApplyPredictorBaseCall):
         project_name = step.namespace
         predictor_name = step.predictor.parts[0]
         where_data0 = step.row_dict
-        project_datanode = self.session.datahub.get(project_name)
+        project_datanode = self.session.datahub.get(project_name, catalog=self.sql_query.catalog)
 
         # fill params
         where_data = {}
@@ -170,7 +196,7 @@ class ApplyPredictorStepCall(ApplyPredictorBaseCall):
         result = ResultSet()
         result.is_prediction = True
 
-        project_datanode = self.session.datahub.get(project_name)
+        project_datanode = self.session.datahub.get(project_name, catalog=self.sql_query.catalog)
         if len(data) == 0:
             cols = [col['name'] for col in project_datanode.get_table_columns(predictor_name)] + ['__mindsdb_row_id']
             for col in cols:
@@ -184,7 +210,15 @@ class ApplyPredictorStepCall(ApplyPredictorBaseCall):
             predictor_id = predictor_metadata['id']
             table_df = data.to_df()
 
-            if self.session.predictor_cache is not False:
+            row_cache_config = self.session.config['cache'].get('row_cache', {})
+            use_row_cache = (
+                self.session.predictor_cache is not False
+                and not is_timeseries
+                and len(table_df) <= row_cache_config.get('max_rows', DEFAULT_ROW_CACHE_MAX_ROWS)
+                and self.is_row_cache_enabled(row_cache_config, project_name, predictor_name, predictor_metadata)
+            )
+
+            if self.session.predictor_cache is not False and not use_row_cache:
                 key = f'{predictor_name}_{predictor_id}_{dataframe_checksum(table_df)}'
 
                 predictor_cache = get_cache('predict')
@@ -217,9 +251,21 @@ class ApplyPredictorStepCall(ApplyPredictorBaseCall):
                 version = None
                 if len(step.predictor.parts) > 1 and step.predictor.parts[-1].isdigit():
                     version = int(step.predictor.parts[-1])
-                predictions = self.apply_predictor(project_name, predictor_name, table_df, version, params)
+                batch_size = self.session.stream_batch_size
+                if use_row_cache:
+                    predictions = self.apply_predictor_with_row_cache(
+                        project_name, predictor_name, predictor_id, table_df, version, params,
+                        max_cached_rows=row_cache_config.get('max_cached_rows', DEFAULT_ROW_CACHE_MAX_CACHED_ROWS)
+                    )
+                elif batch_size and not is_timeseries and len(table_df) > batch_size:
+                    # timeseries model requires whole window of data and can't be split
+                    predictions = self.apply_predictor_by_batches(
+                        project_name, predictor_name, table_df, version, params, batch_size
+                    )
+                else:
+                    predictions = self.apply_predictor(project_name, predictor_name, table_df, version, params)
 
-                if self.session.predictor_cache is not False:
+                if self.session.predictor_cache is not False and not use_row_cache:
                     if predictions is not None and isinstance(predictions, pd.DataFrame):
                         predictor_cache.set(key, predictions)
 
@@ -239,6 +285,96 @@ class ApplyPredictorStepCall(ApplyPredictorBaseCall):
 
         return result
 
+    def is_row_cache_enabled(self, row_cache_config, project_name, predictor_name, predictor_metadata) -> bool:
+        """
+        Row cache is used only for models or engines which are listed in config
+        """
+        models = [name.lower() for name in row_cache_config.get('models', [])]
+        if f'{project_name}.{predictor_name}'.lower() in models:
+            return True
+        engines = row_cache_config.get('engines', [])
+        integration_id = predictor_metadata.get('integration_id')
+        if len(engines) == 0 or integration_id is None:
+            return False
+        integration = self.session.integration_controller.get_by_id(integration_id)
+        return integration is not None and integration['engine'] in engines
+
+    def apply_predictor_with_row_cache(
+        self, project_name, predictor_name, predictor_id, df, version, params,
+        max_cached_rows=DEFAULT_ROW_CACHE_MAX_CACHED_ROWS
+    ):
+        """
+        Predictions of every row are cached by hash of row content.
+        Only rows which are not found in cache are sent to the model.
+        Rows are stored in ROW_CACHE_BUCKETS records (dataframes indexed by hash of row), not one record per row
+        """
+        row_id_col = '__mindsdb_row_id'
+
+        # row id is different in every query, don't use it in hash
+        hash_df = df.drop(columns=[row_id_col], errors='ignore')
+        # the same values in different columns or with different types must not share cache
+        columns_checksum = json_checksum([list(hash_df.columns), [str(dtype) for dtype in hash_df.dtypes]])
+        prefix = f'{predictor_name}_{predictor_id}_{version}_{json_checksum(params)}_{columns_checksum}'
+        hashes = rows_hashes(hash_df).to_numpy()
+        buckets = hashes % ROW_CACHE_BUCKETS
+        bucket_keys = {bucket: f'{prefix}_{bucket}' for bucket in sorted(set(buckets.tolist()))}
+
+        predictor_cache = get_cache('predict_rows')
+        cached = {
+            bucket: bucket_df
+            for bucket, bucket_df in zip(bucket_keys, predictor_cache.get_many(list(bucket_keys.values())))
+            if isinstance(bucket_df, pd.DataFrame)
+        }
+        if len(cached) > 0:
+            cached_df = pd.concat(cached.values())
+        else:
+            cached_df = None
+
+        if cached_df is None:
+            missed_mask = np.ones(len(df), dtype=bool)
+        else:
+            missed_mask = ~np.isin(hashes, cached_df.index.to_numpy())
+
+        predictions = None
+        if missed_mask.any():
+            missed_df = df[missed_mask]
+            batch_size = self.session.stream_batch_size
+            if batch_size and len(missed_df) > batch_size:
+                predictions = self.apply_predictor_by_batches(
+                    project_name, predictor_name, missed_df, version, params, batch_size
+                )
+            else:
+                predictions = self.apply_predictor(project_name, predictor_name, missed_df, version, params)
+            if not isinstance(predictions, pd.DataFrame) or len(predictions) != len(missed_df):
+                # rows of predictions don't match to input rows, can't cache them
+                if missed_mask.all():
+                    return predictions
+                return self.apply_predictor(project_name, predictor_name, df, version, params)
+
+            predictions = predictions.reset_index(drop=True)
+            new_rows = predictions.set_axis(hashes[missed_mask], axis=0)
+            bucket_max_rows = max(max_cached_rows // ROW_CACHE_BUCKETS, 1)
+            new_buckets = {}
+            for bucket in sorted(set(buckets[missed_mask].tolist())):
+                bucket_df = new_rows[buckets[missed_mask] == bucket]
+                if bucket in cached:
+                    bucket_df = pd.concat([cached[bucket], bucket_df])
+                # the oldest rows are removed
+                bucket_df = bucket_df[~bucket_df.index.duplicated(keep='last')].iloc[-bucket_max_rows:]
+                new_buckets[bucket_keys[bucket]] = bucket_df
+            predictor_cache.set_many(new_buckets)
+
+            if missed_mask.all():
+                return predictions
+            cached_df = pd.concat([cached_df, new_rows])
+
+        # rows are taken in order of input, types of columns are kept
+        cached_df = cached_df[~cached_df.index.duplicated(keep='last')]
+        predictions = cached_df.loc[hashes].reset_index(drop=True)
+        if row_id_col in df.columns and row_id_col in predictions.columns:
+            predictions[row_id_col] = df[row_id_col].values
+        return predictions
+
     def apply_ts_filter(self, predictor_data, table_data, step, predictor_metadata):
 
         if step.output_time_filter is None:
@@ -27,7 +27,7 @@ class DeleteStepCall(BaseStepCall):
             integration_name = self.context['database']
             table_name_parts = step.table.parts
 
-        dn = self.session.datahub.get(integration_name)
+        dn = self.session.datahub.get(integration_name, catalog=self.sql_query.catalog)
 
         # make command
         query = Delete(
@@ -71,7 +71,7 @@ class FetchDataframeStepCall(BaseStepCall):
 
     def call(self, step):
 
-        dn = self.session.datahub.get(step.integration)
+        dn = self.session.datahub.get(step.integration, catalog=self.sql_query.catalog)
         query = step.query
 
         if dn is None:
@@ -53,7 +53,7 @@ class InsertToTableCall(BaseStepCall):
             integration_name = self.context['database']
             table_name = step.table
 
-        dn = self.session.datahub.get(integration_name)
+        dn = self.session.datahub.get(integration_name, catalog=self.sql_query.catalog)
 
         if hasattr(dn, 'create_table') is False:
             raise NotSupportedYet(f"Creating table in '{integration_name}' is not supported")
@@ -111,7 +111,7 @@ class CreateTableCall(BaseStepCall):
             integration_name = self.context['database']
             table_name = step.table
 
-        dn = self.session.datahub.get(integration_name)
+        dn = self.session.datahub.get(integration_name, catalog=self.sql_query.catalog)
 
         dn.create_table(
             table_name=table_name,
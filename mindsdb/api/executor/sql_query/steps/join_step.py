@@ -1,9 +1,11 @@
 import copy
 
 import numpy as np
+import pandas as pd
 
 from mindsdb_sql.parser.ast import (
     Identifier,
+    BinaryOperation,
 )
 from mindsdb_sql.planner.steps import (
     JoinStep,
@@ -18,6 +20,120 @@ from mindsdb.api.executor.exceptions import NotSupportedYet
 from .base import BaseStepCall
 
 
+# join types which can be done by hash join, with pandas names
+HASH_JOIN_TYPES = {
+    'join': 'inner',
+    'inner join': 'inner',
+    'left join': 'left',
+    'left outer join': 'left',
+    'right join': 'right',
+    'right outer join': 'right',
+}
+
+
+def get_equi_join_keys(condition):
+    """
+    Extract pairs of columns from condition like: table_a.x = table_b.y [and ...]
+    :param condition: adapted join condition
+    :return: list of pairs (column of table_a, column of table_b) or None if condition is not equi-join
+    """
+    if not isinstance(condition, BinaryOperation):
+        return None
+
+    op = condition.op.lower()
+    if op == 'and':
+        keys = []
+        for arg in condition.args:
+            arg_keys = get_equi_join_keys(arg)
+            if arg_keys is None:
+                return None
+            keys.extend(arg_keys)
+        return keys
+
+    if op != '=':
+        return None
+
+    arg1, arg2 = condition.args
+    if not (isinstance(arg1, Identifier) and isinstance(arg2, Identifier)):
+        return None
+    if len(arg1.parts) != 2 or len(arg2.parts) != 2:
+        return None
+
+    tables = {arg1.parts[0]: arg1.parts[1], arg2.parts[0]: arg2.parts[1]}
+    if set(tables.keys()) != {'table_a', 'table_b'}:
+        return None
+    return [(tables['table_a'], tables['table_b'])]
+
+
+def _is_compatible_keys(col_a, col_b):
+    # pandas and sql compare values of different types differently, use hash join only for the same kinds of types
+    for check in (
+        pd.api.types.is_bool_dtype,
+        pd.api.types.is_numeric_dtype,
+        pd.api.types.is_datetime64_any_dtype,
+        pd.api.types.is_object_dtype,
+        pd.api.types.is_string_dtype,
+    ):
+        if check(col_a.dtype) or check(col_b.dtype):
+            return check(col_a.dtype) and check(col_b.dtype)
+    return False
+
+
+def hash_join(table_a, table_b, keys, join_type):
+    """
+    Join dataframes by equality of columns without duckdb.
+    Order of rows of the outer side (left for inner join) is preserved
+
+    :param table_a: left dataframe
+    :param table_b: right dataframe
+    :param keys: list of pairs of columns to compare
+    :param join_type: sql join type
+    :return: joined dataframe or None if it can't be done by hash join
+    """
+    how = HASH_JOIN_TYPES.get(join_type.lower())
+    if how is None:
+        return None
+
+    keys_a = [key[0] for key in keys]
+    keys_b = [key[1] for key in keys]
+
+    for key_a, key_b in keys:
+        if not _is_compatible_keys(table_a[key_a], table_b[key_b]):
+            return None
+
+    # null is not equal to null in sql, but pandas merges them
+    if table_a[keys_a].isna().any(axis=None) or table_b[keys_b].isna().any(axis=None):
+        return None
+
+    try:
+        return table_a.merge(table_b, how=how, left_on=keys_a, right_on=keys_b, sort=False)
+    except (ValueError, TypeError):
+        return None
+
+
+def duckdb_join(table_a, table_b, join_condition, join_type):
+    query = f"""
+                   SELECT * FROM table_a {join_type} table_b
+                   ON {join_condition}
+               """
+    resp_df, _description = query_df_with_type_infer_fallback(query, {
+        'table_a': table_a,
+        'table_b': table_b
+    })
+    return resp_df
+
+
+def replace_nan(df):
+    # replace only columns with missing values
+    nan_columns = df.columns[df.isna().any()]
+    if len(nan_columns) == 0:
+        return df
+    df = df.copy(deep=False)
+    for column in nan_columns:
+        df[column] = df[column].replace({np.nan: None})
+    return df
+
+
 class JoinStepCall(BaseStepCall):
 
     bind = JoinStep
@@ -49,6 +165,7 @@ class JoinStepCall(BaseStepCall):
             b_row_id = r_row_ids[0].get_hash_name(prefix='B')
 
             join_condition = f'table_a.{a_row_id} = table_b.{b_row_id}'
+            join_keys = [(a_row_id, b_row_id)]
 
             join_type = step.query.join_type.lower()
             if join_type == 'join':
@@ -80,21 +197,21 @@ class JoinStepCall(BaseStepCall):
             query_traversal(condition, adapt_condition)
 
             join_condition = SqlalchemyRender('postgres').get_string(condition)
+            join_keys = get_equi_join_keys(condition)
             join_type = step.query.join_type
 
         table_a, names_a = left_data.to_df_cols(prefix='A')
         table_b, names_b = right_data.to_df_cols(prefix='B')
 
-        query = f"""
-                       SELECT * FROM table_a {join_type} table_b
-                       ON {join_condition}
-                   """
-        resp_df, _description = query_df_with_type_infer_fallback(query, {
-            'table_a': table_a,
-            'table_b': table_b
-        })
+        resp_df = None
+        if join_keys is not None:
+            resp_df = hash_join(table_a, table_b, join_keys, join_type)
+
+        if resp_df is None:
+            # complex condition, use duckdb
+            resp_df = duckdb_join(table_a, table_b, join_condition, join_type)
 
-        resp_df = resp_df.replace({np.nan: None})
+        resp_df = replace_nan(resp_df)
 
         names_a.update(names_b)
         data = ResultSet().from_df_cols(resp_df, col_names=names_a)
@@ -1,6 +1,8 @@
 import os
 import copy
 
+import pandas as pd
+
 from mindsdb_sql.parser.ast import (
     BinaryOperation,
     UnaryOperation,
@@ -43,15 +45,56 @@ def replaceQueryVar(where, var_value, var_name):
             where.value = var_value
 
 
-def join_query_data(target, source):
-    if len(target.columns) == 0:
-        target = source
-    else:
-        target.add_from_result_set(source)
-    return target
+class ResultSetAccumulator:
+    """
+    Collects results of partitions and concatenates them once at the end.
+    Results are added in order of partitions, columns are aligned by names of the first result
+    """
+
+    def __init__(self):
+        self.first = None
+        self.raw_dfs = []
+
+    def add(self, result_set):
+        if len(result_set.columns) == 0:
+            return
+        if self.first is None:
+            self.first = result_set
+            self.raw_dfs.append(result_set.get_raw_df())
+            return
+
+        # reorder columns in order of first result
+        source_names = result_set.get_column_names()
+        first_names = self.first.get_column_names()
+        if sorted(source_names) != sorted(first_names):
+            raise LogicError(f'Results of partitions have different columns: {first_names} and {source_names}')
+        col_sequence = [
+            source_names.index(name)
+            for name in first_names
+        ]
+        self.raw_dfs.append(result_set.get_raw_df()[col_sequence])
+
+    def get_result(self):
+        if self.first is None:
+            return ResultSet()
+        if len(self.raw_dfs) == 1:
+            return self.first
+
+        data = ResultSet(columns=self.first.columns)
+        data.is_prediction = self.first.is_prediction
+        data.add_raw_df(pd.concat(
+            [df.set_axis(range(len(df.columns)), axis=1, copy=False) for df in self.raw_dfs],
+            ignore_index=True
+        ))
+        return data
 
 
 class MapReduceStepCall(BaseStepCall):
+    """
+    Executes substeps for every partition of input data (or every group of vars) in shared executor.
+    If the step is executed in a thread of shared executor (for example, it is a part of other partitioned query):
+      partitions are executed sequentially in this thread, see `execute_in_threads`
+    """
 
     bind = MapReduceStep
 
@@ -83,7 +126,7 @@ class MapReduceStepCall(BaseStepCall):
         if not isinstance(substeps, list):
             substeps = [substeps]
 
-        data = ResultSet()
+        data = ResultSetAccumulator()
 
         df = input_data.get_raw_df()
 
@@ -98,16 +141,9 @@ class MapReduceStepCall(BaseStepCall):
 
         tasks = split_data_f(df)
 
-        # workers count
-        is_cloud = Config().get('cloud', False)
-        if is_cloud:
-            max_threads = int(os.getenv('MAX_QUERY_PARTITIONS', 10))
-        else:
-            max_threads = os.cpu_count() - 2
-
         # don't exceed chunk_count
         chunk_count = int(len(df) / partition)
-        max_threads = min(max_threads, chunk_count)
+        max_threads = min(self.get_max_threads(), chunk_count)
 
         if max_threads < 1:
             max_threads = 1
@@ -118,14 +154,24 @@ class MapReduceStepCall(BaseStepCall):
             for task in tasks:
                 sub_data = self._exec_partition(*task)
                 if sub_data:
-                    data = join_query_data(data, sub_data)
+                    data.add(sub_data)
 
         else:
-            for sub_data in execute_in_threads(self._exec_partition, tasks, thread_count=max_threads):
+            for sub_data in execute_in_threads(self._exec_partition, tasks, thread_count=max_threads, ordered=True):
                 if sub_data:
-                    data = join_query_data(data, sub_data)
+                    data.add(sub_data)
 
-        return data
+        return data.get_result()
+
+    @staticmethod
+    def get_max_threads():
+        # workers count
+        is_cloud = Config().get('cloud', False)
+        if is_cloud:
+            max_threads = int(os.getenv('MAX_QUERY_PARTITIONS', 10))
+        else:
+            max_threads = os.cpu_count() - 2
+        return max_threads
 
     def _exec_partition(self, df, substeps, input_idx, input_columns):
 
@@ -156,17 +202,28 @@ class MapReduceStepCall(BaseStepCall):
 
         substep = step.step
 
-        data = ResultSet()
+        data = ResultSetAccumulator()
 
+        tasks = []
         for var_group in vars:
             steps2 = copy.deepcopy(substep)
 
             self._fill_vars(steps2, var_group)
+            tasks.append((steps2,))
 
-            sub_data = self.sql_query.execute_step(steps2)
-            data = join_query_data(data, sub_data)
+        max_threads = min(self.get_max_threads(), len(tasks))
+        if max_threads <= 1:
+            for task in tasks:
+                data.add(self._exec_vars(*task))
+        else:
+            for sub_data in execute_in_threads(self._exec_vars, tasks, thread_count=max_threads, ordered=True):
+                data.add(sub_data)
 
-        return data
+        return data.get_result()
+
+    def _exec_vars(self, substep):
+        # every substep gets own copy of previous results
+        return self.sql_query.execute_step(substep, steps_data=self.steps_data.copy())
 
     def _fill_vars(self, step, var_group):
         if isinstance(step, MultipleSteps):
@@ -23,7 +23,7 @@ class GetPredictorColumnsCall(BaseStepCall):
         mindsdb_database_name = 'mindsdb'
 
         predictor_name = step.predictor.parts[-1]
-        dn = self.session.datahub.get(mindsdb_database_name)
+        dn = self.session.datahub.get(mindsdb_database_name, catalog=self.sql_query.catalog)
         columns = [col['name'] for col in dn.get_table_columns(predictor_name)]
 
         data = ResultSet()
@@ -43,7 +43,7 @@ class GetTableColumnsCall(BaseStepCall):
     def call(self, step):
 
         table = step.table
-        dn = self.session.datahub.get(step.namespace)
+        dn = self.session.datahub.get(step.namespace, catalog=self.sql_query.catalog)
         ds_query = Select(from_table=Identifier(table), targets=[Star()], limit=Constant(0))
 
         data, columns_info = dn.query(ds_query, session=self.session)
@@ -1,9 +1,12 @@
 from collections import defaultdict
 
+import pandas as pd
+
 from mindsdb_sql.parser.ast import (
     Identifier,
     Select,
     Star,
+    Function,
 )
 from mindsdb_sql.planner.steps import ProjectStep
 from mindsdb_sql.planner.utils import query_traversal
@@ -81,6 +84,28 @@ class ProjectStepCall(BaseStepCall):
                 targets.append(target)
         query.targets = targets
 
-        res = query_df(df, query, session=self.session)
+        batch_size = self.session.stream_batch_size
+        if batch_size and len(df) > batch_size and self.is_row_wise(query.targets):
+            # every row is processed independently, it is possible to do it by chunks
+            res = pd.concat([
+                query_df(df.iloc[start: start + batch_size], query, session=self.session)
+                for start in range(0, len(df), batch_size)
+            ], ignore_index=True)
+        else:
+            res = query_df(df, query, session=self.session)
 
         return ResultSet().from_df_cols(res, col_names, strict=False)
+
+    @staticmethod
+    def is_row_wise(targets):
+        """
+        Targets don't have functions: they can be aggregating and require all rows at once
+        """
+        functions = []
+
+        def find_functions(node, **kwargs):
+            if isinstance(node, Function):
+                functions.append(node)
+
+        query_traversal(targets, find_functions)
+        return len(functions) == 0
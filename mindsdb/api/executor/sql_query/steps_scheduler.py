@@ -0,0 +1,154 @@
+import time
+
+from mindsdb_sql.parser.ast import Parameter
+from mindsdb_sql.planner.steps import FetchDataframeStep
+from mindsdb_sql.planner.utils import query_traversal
+
+import mindsdb.utilities.profiler as profiler
+from mindsdb.utilities.config import Config
+from mindsdb.utilities.context import context as ctx
+from mindsdb.utilities.context_executor import get_shared_executor, execute_in_threads
+
+from .semi_join import find_semi_joins
+
+DEFAULT_MAX_PARALLEL_FETCHES = 4
+# keys of the driver are rendered as constants of their python type, comparison with column of other type
+# depends on the database of the probe (for example, int keys and varchar column). Enabled by 'executor.semi_join'
+DEFAULT_SEMI_JOIN = False
+
+
+def get_fetch_dependencies(step: FetchDataframeStep) -> set:
+    """
+    Find steps which results are used in query of FetchDataframeStep
+
+    :param step: fetch step
+    :return: set of step numbers
+    """
+    dependencies = set()
+    if step.query is None:
+        return dependencies
+
+    def find_params(node, **kwargs):
+        if isinstance(node, Parameter) and hasattr(node.value, 'step_num'):
+            dependencies.add(node.value.step_num)
+
+    query_traversal(step.query, find_params)
+    return dependencies
+
+
+class StepsScheduler:
+    """
+    Executes steps of the plan.
+    FetchDataframeSteps which don't depend on each other are executed concurrently:
+      they are started together as soon as all steps they depend on are completed.
+    All other steps are executed sequentially in the order of plan: they can modify results of previous steps.
+    Fetch step joined to filtered table from other integration can be executed after it as semi-join:
+      with filter by join keys of the filtered table. It is disabled by default, see DEFAULT_SEMI_JOIN.
+    """
+
+    def __init__(self, sql_query):
+        self.sql_query = sql_query
+        self.steps_data = sql_query.steps_data
+
+        config = Config().get('executor', {})
+        self.max_threads = config.get('max_parallel_fetches', DEFAULT_MAX_PARALLEL_FETCHES)
+        self.use_semi_join = config.get('semi_join', DEFAULT_SEMI_JOIN)
+        self.semi_joins = {}
+
+    def get_dependencies(self, step: FetchDataframeStep) -> set:
+        dependencies = get_fetch_dependencies(step)
+        if step.step_num in self.semi_joins:
+            dependencies.add(self.semi_joins[step.step_num].driver_step_num)
+        return dependencies
+
+    def _order_semi_joins(self, steps: list) -> list:
+        # probe step have to be executed after driver step
+        steps = list(steps)
+        for probe_step_num, semi_join in self.semi_joins.items():
+            positions = {step.step_num: i for i, step in enumerate(steps)}
+            probe_idx = positions[probe_step_num]
+            driver_idx = positions[semi_join.driver_step_num]
+            if probe_idx < driver_idx:
+                probe_step = steps.pop(probe_idx)
+                steps.insert(driver_idx, probe_step)
+        return steps
+
+    def execute_step(self, step):
+        semi_join = self.semi_joins.get(step.step_num)
+        if semi_join is not None:
+            return semi_join.execute(step, self.sql_query, self.steps_data)
+        return self.sql_query.execute_step(step)
+
+    def execute(self, steps: list):
+        """
+        Execute steps and save results into steps_data of sql_query
+
+        :param steps: list of steps
+        :return: result of the last step
+        """
+        if self.use_semi_join:
+            self.semi_joins = find_semi_joins(steps, self.sql_query.context.get('database'))
+
+        pending = self._order_semi_joins(steps)
+        while len(pending) > 0:
+            step = pending.pop(0)
+
+            if isinstance(step, FetchDataframeStep) and self.max_threads > 1:
+                # other fetch steps which can be run together with this one
+                wave = [step] + [
+                    next_step
+                    for next_step in pending
+                    if isinstance(next_step, FetchDataframeStep)
+                    and self.get_dependencies(next_step).issubset(self.steps_data.keys())
+                ]
+                if len(wave) > 1:
+                    for next_step in wave[1:]:
+                        pending.remove(next_step)
+                    self.execute_concurrently(wave)
+                    continue
+
+            with profiler.Context(f'step: {step.__class__.__name__}'):
+                step_result = self.execute_step(step)
+            self.steps_data[step.step_num] = step_result
+
+        if len(steps) == 0:
+            return None
+        return self.steps_data[steps[-1].step_num]
+
+    def execute_concurrently(self, steps: list):
+        """
+        Execute fetch steps in shared executor: every step takes its own connection from pool of integration.
+        No more than max_parallel_fetches steps are executed at the same time.
+        If it is called from a thread of shared executor: steps are executed sequentially in current thread,
+          waiting for other tasks of the executor can lead to deadlock
+
+        :param steps: list of fetch steps
+        """
+        if len(steps) == 1 or get_shared_executor().is_worker_thread():
+            results = [self._execute_timed(step) for step in steps]
+        else:
+            results = list(execute_in_threads(
+                self._execute_timed_in_thread,
+                [(step,) for step in steps],
+                thread_count=self.max_threads,
+                ordered=True
+            ))
+
+        for step, step_result, start_at, stop_at in results:
+            profiler.add_node(f'step: {step.__class__.__name__}', start_at, stop_at)
+            self.steps_data[step.step_num] = step_result
+
+    def _execute_timed_in_thread(self, step) -> tuple:
+        # profiling tree of the query can't be modified from other threads
+        ctx.profiling = {
+            'level': 0,
+            'enabled': False,
+            'pointer': None,
+            'tree': None
+        }
+        return self._execute_timed(step)
+
+    def _execute_timed(self, step) -> tuple:
+        start_at = time.perf_counter()
+        step_result = self.execute_step(step)
+        return step, step_result, start_at, time.perf_counter()
@@ -1,9 +1,17 @@
 import copy
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from functools import lru_cache
 from typing import List
 
 import duckdb
 from duckdb import InvalidInputException
 import numpy as np
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
 
 from mindsdb_sql import parse_sql
 from mindsdb_sql.render.sqlalchemy_render import SqlalchemyRender
@@ -19,6 +27,115 @@ from mindsdb.utilities.json_encoder import CustomJSONEncoder
 
 logger = log.getLogger(__name__)
 
+_RENDER_CACHE_SIZE = 1000
+
+
+class DuckDBThreadConnection(threading.local):
+    """In-memory duckdb connection, one for every thread"""
+
+    def __init__(self):
+        self.connection = None
+        self.in_use = False
+        # user functions created in the connection: signature by name
+        self.functions = {}
+        # callbacks of user functions for the current query
+        self.bound_functions = {}
+
+    def reset(self):
+        if self.connection is not None:
+            try:
+                self.connection.close()
+            except Exception:
+                pass
+        self.connection = None
+        self.functions = {}
+        self.bound_functions = {}
+
+
+_duckdb_thread_connection = DuckDBThreadConnection()
+
+
+@contextmanager
+def get_duckdb_connection():
+    """
+    Get in-memory duckdb connection of current thread. Connection is created once and reused by next calls
+
+    Yields:
+        duckdb connection
+    """
+    local = _duckdb_thread_connection
+    if local.in_use:
+        # nested call in the same thread (for example from user function), use temporary connection
+        con = duckdb.connect(database=':memory:')
+        try:
+            yield con
+        finally:
+            con.close()
+        return
+
+    if local.connection is None:
+        local.connection = duckdb.connect(database=':memory:')
+
+    local.in_use = True
+    try:
+        yield local.connection
+    except Exception:
+        # state of connection is unknown, create a new one next time
+        local.reset()
+        raise
+    finally:
+        local.in_use = False
+
+
+@lru_cache(maxsize=_RENDER_CACHE_SIZE)
+def _parse_query(query_str: str) -> ASTNode:
+    return parse_sql(query_str)
+
+
+_render_cache = OrderedDict()
+_render_cache_lock = threading.Lock()
+
+
+def render_to_postgres(query_ast: ASTNode, query=None) -> str:
+    """
+    Render query to postgres dialect. Results of rendering are cached by text representation of AST
+
+    Args:
+        query_ast (ASTNode): query to render
+        query: original query, for logging
+
+    Returns:
+        str
+    """
+    try:
+        key = query_ast.to_string()
+    except Exception:
+        key = None
+
+    if key is not None:
+        with _render_cache_lock:
+            query_str = _render_cache.get(key)
+            if query_str is not None:
+                _render_cache.move_to_end(key)
+                return query_str
+
+    render = SqlalchemyRender('postgres')
+    try:
+        query_str = render.get_string(query_ast, with_failback=False)
+    except Exception as e:
+        logger.error(
+            f"Exception during query casting to 'postgres' dialect. Query: {str(query)}. Error: {e}"
+        )
+        # don't cache results of failback rendering
+        return render.get_string(query_ast, with_failback=True)
+
+    if key is not None:
+        with _render_cache_lock:
+            _render_cache[key] = query_str
+            if len(_render_cache) > _RENDER_CACHE_SIZE:
+                _render_cache.popitem(last=False)
+    return query_str
+
 
 def _get_query_tables(query: ASTNode, resolve_function: callable, default_database: str = None) -> List[tuple]:
     """Find all tables/models in the query
@@ -52,10 +169,42 @@ def get_query_models(query: ASTNode, default_database: str = None) -> List[tuple
     return _get_query_tables(query, resolve_model_identifier, default_database)
 
 
+def df_to_arrow(df):
+    ''' Convert dataframe to arrow table if types of all columns can be determined unambiguously.
+        Types of arrow table are known, so duckdb doesn't need to sample object columns
+
+        Args:
+            df (pandas.DataFrame): input dataframe
+
+        Returns:
+            pyarrow.Table or None if conversion is not possible
+    '''
+    if pa is None:
+        return None
+
+    if not all(isinstance(name, str) for name in df.columns):
+        # arrow casts names to strings
+        return None
+
+    try:
+        table = pa.Table.from_pandas(df, preserve_index=False)
+    except (pa.ArrowException, ValueError, TypeError):
+        # mixed types in object column
+        return None
+
+    for field in table.schema:
+        if pa.types.is_nested(field.type):
+            # dicts and lists are processed as json strings in pandas mode
+            return None
+    return table
+
+
 def query_df_with_type_infer_fallback(query_str: str, dataframes: dict, user_functions=None):
     ''' Duckdb need to infer column types if column.dtype == object. By default it take 1000 rows,
         but that may be not sufficient for some cases. This func try to run query multiple times
-        increasing butch size for type infer
+        increasing butch size for type infer.
+        If dataframes can be converted to arrow tables: they are registered in duckdb
+        and query is executed once, without types inference
 
         Args:
             query_str (str): query to execute
@@ -70,22 +219,47 @@ def query_df_with_type_infer_fallback(query_str: str, dataframes: dict, user_fun
     for name, value in dataframes.items():
         locals()[name] = value
 
-    con = duckdb.connect(database=':memory:')
-    if user_functions:
-        user_functions.register(con)
+    arrow_tables = {
+        name: df_to_arrow(df)
+        for name, df in dataframes.items()
+    }
 
-    for sample_size in [1000, 10000, 1000000]:
-        try:
-            con.execute(f'set global pandas_analyze_sample={sample_size};')
-            result_df = con.execute(query_str).fetchdf()
-        except InvalidInputException:
-            pass
+    local = _duckdb_thread_connection
+    with get_duckdb_connection() as con:
+        if con is local.connection:
+            registered_functions, bound_functions = local.functions, local.bound_functions
         else:
-            break
-    else:
-        raise InvalidInputException
-    description = con.description
-    con.close()
+            # temporary connection
+            registered_functions, bound_functions = {}, {}
+
+        if user_functions:
+            user_functions.register(con, registered_functions, bound_functions)
+
+        try:
+            if all(table is not None for table in arrow_tables.values()):
+                for name, table in arrow_tables.items():
+                    con.register(name, table)
+                try:
+                    result_df = con.execute(query_str).fetchdf()
+                    description = con.description
+                finally:
+                    for name in arrow_tables.keys():
+                        con.unregister(name)
+            else:
+                for sample_size in [1000, 10000, 1000000]:
+                    try:
+                        con.execute(f'set global pandas_analyze_sample={sample_size};')
+                        result_df = con.execute(query_str).fetchdf()
+                    except InvalidInputException:
+                        pass
+                    else:
+                        break
+                else:
+                    raise InvalidInputException
+                description = con.description
+        finally:
+            # callbacks are bound to the session, they must not be available to the next queries of the thread
+            bound_functions.clear()
 
     return result_df, description
 
@@ -102,7 +276,7 @@ def query_df(df, query, session=None):
     """
 
     if isinstance(query, str):
-        query_ast = parse_sql(query)
+        query_ast = copy.deepcopy(_parse_query(query))
     else:
         query_ast = copy.deepcopy(query)
 
@@ -163,14 +337,7 @@ def query_df(df, query, session=None):
     for column in json_columns:
         df[column] = df[column].apply(_convert)
 
-    render = SqlalchemyRender('postgres')
-    try:
-        query_str = render.get_string(query_ast, with_failback=False)
-    except Exception as e:
-        logger.error(
-            f"Exception during query casting to 'postgres' dialect. Query: {str(query)}. Error: {e}"
-        )
-        query_str = render.get_string(query_ast, with_failback=True)
+    query_str = render_to_postgres(query_ast, query)
 
     # workaround to prevent duckdb.TypeMismatchException
     if len(df) > 0:
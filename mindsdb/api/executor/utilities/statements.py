@@ -0,0 +1,45 @@
+"""
+Parsing of queries: statements which are not supported by parser are recognized before it,
+the others are parsed by mindsdb_sql with cache of parsed queries
+"""
+import re
+
+from mindsdb_sql import parse_sql
+from mindsdb_sql.parser.ast import Identifier
+from mindsdb_sql.parser.ast.base import ASTNode
+
+from mindsdb.api.executor.sql_query.plan_cache import parse_cache
+
+REFRESH_SCHEMA_RE = re.compile(r'^\s*refresh\s+schema\s+(?P<name>`[^`]+`|"[^"]+"|[\w$]+)\s*;?\s*$', re.IGNORECASE)
+
+
+class RefreshSchema(ASTNode):
+    """
+    REFRESH SCHEMA <database>: reload schema catalog of database. The statement is not supported by parser.
+    """
+
+    def __init__(self, name: Identifier, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.name = name
+
+    def to_tree(self, *args, level=0, **kwargs):
+        return ' ' * level + f'RefreshSchema(name={self.name.to_tree()})'
+
+    def get_string(self, *args, **kwargs):
+        return f'REFRESH SCHEMA {self.name.to_string()}'
+
+
+def parse_query(sql: str, dialect: str = 'mindsdb'):
+    """
+    Parse sql using cache of parsed queries
+
+    :param sql: text of query
+    :param dialect: dialect of parser
+    :return: AST of query
+    """
+    refresh_match = REFRESH_SCHEMA_RE.match(sql)
+    if refresh_match is not None:
+        return RefreshSchema(name=Identifier(parts=[refresh_match.group('name').strip('`"')]))
+
+    key = (dialect, sql.strip().rstrip(';'))
+    return parse_cache.get_or_create(key, lambda: parse_sql(sql, dialect=dialect))
@@ -185,7 +185,7 @@ class Integration(Resource):
 
             # copy storage
             if storage is not None:
-                handler = ca.integration_controller.get_data_handler(name)
+                handler = ca.integration_controller.get_data_handler(name, connect=False)
 
                 export = decrypt(storage.encode(), secret_key)
                 handler.handler_storage.import_files(export)
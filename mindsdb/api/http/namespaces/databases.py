@@ -115,8 +115,8 @@ class DatabaseResource(Resource):
                     'error_message': None
                 }
                 try:
-                    handler = session.integration_controller.get_data_handler(database_name)
-                    status = handler.check_connection()
+                    with session.integration_controller.data_handler(database_name) as handler:
+                        status = handler.check_connection()
                     integration['connection_status']['success'] = status.success
                     integration['connection_status']['error_message'] = status.error_message
                 except Exception as e:
@@ -358,19 +358,18 @@ class TableResource(Resource):
         )
 
         try:
-            integration_handler = session.integration_controller.get_data_handler(database_name)
-        except Exception:
-            return http_error(
-                HTTPStatus.INTERNAL_SERVER_ERROR, 'Error',
-                f'Could not get database handler for {database_name}'
-            )
-        try:
-            result = integration_handler.query(drop_ast)
+            with session.integration_controller.data_handler(database_name) as integration_handler:
+                result = integration_handler.query(drop_ast)
         except NotImplementedError:
             return http_error(
                 HTTPStatus.BAD_REQUEST, 'Error',
                 f'Database {database_name} does not support dropping tables.'
             )
+        except Exception:
+            return http_error(
+                HTTPStatus.INTERNAL_SERVER_ERROR, 'Error',
+                f'Could not get database handler for {database_name}'
+            )
         if result.type == RESPONSE_TYPE.ERROR:
             return http_error(HTTPStatus.BAD_REQUEST, 'Error', result.error_message)
         return '', HTTPStatus.NO_CONTENT
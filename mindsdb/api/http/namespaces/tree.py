@@ -58,11 +58,11 @@ class GetLeaf(Resource):
                 'deletable': val.get('deletable')
             } for key, val in tables.items()]
         elif db['type'] == 'data':
-            handler = ca.integration_controller.get_data_handler(db_name)
-            if 'all' in inspect.signature(handler.get_tables).parameters:
-                response = handler.get_tables(all=with_schemas)
-            else:
-                response = handler.get_tables()
+            with ca.integration_controller.data_handler(db_name) as handler:
+                if 'all' in inspect.signature(handler.get_tables).parameters:
+                    response = handler.get_tables(all=with_schemas)
+                else:
+                    response = handler.get_tables()
             if response.type != 'table':
                 return []
             table_types = {
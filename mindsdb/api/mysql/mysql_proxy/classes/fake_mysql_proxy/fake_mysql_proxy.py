@@ -12,7 +12,7 @@ class Dummy:
 
 
 class FakeMysqlProxy(MysqlProxy):
-    def __init__(self):
+    def __init__(self, session: SessionController = None):
         request = Dummy()
         client_address = ['', '']
         server = Dummy()
@@ -28,7 +28,9 @@ class FakeMysqlProxy(MysqlProxy):
         self.server = server
         self.connection_id = None
 
-        self.session = SessionController()
+        if session is None:
+            session = SessionController()
+        self.session = session
         self.session.database = 'mindsdb'
 
     def is_cloud_connection(self):
@@ -1,9 +1,9 @@
-from mindsdb_sql import parse_sql
 from mindsdb_sql.planner import utils as planner_utils
 
 import mindsdb.utilities.profiler as profiler
 from mindsdb.api.executor import Column, SQLQuery
 from mindsdb.api.executor.command_executor import ExecuteCommands
+from mindsdb.api.executor.utilities.statements import parse_query
 from mindsdb.api.mysql.mysql_proxy.utilities import ErSqlSyntaxError
 from mindsdb.utilities import log
 
@@ -36,7 +36,9 @@ class Executor:
         # self.json() method
         self.columns = []
         self.params = []
-        self.data = None
+        self.result_set = None
+        self._data = None
+        self._json_types = False
         self.state_track = None
         self.server_status = None
         self.is_executed = False
@@ -49,6 +51,17 @@ class Executor:
         context = {'connection_id': self.sqlserver.connection_id}
         self.command_executor = ExecuteCommands(self.session, context)
 
+    @property
+    def data(self):
+        # result is converted to lists on demand: mysql text protocol encodes ResultSet directly
+        if self._data is None and self.result_set is not None:
+            self._data = self.result_set.to_lists(json_types=self._json_types)
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
     def change_default_db(self, new_db):
         self.command_executor.change_default_db(new_db)
 
@@ -109,10 +122,10 @@ class Executor:
         self.sql_lower = sql_lower.replace("`", "")
 
         try:
-            self.query = parse_sql(sql, dialect="mindsdb")
+            self.query = parse_query(sql, dialect="mindsdb")
         except Exception as mdb_error:
             try:
-                self.query = parse_sql(sql, dialect="mysql")
+                self.query = parse_query(sql, dialect="mysql")
             except Exception:
                 # not all statements are parsed by parse_sql
                 logger.warning(f"SQL statement is not parsed by mindsdb_sql: {sql}")
@@ -138,11 +151,11 @@ class Executor:
         self.is_executed = True
 
         if self.sqlserver.session.api_type == 'http':
-            json_types = True
+            self._json_types = True
         else:
-            json_types = False
+            self._json_types = False
         if ret.data is not None:
-            self.data = ret.data.to_lists(json_types=json_types)
+            self.result_set = ret.data
             self.columns = ret.data.columns
 
         self.state_track = ret.state_track
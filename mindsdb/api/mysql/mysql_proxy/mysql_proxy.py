@@ -24,6 +24,7 @@ from functools import partial
 from typing import Dict, List
 
 from numpy import dtype as np_dtype
+import pandas as pd
 from pandas.api import types as pd_types
 
 import mindsdb.utilities.hooks as hooks
@@ -49,7 +50,6 @@ from mindsdb.api.mysql.mysql_proxy.data_types.mysql_packets import (
     HandshakeResponsePacket,
     OkPacket,
     PasswordAnswer,
-    ResultsetRowPacket,
     STMTPrepareHeaderPacket,
     SwitchOutPacket,
     SwitchOutResponse,
@@ -74,9 +74,18 @@ from mindsdb.api.mysql.mysql_proxy.utilities import (
     SqlApiException,
 )
 from mindsdb.api.executor import exceptions as exec_exc
+from mindsdb.api.executor.sql_query.result_set import ResultSet
+from mindsdb.api.executor.data_types.result_cursor import ResultCursor
 
 from mindsdb.api.common.check_auth import check_auth
+from mindsdb.api.common.connection_server import create_server
 from mindsdb.api.mysql.mysql_proxy.utilities.lightwood_dtype import dtype
+from mindsdb.api.mysql.mysql_proxy.utilities.row_encoder import (
+    TextRowsEncoder,
+    column_max_length,
+    TYPE_MAX_LENGTH,
+    DEFAULT_MAX_LENGTH,
+)
 from mindsdb.utilities import log
 from mindsdb.utilities.config import Config
 from mindsdb.utilities.context import context as ctx
@@ -95,23 +104,38 @@ class SQLAnswer:
         resp_type: RESPONSE_TYPE,
         columns: List[Dict] = None,
         data: List[Dict] = None,
+        result_set: ResultSet = None,
         status: int = None,
         state_track: List[List] = None,
         error_code: int = None,
         error_message: str = None,
+        json_types: bool = False,
     ):
         self.resp_type = resp_type
         self.columns = columns
-        self.data = data
+        self._data = data
+        self.result_set = result_set
         self.status = status
         self.state_track = state_track
         self.error_code = error_code
         self.error_message = error_message
+        self.json_types = json_types
 
     @property
     def type(self):
         return self.resp_type
 
+    @property
+    def data(self) -> List[List]:
+        # result is converted to lists on demand: mysql text protocol encodes ResultSet directly
+        if self._data is None and self.result_set is not None:
+            self._data = self.result_set.to_lists(json_types=self.json_types)
+        return self._data
+
+    @data.setter
+    def data(self, value: List[List]):
+        self._data = value
+
 
 class MysqlProxy(SocketServer.BaseRequestHandler):
     """
@@ -128,6 +152,7 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
         self.session = None
         self.client_capabilities = None
         self.connection_id = None
+        self.socket = request
         super().__init__(request, client_address, server)
 
     def init_session(self):
@@ -315,13 +340,7 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
 
     def send_query_answer(self, answer: SQLAnswer):
         if answer.type == RESPONSE_TYPE.TABLE:
-            packages = []
-            packages += self.get_tabel_packets(columns=answer.columns, data=answer.data)
-            if answer.status is not None:
-                packages.append(self.last_packet(status=answer.status))
-            else:
-                packages.append(self.last_packet())
-            self.send_package_group(packages)
+            self.send_table(answer)
         elif answer.type == RESPONSE_TYPE.OK:
             self.packet(OkPacket, state_track=answer.state_track).send()
         elif answer.type == RESPONSE_TYPE.ERROR:
@@ -329,7 +348,42 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
                 ErrPacket, err_code=answer.error_code, msg=answer.error_message
             ).send()
 
-    def _get_column_defenition_packets(self, columns, data=None):
+    def send_table(self, answer: SQLAnswer):
+        """Send table answer to socket: header and then rows.
+        Rows are encoded column-wise and sent by frames, to not keep whole encoded answer in memory
+        """
+        if answer.result_set is not None:
+            data = answer.result_set.get_raw_df()
+        else:
+            data = pd.DataFrame(answer.data or [], dtype=object)
+
+        packages = [self.packet(ColumnCountPacket, count=len(answer.columns))]
+        # result can be big, don't make extra pass over all values
+        exact_length = not self.session.stream_batch_size
+        packages.extend(self._get_column_defenition_packets(answer.columns, data, exact_length=exact_length))
+        if self.client_capabilities.DEPRECATE_EOF is False:
+            packages.append(self.packet(EofPacket, status=0))
+        self.send_package_group(packages)
+
+        if answer.result_set is not None:
+            chunks = answer.result_set.iter_raw_chunks(self.session.stream_batch_size)
+        else:
+            chunks = [data]
+        encoder = TextRowsEncoder(self.session)
+        for frame in encoder.iter_frames(chunks):
+            self.socket.sendall(frame)
+
+        if answer.status is not None:
+            self.send_package_group([self.last_packet(status=answer.status)])
+        else:
+            self.send_package_group([self.last_packet()])
+
+    def _get_column_defenition_packets(self, columns, data=None, exact_length=True):
+        """
+        :param columns: list of mysql columns
+        :param data: dataframe with result
+        :param exact_length: compute max length of column by its values, otherwise use max length of column type
+        """
         if data is None:
             data = []
         packets = []
@@ -345,14 +399,11 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
             column_alias = column.get("alias", column_name)
             flags = column.get("flags", 0)
             if len(data) == 0:
-                length = 0xFFFF
+                length = DEFAULT_MAX_LENGTH
+            elif exact_length:
+                length = max(column_max_length(data.iloc[:, i]), 1)
             else:
-                length = 1
-                for row in data:
-                    if isinstance(row, dict):
-                        length = max(len(str(row[column_alias])), length)
-                    else:
-                        length = max(len(str(row[i])), length)
+                length = TYPE_MAX_LENGTH.get(column["type"], DEFAULT_MAX_LENGTH)
 
             packets.append(
                 self.packet(
@@ -370,17 +421,6 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
             )
         return packets
 
-    def get_tabel_packets(self, columns, data, status=0):
-        # TODO remove columns order
-        packets = [self.packet(ColumnCountPacket, count=len(columns))]
-        packets.extend(self._get_column_defenition_packets(columns, data))
-
-        if self.client_capabilities.DEPRECATE_EOF is False:
-            packets.append(self.packet(EofPacket, status=status))
-
-        packets += [self.packet(ResultsetRowPacket, data=x) for x in data]
-        return packets
-
     def decode_utf(self, text):
         try:
             return text.decode("utf-8")
@@ -496,7 +536,7 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
 
         executor.query_execute(sql)
 
-        if executor.data is None:
+        if executor.result_set is None:
             resp = SQLAnswer(
                 resp_type=RESPONSE_TYPE.OK,
                 state_track=executor.state_track,
@@ -506,8 +546,9 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
                 resp_type=RESPONSE_TYPE.TABLE,
                 state_track=executor.state_track,
                 columns=self.to_mysql_columns(executor.columns),
-                data=executor.data,
+                result_set=executor.result_set,
                 status=executor.server_status,
+                json_types=self.session.api_type == 'http',
             )
         return resp
 
@@ -549,12 +590,19 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
 
         executor.stmt_execute(parameters)
 
-        if executor.data is None:
+        if executor.result_set is None:
             resp = SQLAnswer(
                 resp_type=RESPONSE_TYPE.OK, state_track=executor.state_track
             )
             return self.send_query_answer(resp)
 
+        # cursor owns the result from now, statement will be executed again on the next execution
+        cursor = ResultCursor(executor.result_set)
+        executor.result_set = None
+        executor.is_executed = False
+        prepared_stmt["fetched"] = 0
+        prepared_stmt["cursor"] = cursor
+
         # TODO prepared_stmt['type'] == 'lock' is not used but it works
         columns_def = self.to_mysql_columns(executor.columns)
         packages = [self.packet(ColumnCountPacket, count=len(columns_def))]
@@ -562,41 +610,52 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
         packages.extend(self._get_column_defenition_packets(columns_def))
 
         if self.client_capabilities.DEPRECATE_EOF is False:
+            # rows will be requested by COM_STMT_FETCH
+            self.session.register_cursor(stmt_id, cursor)
             packages.append(self.packet(EofPacket, status=0x0062))
         else:
             # send all
-            for row in executor.data:
+            rows = cursor.fetch()
+            for row in rows:
                 packages.append(
                     self.packet(BinaryResultsetRowPacket, data=row, columns=columns_def)
                 )
 
             server_status = executor.server_status or 0x0002
             packages.append(self.last_packet(status=server_status))
-            prepared_stmt["fetched"] += len(executor.data)
+            prepared_stmt["fetched"] += len(rows)
 
         return self.send_package_group(packages)
 
     def answer_stmt_fetch(self, stmt_id, limit):
         prepared_stmt = self.session.prepared_stmts[stmt_id]
         executor = prepared_stmt["statement"]
-        fetched = prepared_stmt["fetched"]
 
-        if executor.data is None:
+        cursor = prepared_stmt.get("cursor")
+        if cursor is None:
             resp = SQLAnswer(
                 resp_type=RESPONSE_TYPE.OK, state_track=executor.state_track
             )
             return self.send_query_answer(resp)
+        if cursor.closed and not cursor.is_exhausted:
+            resp = SQLAnswer(
+                resp_type=RESPONSE_TYPE.ERROR,
+                error_code=ERR.ER_UNKNOWN_STMT_HANDLER,
+                error_message="Cursor was closed: too many open cursors",
+            )
+            return self.send_query_answer(resp)
 
         packages = []
         columns = self.to_mysql_columns(executor.columns)
-        for row in executor.data[fetched:limit]:
+        rows = cursor.fetch(limit)
+        for row in rows:
             packages.append(
                 self.packet(BinaryResultsetRowPacket, data=row, columns=columns)
             )
 
-        prepared_stmt["fetched"] += len(executor.data[fetched:limit])
+        prepared_stmt["fetched"] += len(rows)
 
-        if len(executor.data) <= limit + fetched:
+        if cursor.is_exhausted:
             status = sum(
                 [
                     SERVER_STATUS.SERVER_STATUS_AUTOCOMMIT,
@@ -619,6 +678,21 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
         Handle new incoming connections
         :return:
         """
+        if getattr(self.server, "dispatches_commands", False):
+            # connection is served by ConnectionServer step by step
+            return
+
+        if self.handle_connect() is False:
+            return
+        while self.handle_command():
+            pass
+
+    def handle_connect(self) -> bool:
+        """
+        Handshake and authentication of new connection
+
+        :return: False if connection has to be closed
+        """
         ctx.set_default()
 
         self.server.hook_before_handle()
@@ -631,7 +705,7 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
         self.init_session()
         if cloud_connection["is_cloud"] is False:
             if self.handshake() is False:
-                return
+                return False
         else:
             ctx.user_class = cloud_connection["user_class"]
             ctx.email_confirmed = cloud_connection["email_confirmed"]
@@ -641,161 +715,175 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
             self.session.database = cloud_connection["database"]
             self.session.username = "cloud"
             self.session.auth = True
+        return True
 
-        while True:
-            logger.debug("Got a new packet")
-            p = self.packet(CommandPacket)
+    def handle_command(self) -> bool:
+        """
+        Read and answer one command of client
 
-            try:
-                success = p.get()
-            except Exception:
-                logger.error("Session closed, on packet read error")
-                logger.error(traceback.format_exc())
-                return
+        :return: False if connection has to be closed
+        """
+        logger.debug("Got a new packet")
+        p = self.packet(CommandPacket)
 
-            if success is False:
-                logger.debug("Session closed by client")
-                return
+        try:
+            success = p.get()
+        except Exception:
+            logger.error("Session closed, on packet read error")
+            logger.error(traceback.format_exc())
+            return False
 
-            logger.debug(
-                "Command TYPE: {type}".format(type=getConstName(COMMANDS, p.type.value))
-            )
+        if success is False:
+            logger.debug("Session closed by client")
+            return False
 
-            command_names = {
-                COMMANDS.COM_QUERY: "COM_QUERY",
-                COMMANDS.COM_STMT_PREPARE: "COM_STMT_PREPARE",
-                COMMANDS.COM_STMT_EXECUTE: "COM_STMT_EXECUTE",
-                COMMANDS.COM_STMT_FETCH: "COM_STMT_FETCH",
-                COMMANDS.COM_STMT_CLOSE: "COM_STMT_CLOSE",
-                COMMANDS.COM_QUIT: "COM_QUIT",
-                COMMANDS.COM_INIT_DB: "COM_INIT_DB",
-                COMMANDS.COM_FIELD_LIST: "COM_FIELD_LIST",
-            }
+        logger.debug(
+            "Command TYPE: {type}".format(type=getConstName(COMMANDS, p.type.value))
+        )
 
-            command_name = command_names.get(p.type.value, f"UNKNOWN {p.type.value}")
-            sql = None
-            response = None
-            error_type = None
-            error_code = None
-            error_text = None
-            error_traceback = None
+        command_names = {
+            COMMANDS.COM_QUERY: "COM_QUERY",
+            COMMANDS.COM_STMT_PREPARE: "COM_STMT_PREPARE",
+            COMMANDS.COM_STMT_EXECUTE: "COM_STMT_EXECUTE",
+            COMMANDS.COM_STMT_FETCH: "COM_STMT_FETCH",
+            COMMANDS.COM_STMT_CLOSE: "COM_STMT_CLOSE",
+            COMMANDS.COM_QUIT: "COM_QUIT",
+            COMMANDS.COM_INIT_DB: "COM_INIT_DB",
+            COMMANDS.COM_FIELD_LIST: "COM_FIELD_LIST",
+        }
 
-            try:
-                if p.type.value == COMMANDS.COM_QUERY:
-                    sql = self.decode_utf(p.sql.value)
-                    sql = SqlStatementParser.clear_sql(sql)
-                    logger.debug(f"COM_QUERY: {sql}")
-                    profiler.set_meta(
-                        query=sql, api="mysql", environment=Config().get("environment")
-                    )
-                    with profiler.Context("mysql_query_processing"):
-                        response = self.process_query(sql)
-                elif p.type.value == COMMANDS.COM_STMT_PREPARE:
-                    sql = self.decode_utf(p.sql.value)
-                    self.answer_stmt_prepare(sql)
-                elif p.type.value == COMMANDS.COM_STMT_EXECUTE:
-                    self.answer_stmt_execute(p.stmt_id.value, p.parameters)
-                elif p.type.value == COMMANDS.COM_STMT_FETCH:
-                    self.answer_stmt_fetch(p.stmt_id.value, p.limit.value)
-                elif p.type.value == COMMANDS.COM_STMT_CLOSE:
-                    self.answer_stmt_close(p.stmt_id.value)
-                elif p.type.value == COMMANDS.COM_QUIT:
-                    logger.debug("Session closed, on client disconnect")
-                    self.session = None
-                    break
-                elif p.type.value == COMMANDS.COM_INIT_DB:
-                    new_database = p.database.value.decode()
-
-                    executor = Executor(session=self.session, sqlserver=self)
-                    executor.change_default_db(new_database)
-
-                    response = SQLAnswer(RESPONSE_TYPE.OK)
-                elif p.type.value == COMMANDS.COM_FIELD_LIST:
-                    # this command is deprecated, but console client still use it.
-                    response = SQLAnswer(RESPONSE_TYPE.OK)
-                else:
-                    logger.warning("Command has no specific handler, return OK msg")
-                    logger.debug(str(p))
-                    # p.pprintPacket() TODO: Make a version of print packet
-                    # that sends it to debug instead
-                    response = SQLAnswer(RESPONSE_TYPE.OK)
-
-            except SqlApiException as e:
-                # classified error
-                error_type = "expected"
-
-                response = SQLAnswer(
-                    resp_type=RESPONSE_TYPE.ERROR,
-                    error_code=e.err_code,
-                    error_message=str(e),
-                )
+        command_name = command_names.get(p.type.value, f"UNKNOWN {p.type.value}")
+        sql = None
+        response = None
+        error_type = None
+        error_code = None
+        error_text = None
+        error_traceback = None
 
-            except exec_exc.ExecutorException as e:
-                # unclassified
-                error_type = "expected"
-
-                if isinstance(e, exec_exc.NotSupportedYet):
-                    error_code = ERR.ER_NOT_SUPPORTED_YET
-                elif isinstance(e, exec_exc.KeyColumnDoesNotExist):
-                    error_code = ERR.ER_KEY_COLUMN_DOES_NOT_EXIST
-                elif isinstance(e, exec_exc.TableNotExistError):
-                    error_code = ERR.ER_TABLE_EXISTS_ERROR
-                elif isinstance(e, exec_exc.WrongArgumentError):
-                    error_code = ERR.ER_WRONG_ARGUMENTS
-                elif isinstance(e, exec_exc.LogicError):
-                    error_code = ERR.ER_WRONG_USAGE
-                elif isinstance(e, (exec_exc.BadDbError, exec_exc.BadTableError)):
-                    error_code = ERR.ER_BAD_DB_ERROR
-                else:
-                    error_code = ERR.ER_SYNTAX_ERROR
-
-                response = SQLAnswer(
-                    resp_type=RESPONSE_TYPE.ERROR,
-                    error_code=error_code,
-                    error_message=str(e),
-                )
-            except exec_exc.UnknownError as e:
-                # unclassified
-                error_type = "unexpected"
-
-                response = SQLAnswer(
-                    resp_type=RESPONSE_TYPE.ERROR,
-                    error_code=ERR.ER_UNKNOWN_ERROR,
-                    error_message=str(e),
+        try:
+            if p.type.value == COMMANDS.COM_QUERY:
+                sql = self.decode_utf(p.sql.value)
+                sql = SqlStatementParser.clear_sql(sql)
+                logger.debug(f"COM_QUERY: {sql}")
+                profiler.set_meta(
+                    query=sql, api="mysql", environment=Config().get("environment")
                 )
+                with profiler.Context("mysql_query_processing"):
+                    response = self.process_query(sql)
+            elif p.type.value == COMMANDS.COM_STMT_PREPARE:
+                sql = self.decode_utf(p.sql.value)
+                self.answer_stmt_prepare(sql)
+            elif p.type.value == COMMANDS.COM_STMT_EXECUTE:
+                self.answer_stmt_execute(p.stmt_id.value, p.parameters)
+            elif p.type.value == COMMANDS.COM_STMT_FETCH:
+                self.answer_stmt_fetch(p.stmt_id.value, p.limit.value)
+            elif p.type.value == COMMANDS.COM_STMT_CLOSE:
+                self.answer_stmt_close(p.stmt_id.value)
+            elif p.type.value == COMMANDS.COM_QUIT:
+                logger.debug("Session closed, on client disconnect")
+                self.session = None
+                return False
+            elif p.type.value == COMMANDS.COM_INIT_DB:
+                new_database = p.database.value.decode()
+
+                executor = Executor(session=self.session, sqlserver=self)
+                executor.change_default_db(new_database)
+
+                response = SQLAnswer(RESPONSE_TYPE.OK)
+            elif p.type.value == COMMANDS.COM_FIELD_LIST:
+                # this command is deprecated, but console client still use it.
+                response = SQLAnswer(RESPONSE_TYPE.OK)
+            else:
+                logger.warning("Command has no specific handler, return OK msg")
+                logger.debug(str(p))
+                # p.pprintPacket() TODO: Make a version of print packet
+                # that sends it to debug instead
+                response = SQLAnswer(RESPONSE_TYPE.OK)
+
+        except SqlApiException as e:
+            # classified error
+            error_type = "expected"
+
+            response = SQLAnswer(
+                resp_type=RESPONSE_TYPE.ERROR,
+                error_code=e.err_code,
+                error_message=str(e),
+            )
 
-            except Exception as e:
-                # any other exception
-                error_type = "unexpected"
-                error_traceback = traceback.format_exc()
-                logger.error(
-                    f"ERROR while executing query\n" f"{error_traceback}\n" f"{e}"
-                )
+        except exec_exc.ExecutorException as e:
+            # unclassified
+            error_type = "expected"
+
+            if isinstance(e, exec_exc.NotSupportedYet):
+                error_code = ERR.ER_NOT_SUPPORTED_YET
+            elif isinstance(e, exec_exc.KeyColumnDoesNotExist):
+                error_code = ERR.ER_KEY_COLUMN_DOES_NOT_EXIST
+            elif isinstance(e, exec_exc.TableNotExistError):
+                error_code = ERR.ER_TABLE_EXISTS_ERROR
+            elif isinstance(e, exec_exc.WrongArgumentError):
+                error_code = ERR.ER_WRONG_ARGUMENTS
+            elif isinstance(e, exec_exc.LogicError):
+                error_code = ERR.ER_WRONG_USAGE
+            elif isinstance(e, (exec_exc.BadDbError, exec_exc.BadTableError)):
+                error_code = ERR.ER_BAD_DB_ERROR
+            else:
                 error_code = ERR.ER_SYNTAX_ERROR
-                response = SQLAnswer(
-                    resp_type=RESPONSE_TYPE.ERROR,
-                    error_code=error_code,
-                    error_message=str(e),
-                )
 
-            if response is not None:
-                self.send_query_answer(response)
-                if response.type == RESPONSE_TYPE.ERROR:
-                    error_text = response.error_message
-                    error_code = response.error_code
-                    error_type = error_type or "expected"
-
-            hooks.after_api_query(
-                company_id=ctx.company_id,
-                api="mysql",
-                command=command_name,
-                payload=sql,
-                error_type=error_type,
+            response = SQLAnswer(
+                resp_type=RESPONSE_TYPE.ERROR,
+                error_code=error_code,
+                error_message=str(e),
+            )
+        except exec_exc.UnknownError as e:
+            # unclassified
+            error_type = "unexpected"
+
+            response = SQLAnswer(
+                resp_type=RESPONSE_TYPE.ERROR,
+                error_code=ERR.ER_UNKNOWN_ERROR,
+                error_message=str(e),
+            )
+
+        except Exception as e:
+            # any other exception
+            error_type = "unexpected"
+            error_traceback = traceback.format_exc()
+            logger.error(
+                f"ERROR while executing query\n" f"{error_traceback}\n" f"{e}"
+            )
+            error_code = ERR.ER_SYNTAX_ERROR
+            response = SQLAnswer(
+                resp_type=RESPONSE_TYPE.ERROR,
                 error_code=error_code,
-                error_text=error_text,
-                traceback=error_traceback,
+                error_message=str(e),
             )
 
+        if response is not None:
+            self.send_query_answer(response)
+            if response.type == RESPONSE_TYPE.ERROR:
+                error_text = response.error_message
+                error_code = response.error_code
+                error_type = error_type or "expected"
+
+        hooks.after_api_query(
+            company_id=ctx.company_id,
+            api="mysql",
+            command=command_name,
+            payload=sql,
+            error_type=error_type,
+            error_code=error_code,
+            error_text=error_text,
+            traceback=error_traceback,
+        )
+        return True
+
+    def has_buffered_data(self) -> bool:
+        # ssl socket can have decrypted data which is already read from the socket
+        return isinstance(self.socket, ssl.SSLSocket) and self.socket.pending() > 0
+
+    def close(self):
+        self.session = None
+
     def packet(self, packetClass=Packet, **kwargs):
         """
         Factory method for packets
@@ -823,6 +911,8 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
             self.session.predictor_cache = context["predictor_cache"]
         if "show_secrets" in context:
             self.session.show_secrets = context["show_secrets"]
+        if "stream_batch_size" in context:
+            self.session.stream_batch_size = context["stream_batch_size"]
 
     def get_context(self):
         context = {
@@ -834,6 +924,8 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
             context["profiling"] = True
         if self.session.predictor_cache is False:
             context["predictor_cache"] = False
+        if self.session.stream_batch_size is not None:
+            context["stream_batch_size"] = self.session.stream_batch_size
 
         return context
 
@@ -861,8 +953,7 @@ class MysqlProxy(SocketServer.BaseRequestHandler):
 
         logger.info(f"Starting MindsDB Mysql proxy server on tcp://{host}:{port}")
 
-        SocketServer.TCPServer.allow_reuse_address = True
-        server = SocketServer.ThreadingTCPServer((host, port), MysqlProxy)
+        server = create_server((host, port), MysqlProxy, "mysql", config["api"]["mysql"])
         server.mindsdb_config = config
         server.check_auth = partial(check_auth, config=config)
         server.cert_path = cert_path
@@ -0,0 +1,178 @@
+"""
+Encoder of dataframes to MySQL text protocol rows:
+https://dev.mysql.com/doc/internals/en/com-query-response.html#packet-ProtocolText::ResultsetRow
+
+Dataframe is converted to text column by column, every row is written to a preallocated buffer as
+separate packet. Encoded rows are returned by frames of limited size, to be sent to socket before
+encoding of the whole result is finished.
+"""
+import struct
+from typing import Iterable, Iterator, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+from mindsdb.api.mysql.mysql_proxy.libs.constants.mysql import (
+    NULL_VALUE,
+    TWO_BYTE_ENC,
+    THREE_BYTE_ENC,
+    EIGHT_BYTE_ENC,
+    TYPES,
+)
+
+DEFAULT_FRAME_SIZE = 1024 * 1024
+DEFAULT_CHUNK_ROWS = 1000
+
+DEFAULT_MAX_LENGTH = 0xFFFF
+
+# max length of text representation of values of mysql types
+TYPE_MAX_LENGTH = {
+    TYPES.MYSQL_TYPE_TINY: 4,
+    TYPES.MYSQL_TYPE_SHORT: 6,
+    TYPES.MYSQL_TYPE_INT24: 9,
+    TYPES.MYSQL_TYPE_LONG: 11,
+    TYPES.MYSQL_TYPE_LONGLONG: 20,
+    TYPES.MYSQL_TYPE_FLOAT: 12,
+    TYPES.MYSQL_TYPE_DOUBLE: 22,
+    TYPES.MYSQL_TYPE_YEAR: 4,
+    TYPES.MYSQL_TYPE_DATE: 10,
+    TYPES.MYSQL_TYPE_TIME: 17,
+    TYPES.MYSQL_TYPE_DATETIME: 26,
+    TYPES.MYSQL_TYPE_TIMESTAMP: 26,
+}
+
+# length prefixes for short strings
+_ONE_BYTE_PREFIXES = [bytes((i,)) for i in range(251)]
+
+
+def lenenc_int(value: int) -> bytes:
+    if value < 251:
+        return _ONE_BYTE_PREFIXES[value]
+    if value < 1 << 16:
+        return TWO_BYTE_ENC + struct.pack('<H', value)
+    if value < 1 << 24:
+        return THREE_BYTE_ENC + struct.pack('<I', value)[:3]
+    return EIGHT_BYTE_ENC + struct.pack('<Q', value)
+
+
+def column_to_text(column: pd.Series) -> List:
+    """
+    Convert values of column to strings, the same way as str(value)
+
+    :param column: column of dataframe
+    :return: list of strings, None for missing values
+    """
+    if (
+        pd.api.types.is_numeric_dtype(column.dtype)
+        and not pd.api.types.is_extension_array_dtype(column.dtype)
+    ):
+        # numpy converts all column at once
+        texts = column.to_numpy().astype(str)
+    else:
+        texts = np.array([str(value) for value in column.to_numpy(dtype=object)], dtype=object)
+
+    texts = texts.astype(object)
+    null_mask = column.isna().to_numpy()
+    if null_mask.any():
+        texts[null_mask] = None
+    return texts.tolist()
+
+
+def column_max_length(column: pd.Series) -> int:
+    """
+    Max length of text representation of values of column, computed without python loop over values
+    where it is possible
+
+    :param column: column of dataframe
+    :return: length
+    """
+    if len(column) == 0:
+        return 0
+    if (
+        pd.api.types.is_numeric_dtype(column.dtype)
+        and not pd.api.types.is_extension_array_dtype(column.dtype)
+    ):
+        return int(np.char.str_len(column.to_numpy().astype(str)).max())
+    return int(column.astype(str).str.len().max())
+
+
+def encode_column(texts: List) -> Tuple[List[bytes], np.ndarray]:
+    """
+    Encode strings to length-encoded strings
+
+    :param texts: output of column_to_text
+    :return: list of encoded values and array of their lengths
+    """
+    cells = []
+    for text in texts:
+        if text is None:
+            cells.append(NULL_VALUE)
+            continue
+        value = text.encode('utf-8')
+        cells.append(lenenc_int(len(value)) + value)
+    lengths = np.fromiter(map(len, cells), dtype=np.int64, count=len(cells))
+    return cells, lengths
+
+
+class TextRowsEncoder:
+    """
+    Encodes dataframes to ResultsetRow packets, sequence numbers of packets are taken from session
+    """
+
+    def __init__(self, session, frame_size: int = DEFAULT_FRAME_SIZE, chunk_rows: int = DEFAULT_CHUNK_ROWS):
+        self.session = session
+        self.frame_size = frame_size
+        self.chunk_rows = chunk_rows
+
+    def encode(self, df: pd.DataFrame) -> bytearray:
+        """
+        Encode all rows of dataframe
+
+        :param df: dataframe
+        :return: buffer with packets
+        """
+        rows_count = len(df)
+        if rows_count == 0:
+            return bytearray()
+
+        columns = []
+        row_lengths = np.zeros(rows_count, dtype=np.int64)
+        for i in range(len(df.columns)):
+            cells, lengths = encode_column(column_to_text(df.iloc[:, i]))
+            columns.append(cells)
+            row_lengths += lengths
+
+        # packet headers: 3 bytes of length + sequence number
+        seq_start = self.session.packet_sequence_number
+        headers = np.empty((rows_count, 4), dtype=np.uint8)
+        headers[:, :3] = row_lengths.astype('<u4').view(np.uint8).reshape(rows_count, 4)[:, :3]
+        headers[:, 3] = (np.arange(rows_count) + seq_start) % 256
+        headers = headers.tobytes()
+        self.session.packet_sequence_number = (seq_start + rows_count) % 256
+
+        buffer = bytearray(int(row_lengths.sum()) + 4 * rows_count)
+        pos = 0
+        for i, row in enumerate(zip(*columns)):
+            buffer[pos: pos + 4] = headers[i * 4: i * 4 + 4]
+            pos += 4
+            row = b''.join(row)
+            buffer[pos: pos + len(row)] = row
+            pos += len(row)
+        return buffer
+
+    def iter_frames(self, dataframes: Iterable[pd.DataFrame]) -> Iterator[bytes]:
+        """
+        Encode dataframes by chunks of rows and yield encoded data by parts of frame_size
+
+        :param dataframes: dataframes to encode
+        :return: generator of buffers
+        """
+        frame = bytearray()
+        for df in dataframes:
+            for start in range(0, len(df), self.chunk_rows):
+                frame += self.encode(df.iloc[start: start + self.chunk_rows])
+                if len(frame) >= self.frame_size:
+                    yield frame
+                    frame = bytearray()
+        if len(frame) > 0:
+            yield frame
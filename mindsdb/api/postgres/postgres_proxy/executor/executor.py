@@ -1,18 +1,36 @@
 from typing import Union
 
-from mindsdb_sql import parse_sql
 from mindsdb_sql.planner import utils as planner_utils
 
 from numpy import dtype as np_dtype
 from pandas.api import types as pd_types
 
 from mindsdb.api.executor import SQLQuery, Column
+from mindsdb.api.mysql.mysql_proxy.libs.constants.mysql import TYPES
 from mindsdb.api.mysql.mysql_proxy.utilities.lightwood_dtype import dtype
 from mindsdb.api.executor.command_executor import ExecuteCommands
+from mindsdb.api.executor.utilities.statements import parse_query
 from mindsdb.api.mysql.mysql_proxy.utilities import SqlApiException
 from mindsdb.api.postgres.postgres_proxy.postgres_packets.postgres_fields import POSTGRES_TYPES
 from mindsdb.utilities import log
 
+# mysql protocol types of columns which are not strings
+MYSQL_TYPES_MAP = {
+    TYPES.MYSQL_TYPE_TINY: POSTGRES_TYPES.LONG,
+    TYPES.MYSQL_TYPE_SHORT: POSTGRES_TYPES.LONG,
+    TYPES.MYSQL_TYPE_LONG: POSTGRES_TYPES.LONG,
+    TYPES.MYSQL_TYPE_INT24: POSTGRES_TYPES.LONG,
+    TYPES.MYSQL_TYPE_LONGLONG: POSTGRES_TYPES.LONG,
+    TYPES.MYSQL_TYPE_FLOAT: POSTGRES_TYPES.DOUBLE,
+    TYPES.MYSQL_TYPE_DOUBLE: POSTGRES_TYPES.DOUBLE,
+    TYPES.MYSQL_TYPE_DATE: POSTGRES_TYPES.DATE,
+    TYPES.MYSQL_TYPE_NEWDATE: POSTGRES_TYPES.DATE,
+    TYPES.MYSQL_TYPE_DATETIME: POSTGRES_TYPES.DATETIME,
+    TYPES.MYSQL_TYPE_DATETIME2: POSTGRES_TYPES.DATETIME,
+    TYPES.MYSQL_TYPE_TIMESTAMP: POSTGRES_TYPES.DATETIME,
+    TYPES.MYSQL_TYPE_TIMESTAMP2: POSTGRES_TYPES.DATETIME,
+}
+
 
 class Executor:
     def __init__(self, session, proxy_server, charset=None):
@@ -24,7 +42,8 @@ class Executor:
         self.query = None
         self.columns = []
         self.params = []
-        self.data = None
+        self.result_set = None
+        self._data = None
         self.server_status = None
         self.state_track = None
         self.is_executed = False
@@ -34,6 +53,17 @@ class Executor:
 
         self.command_executor = ExecuteCommands(self.session)
 
+    @property
+    def data(self):
+        # result is converted to lists on demand: portals fetch it by pages
+        if self._data is None and self.result_set is not None:
+            self._data = self.result_set.to_lists()
+        return self._data
+
+    @data.setter
+    def data(self, value):
+        self._data = value
+
     def parse(self, sql: Union[str, bytes]):
         self.logger.info("%s.parse: sql - %s", self.__class__.__name__, sql)
         if type(sql) == bytes:
@@ -43,10 +73,10 @@ class Executor:
         self.sql_lower = sql_lower.replace("`", "")
 
         try:
-            self.query = parse_sql(sql, dialect="mindsdb")
+            self.query = parse_query(sql, dialect="mindsdb")
         except Exception as mdb_error:
             try:
-                self.query = parse_sql(sql, dialect="mysql")
+                self.query = parse_query(sql, dialect="mysql")
             except Exception:
                 # not all statements are parsed by parse_sql
                 self.logger.warning(f"SQL statement is not parsed by mindsdb_sql: {sql}")
@@ -90,7 +120,7 @@ class Executor:
         self.is_executed = True
 
         if ret.data is not None:
-            self.data = ret.data.to_lists()
+            self.result_set = ret.data
             self.columns = ret.data.columns
 
         self.state_track = ret.state_track
@@ -122,10 +152,14 @@ class Executor:
             column_type = POSTGRES_TYPES.VARCHAR
             # is already in mysql protocol type?
             if isinstance(field_type, int):
-                column_type = POSTGRES_TYPES.INT
+                column_type = MYSQL_TYPES_MAP.get(field_type, POSTGRES_TYPES.VARCHAR)
             # pandas checks
             elif isinstance(field_type, np_dtype):
-                if pd_types.is_integer_dtype(field_type):
+                if pd_types.is_bool_dtype(field_type):
+                    column_type = POSTGRES_TYPES.BOOL
+                elif field_type.kind == 'S':
+                    column_type = POSTGRES_TYPES.BYTEA
+                elif pd_types.is_integer_dtype(field_type):
                     column_type = POSTGRES_TYPES.LONG
                 elif pd_types.is_numeric_dtype(field_type):
                     column_type = POSTGRES_TYPES.DOUBLE
@@ -32,3 +32,5 @@ class POSTGRES_TYPES(Enum):
     DOUBLE = 3
     DATETIME = 4
     DATE = 5
+    BOOL = 6
+    BYTEA = 7
@@ -1,3 +1,4 @@
+import struct
 from typing import BinaryIO, Sequence, Dict, Type
 
 from mindsdb.api.mysql.mysql_proxy.classes.sql_statement_parser import SqlStatementParser
@@ -241,16 +242,16 @@ class InvalidSQLStatementName(Error):
     def __init__(self, message: str = None, charset: str = "UTF-8"):
         if message is None:
             message = "Invalid SQL Statement Name"
-            super().__init__(severity="FATAL".encode(encoding=charset), code="26000".encode(encoding=charset),
-                             message=message.encode(encoding=charset))
+        super().__init__(severity="FATAL".encode(encoding=charset), code="26000".encode(encoding=charset),
+                         message=message.encode(encoding=charset))
 
 
 class DataException(Error):
     def __init__(self, message: str = None, charset: str = "UTF-8", code: str = "22000"):
         if message is None:
             message = "Data Exception"
-            super().__init__(severity="FATAL".encode(encoding=charset), code=code.encode(encoding=charset),
-                             message=message.encode(encoding=charset))
+        super().__init__(severity="FATAL".encode(encoding=charset), code=code.encode(encoding=charset),
+                         message=message.encode(encoding=charset))
 
 
 class ParameterStatus(PostgresMessage):
@@ -470,6 +471,110 @@ class ParseComplete(PostgresMessage):
             .write(write_file=write_file)
 
 
+class PortalSuspended(PostgresMessage):
+    """
+    PortalSuspended (B)
+    Byte1('s')
+    Identifies the message as a portal-suspended indicator. Note this only appears if an Execute message's row-count
+    limit was reached.
+
+    Int32(4)
+    Length of message contents in bytes, including self. """
+
+    def __init__(self):
+        self.identifier = PostgresBackendMessageIdentifier.PORTAL_SUSPENDED
+        self.backend_capable = True
+        self.frontend_capable = False
+        super().__init__()
+
+    def send_internal(self, write_file: BinaryIO):
+        self.get_packet_builder() \
+            .write(write_file=write_file)
+
+
+class CopyOutResponse(PostgresMessage):
+    """
+    CopyOutResponse (B)
+    Byte1('H')
+    Identifies the message as a Start Copy Out response. This message will be followed by copy-out data.
+
+    Int32
+    Length of message contents in bytes, including self.
+
+    Int8
+    0 indicates the overall COPY format is textual (rows separated by newlines, columns separated by separator
+    characters, etc.). 1 indicates the overall copy format is binary (similar to DataRow format).
+
+    Int16
+    The number of columns in the data to be copied (denoted N below).
+
+    Int16[N]
+    The format codes to be used for each column. Each must presently be zero (text) or one (binary). All must be zero
+    if the overall copy format is textual. """
+
+    def __init__(self, copy_format: int, column_formats: Sequence[int]):
+        self.identifier = PostgresBackendMessageIdentifier.COPY_OUT_RESPONSE
+        self.backend_capable = True
+        self.frontend_capable = False
+        self.copy_format = copy_format
+        self.column_formats = column_formats
+        super().__init__()
+
+    def send_internal(self, write_file: BinaryIO):
+        packet = self.get_packet_builder() \
+            .add_bytes(struct.pack('!b', self.copy_format)) \
+            .add_int16(len(self.column_formats))
+        for column_format in self.column_formats:
+            packet = packet.add_int16(column_format)
+        packet.write(write_file=write_file)
+
+
+class CopyData(PostgresMessage):
+    """
+    CopyData (F & B)
+    Byte1('d')
+    Identifies the message as COPY data.
+
+    Int32
+    Length of message contents in bytes, including self.
+
+    Byten
+    Data that forms part of a COPY data stream. Messages sent from the backend will always correspond to single data
+    rows, but messages sent by frontends might divide the data stream arbitrarily. """
+
+    def __init__(self, data: bytes):
+        self.identifier = PostgresBackendMessageIdentifier.COPY_DATA
+        self.backend_capable = True
+        self.frontend_capable = False
+        self.data = data
+        super().__init__()
+
+    def send_internal(self, write_file: BinaryIO):
+        self.get_packet_builder() \
+            .add_bytes(self.data) \
+            .write(write_file=write_file)
+
+
+class CopyDone(PostgresMessage):
+    """
+    CopyDone (F & B)
+    Byte1('c')
+    Identifies the message as a COPY-complete indicator.
+
+    Int32(4)
+    Length of message contents in bytes, including self. """
+
+    def __init__(self):
+        self.identifier = PostgresBackendMessageIdentifier.COPY_DONE
+        self.backend_capable = True
+        self.frontend_capable = False
+        super().__init__()
+
+    def send_internal(self, write_file: BinaryIO):
+        self.get_packet_builder() \
+            .write(write_file=write_file)
+
+
 class Query(PostgresMessage):
     """
     Query (F)
@@ -14,6 +14,10 @@ class PostgresBackendMessageIdentifier(Enum):
     PARSE_COMPLETE = b'1'
     BIND_COMPLETE = b'2'
     PARAMETER_DESCRIPTION = b't'
+    PORTAL_SUSPENDED = b's'
+    COPY_OUT_RESPONSE = b'H'
+    COPY_DATA = b'd'
+    COPY_DONE = b'c'
 
 
 class PostgresFrontendMessageIdentifier(Enum):
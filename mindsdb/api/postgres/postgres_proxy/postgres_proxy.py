@@ -2,6 +2,7 @@ import base64
 import datetime
 import os
 import json
+import re
 import select
 import socketserver
 import struct
@@ -14,23 +15,44 @@ from mindsdb.api.executor.controllers import SessionController
 from mindsdb.api.postgres.postgres_proxy.executor import Executor
 from mindsdb.api.mysql.mysql_proxy.libs.constants.mysql import CHARSET_NUMBERS
 from mindsdb.api.executor.data_types.response_type import RESPONSE_TYPE
+from mindsdb.api.executor.data_types.result_cursor import ResultCursor
 from mindsdb.api.common.check_auth import check_auth
+from mindsdb.api.common.connection_server import create_server
 from mindsdb.api.mysql.mysql_proxy.mysql_proxy import SQLAnswer
 from mindsdb.api.postgres.postgres_proxy.postgres_packets.errors import POSTGRES_SYNTAX_ERROR_CODE
 from mindsdb.api.postgres.postgres_proxy.postgres_packets.postgres_fields import GenericField, PostgresField
 from mindsdb.api.postgres.postgres_proxy.postgres_packets.postgres_message_formats import Terminate, \
     Query, AuthenticationClearTextPassword, AuthenticationOk, RowDescriptions, DataRow, CommandComplete, \
     ReadyForQuery, ConnectionFailure, ParameterStatus, Error, Execute, Bind, Parse, Sync, ParseComplete, \
-    InvalidSQLStatementName, BindComplete, Describe, DataException, ParameterDescription
+    InvalidSQLStatementName, BindComplete, Describe, DataException, ParameterDescription, PortalSuspended, \
+    CopyOutResponse, CopyData, CopyDone
 from mindsdb.api.postgres.postgres_proxy.postgres_packets.postgres_message import PostgresMessage
 from mindsdb.api.postgres.postgres_proxy.postgres_packets.postgres_packets import PostgresPacketReader, \
     PostgresPacketBuilder
 from mindsdb.api.postgres.postgres_proxy.utilities import strip_null_byte
+from mindsdb.api.postgres.postgres_proxy.utilities.result_encoder import (
+    TEXT_FORMAT,
+    BINARY_FORMAT,
+    COPY_BINARY_HEADER,
+    COPY_BINARY_TRAILER,
+    get_format_codes,
+    get_fields,
+    get_binary_types,
+    encode_data_rows,
+    encode_copy_header,
+    encode_copy_rows,
+    encode_copy_data,
+)
 from mindsdb.utilities.config import Config
 from mindsdb.utilities.context import context as ctx
 from mindsdb.utilities import log
 from mindsdb.api.mysql.mysql_proxy.external_libs.mysql_scramble import scramble as scramble_func
 
+# count of rows which are encoded and sent at once
+ROWS_CHUNK_SIZE = 1000
+
+COPY_TO_STDOUT_RE = re.compile(r'^\s*copy\s*\((?P<query>.+)\)\s*to\s+stdout(?P<options>.*)$', re.IGNORECASE | re.DOTALL)
+
 
 class PostgresProxyHandler(socketserver.StreamRequestHandler):
     client_buffer: PostgresPacketReader
@@ -49,10 +71,23 @@ class PostgresProxyHandler(socketserver.StreamRequestHandler):
         self.named_portals = {}
         self.unnamed_portal = None
         self.transaction_status = b'I'  # I: Idle, T: Transaction Block, E: Failed Transaction Block
+        self.socket = request
         super().__init__(request, client_address, server)
 
     def handle(self) -> None:
+        if getattr(self.server, 'dispatches_commands', False):
+            # connection is served by ConnectionServer step by step
+            return
+
+        if self.handle_connect():
+            self.main_loop()
+
+    def handle_connect(self) -> bool:
+        """
+        Startup of new connection: handshake, authentication and initial parameters
 
+        :return: False if connection has to be closed
+        """
         ctx.set_default()
         self.init_session()
         self.logger.debug('handle new incoming connection')
@@ -77,10 +112,32 @@ class PostgresProxyHandler(socketserver.StreamRequestHandler):
             self.handshake()
         else:
             started = self.start_connection()
-        if started:
-            self.logger.debug("connection started")
-            self.send_initial_data()
-            self.main_loop()
+        if not started:
+            return False
+        self.logger.debug("connection started")
+        self.send_initial_data()
+        self.send_ready()
+        return True
+
+    def finish(self) -> None:
+        if getattr(self.server, 'dispatches_commands', False):
+            # streams are used by next steps of connection, they are closed by close()
+            return
+        super().finish()
+
+    def close(self) -> None:
+        super().finish()
+        self.session = None
+
+    def has_buffered_data(self) -> bool:
+        # rfile can contain next messages which are already read from socket
+        self.socket.setblocking(False)
+        try:
+            return len(self.rfile.peek(1)) > 0
+        except OSError:
+            return False
+        finally:
+            self.socket.setblocking(True)
 
     def is_cloud_connection(self):
         """ Determine source of connection. Must be call before handshake.
@@ -171,6 +228,9 @@ class PostgresProxyHandler(socketserver.StreamRequestHandler):
         # TODO Should check validity of statement here and not at parse stage
         portal = statement.copy()
         portal["bind"] = message
+        portal["cursor"] = None
+        # previous portal with the same name is replaced
+        self.session.close_cursor(('portal', message.name))
         if message.name:
             self.named_portals[message.name] = portal
         else:
@@ -201,7 +261,22 @@ class PostgresProxyHandler(socketserver.StreamRequestHandler):
             self.send(DataException(message="Describe did not have correct type. Can be 'P' or 'S'"))
             return True
 
-        fields = self.to_postgres_fields(describing["executor"].columns)
+        executor = describing["executor"]
+        columns = executor.to_postgres_columns(executor.columns)
+        format_codes = [TEXT_FORMAT] * len(columns)
+        if describing.get("bind") is not None:
+            format_codes = get_format_codes(describing["bind"].result_format_codes, len(columns))
+        if BINARY_FORMAT in format_codes:
+            # types of binary values are taken from the result if the query is already executed,
+            # they are kept in portal and used by execute
+            df = executor.result_set.get_raw_df() if executor.result_set is not None else None
+            pg_types = get_binary_types(df, [column['type'] for column in columns])
+            if message.describe_type == b'P':
+                describing["binary_types"] = pg_types
+            columns = [dict(column, type=pg_type) for column, pg_type in zip(columns, pg_types)]
+            fields = get_fields(columns, format_codes)
+        else:
+            fields = self.to_postgres_fields(columns)
         self.send(RowDescriptions(fields=fields))
         return True
 
@@ -213,12 +288,51 @@ class PostgresProxyHandler(socketserver.StreamRequestHandler):
             portal = self.unnamed_portal
         else:
             self.send(InvalidSQLStatementName("Portal does not exist"))
+            return True
 
+        cursor_key = ('portal', message.name)
         executor = portal["executor"]
-        params = portal["bind"].parameters
-        executor.stmt_execute(param_values=params)
-        sql_answer = self.return_executor_data(executor)
-        self.respond_from_sql_answer(sql=executor.sql, sql_answer=sql_answer, row_descs=False)
+        cursor = portal.get("cursor")
+        if cursor is None:
+            params = portal["bind"].parameters
+            executor.stmt_execute(param_values=params)
+            if executor.result_set is None:
+                sql_answer = self.return_executor_data(executor)
+                self.respond_from_sql_answer(sql=executor.sql, sql_answer=sql_answer, row_descs=False)
+                return True
+
+            # portal owns the result from now, statement will be executed again for the next portal
+            cursor = ResultCursor(executor.result_set)
+            executor.result_set = None
+            executor.is_executed = False
+            portal["cursor"] = cursor
+            self.session.register_cursor(cursor_key, cursor)
+        elif cursor.closed and not cursor.is_exhausted:
+            self.send(InvalidSQLStatementName("Portal was closed: too many open cursors"))
+            return True
+
+        # max_rows_ret = 0 means no limit
+        columns = executor.to_postgres_columns(executor.columns)
+        format_codes = get_format_codes(portal["bind"].result_format_codes, len(columns))
+        if BINARY_FORMAT in format_codes:
+            pg_types = portal.get("binary_types")
+            if pg_types is None:
+                df = cursor.result_set.get_raw_df() if cursor.result_set is not None else None
+                pg_types = get_binary_types(df, [column['type'] for column in columns])
+                portal["binary_types"] = pg_types
+            df = cursor.fetch_df(message.max_rows_ret)
+            for start in range(0, len(df), ROWS_CHUNK_SIZE):
+                chunk = df.iloc[start: start + ROWS_CHUNK_SIZE]
+                self.wfile.write(encode_data_rows(chunk, pg_types, format_codes))
+        else:
+            rows = cursor.fetch(message.max_rows_ret)
+            self.send(DataRow(rows=self.to_postgres_rows(rows)))
+        if cursor.is_exhausted:
+            self.session.close_cursor(cursor_key)
+            tag = ('SELECT %s' % str(cursor.total)).encode(self.get_encoding())
+            self.send(CommandComplete(tag=tag))
+        else:
+            self.send(PortalSuspended())
         return True
 
     def sync(self, message: Sync):
@@ -369,11 +483,75 @@ class PostgresProxyHandler(socketserver.StreamRequestHandler):
     def query(self, message: Query) -> bool:
         self.logger.debug("Postgres Proxy: Got query of:\n%s" % message.sql)
         sql = message.get_parsed_sql()
+        copy_match = COPY_TO_STDOUT_RE.match(sql)
+        if copy_match is not None:
+            self.copy_to_stdout(copy_match.group('query'), copy_match.group('options'))
+            self.send_ready()
+            return True
         sql_answer = self.process_query(sql)
         self.respond_from_sql_answer(sql=sql, sql_answer=sql_answer)
         self.send_ready()
         return True
 
+    def copy_to_stdout(self, sql: str, options: str):
+        """
+        Respond to 'COPY (<query>) TO STDOUT [WITH (FORMAT text|csv|binary, HEADER)]'
+        Every row of the result is sent in own CopyData message, messages are written by chunks of rows
+        """
+        options = re.sub(r'[(),=]', ' ', options.lower()).split()
+        copy_format = 'text'
+        if 'binary' in options:
+            copy_format = 'binary'
+        elif 'csv' in options:
+            copy_format = 'csv'
+        header = copy_format == 'csv' and 'header' in options and 'false' not in options
+
+        executor = Executor(
+            session=self.session,
+            proxy_server=self,
+            charset=self.charset
+        )
+        try:
+            executor.query_execute(sql)
+        except Exception as e:
+            self.send(Error.from_answer(
+                error_code=POSTGRES_SYNTAX_ERROR_CODE.encode(self.get_encoding()),
+                error_message=str(e).encode(self.get_encoding())
+            ))
+            return
+        if executor.result_set is None:
+            self.send(Error.from_answer(
+                error_code=b'22000',
+                error_message="COPY query doesn't return rows".encode(self.get_encoding())
+            ))
+            return
+
+        columns = executor.to_postgres_columns(executor.columns)
+        df = executor.result_set.get_raw_df()
+        pg_types = [column['type'] for column in columns]
+        if copy_format == 'binary':
+            pg_types = get_binary_types(df, pg_types)
+
+        column_format = BINARY_FORMAT if copy_format == 'binary' else TEXT_FORMAT
+        self.send(CopyOutResponse(copy_format=column_format, column_formats=[column_format] * len(columns)))
+        if header:
+            self.send(CopyData(encode_copy_header([column['alias'] for column in columns])))
+        if copy_format == 'binary' and len(df) == 0:
+            self.send(CopyData(COPY_BINARY_HEADER + COPY_BINARY_TRAILER))
+        # every row is sent in its own CopyData message, messages of chunk are written at once
+        for start in range(0, len(df), ROWS_CHUNK_SIZE):
+            chunk = df.iloc[start: start + ROWS_CHUNK_SIZE]
+            rows = encode_copy_rows(chunk, copy_format, pg_types)
+            if copy_format == 'binary':
+                # header of binary format is the part of the first row, trailer - of the last one
+                if start == 0:
+                    rows[0] = COPY_BINARY_HEADER + rows[0]
+                if start + ROWS_CHUNK_SIZE >= len(df):
+                    rows[-1] = rows[-1] + COPY_BINARY_TRAILER
+            self.wfile.write(encode_copy_data(rows))
+        self.send(CopyDone())
+        self.send(CommandComplete(tag=f'COPY {len(df)}'.encode(self.get_encoding())))
+
     def respond_from_sql_answer(self, sql, sql_answer: SQLAnswer, row_descs=True) -> bool:
         # TODO Add command complete passthrough for Complex Queries that exceed row limit in one go
         rows = 0
@@ -445,35 +623,39 @@ class PostgresProxyHandler(socketserver.StreamRequestHandler):
         self.logger.debug("Ready for Query")
         self.send(ReadyForQuery(transaction_status=self.transaction_status))
 
+    def handle_command(self) -> bool:
+        """
+        Read and process one message of client
+
+        :return: False if connection has to be closed
+        """
+        message: PostgresMessage = self.client_buffer.read_message()
+        if message is None:  # Empty Data, Buffer done
+            return False
+        tof = type(message)
+        if tof in self.message_map:
+            res = self.message_map[tof](message)
+            if not res:
+                return False
+        else:
+            self.logger.warning("Ignoring unsupported message type %s" % tof)
+        return True
+
     def main_loop(self):
-        self.send_ready()
-        while True:
-            message: PostgresMessage = self.client_buffer.read_message()
-            if message is None:  # Empty Data, Buffer done
-                break
-            tof = type(message)
-            if tof in self.message_map:
-                res = self.message_map[tof](message)
-                if not res:
-                    break
-            else:
-                self.logger.warning("Ignoring unsupported message type %s" % tof)
+        while self.handle_command():
+            pass
 
     @staticmethod
     def startProxy():
         config = Config()
         host = config['api']['postgres']['host']
         port = int(config['api']['postgres']['port'])
-        server = TcpServer((host, port), PostgresProxyHandler)
+        server = create_server((host, port), PostgresProxyHandler, 'postgres', config['api']['postgres'])
         server.connection_id = 0
         server.mindsdb_config = config
         server.check_auth = partial(check_auth, config=config)
         server.serve_forever()
 
 
-class TcpServer(socketserver.ThreadingTCPServer):
-    allow_reuse_address = True
-
-
 if __name__ == "__main__":
     PostgresProxyHandler.startProxy()
@@ -0,0 +1,351 @@
+"""
+Column-wise encoders of query results for postgres wire protocol:
+ - DataRow messages with values in text or binary format
+ - rows of COPY ... TO STDOUT in text, csv or binary format
+
+Values are converted column by column, for fixed size types conversion is done by numpy.
+Binary types of columns are derived from dtypes of the result (see get_binary_types): values are never coerced,
+columns which can't be converted without loss are sent as text.
+"""
+import json
+import numbers
+import struct
+import datetime as dt
+from typing import List, Optional, Sequence
+
+import numpy as np
+import pandas as pd
+
+from mindsdb.api.postgres.postgres_proxy.postgres_packets.postgres_fields import PostgresField, POSTGRES_TYPES
+
+TEXT_FORMAT = 0
+BINARY_FORMAT = 1
+
+# type: (oid, size), size is -1 for variable size types
+BINARY_TYPES = {
+    POSTGRES_TYPES.VARCHAR: (25, -1),  # text
+    POSTGRES_TYPES.INT: (23, 4),  # int4
+    POSTGRES_TYPES.LONG: (20, 8),  # int8
+    POSTGRES_TYPES.DOUBLE: (701, 8),  # float8
+    POSTGRES_TYPES.DATETIME: (1114, 8),  # timestamp
+    POSTGRES_TYPES.DATE: (1082, 4),  # date
+    POSTGRES_TYPES.BOOL: (16, 1),  # bool
+    POSTGRES_TYPES.BYTEA: (17, -1),  # bytea
+}
+
+# postgres epoch is 2000-01-01
+POSTGRES_EPOCH_MICROSECONDS = 946684800 * 10 ** 6
+POSTGRES_EPOCH_DAYS = 10957
+
+NULL_CELL = struct.pack('!i', -1)
+
+COPY_BINARY_HEADER = b'PGCOPY\n\xff\r\n\x00' + struct.pack('!ii', 0, 0)
+COPY_BINARY_TRAILER = struct.pack('!h', -1)
+
+
+def get_format_codes(result_format_codes: Sequence[int], columns_count: int) -> List[int]:
+    """
+    Format codes of result columns from Bind message:
+    empty list - all are text, one code - for all columns, or code for every column
+    """
+    if len(result_format_codes) == 0:
+        return [TEXT_FORMAT] * columns_count
+    if len(result_format_codes) == 1:
+        return [result_format_codes[0]] * columns_count
+    return list(result_format_codes)
+
+
+def get_fields(columns: List[dict], format_codes: List[int]) -> List[PostgresField]:
+    """
+    Fields for RowDescription with real type oids, which are required to decode binary values
+
+    :param columns: output of executor.to_postgres_columns
+    :param format_codes: format code of every column
+    """
+    fields = []
+    for i, column in enumerate(columns):
+        oid, size = BINARY_TYPES[column['type']]
+        fields.append(PostgresField(
+            name=column['name'],
+            object_id=oid,
+            dt_size=size,
+            type_modifier=-1,
+            format_code=format_codes[i],
+            column_id=i,
+        ))
+    return fields
+
+
+def _value_to_text(value) -> str:
+    if isinstance(value, bool):
+        return 'true' if value else 'false'
+    if isinstance(value, (list, dict)):
+        return json.dumps(value)
+    if isinstance(value, bytes):
+        return value.decode(errors='replace')
+    return str(value)
+
+
+def column_to_text(column: pd.Series) -> pd.Series:
+    """
+    Convert values of column to strings
+
+    :param column: column of dataframe
+    :return: object series of strings, None for missing values
+    """
+    null_mask = column.isna().to_numpy()
+    if pd.api.types.is_bool_dtype(column.dtype):
+        texts = np.where(column.to_numpy(dtype=bool, na_value=False), 'true', 'false').astype(object)
+    elif (
+        pd.api.types.is_numeric_dtype(column.dtype)
+        and not pd.api.types.is_extension_array_dtype(column.dtype)
+    ):
+        texts = column.to_numpy().astype(str).astype(object)
+    elif pd.api.types.is_datetime64_any_dtype(column.dtype):
+        texts = column.astype(str).to_numpy(dtype=object)
+    else:
+        texts = np.array([_value_to_text(value) for value in column.to_numpy(dtype=object)], dtype=object)
+
+    if null_mask.any():
+        texts[null_mask] = None
+    return pd.Series(texts, index=column.index, dtype=object)
+
+
+def _fixed_size_values(column: pd.Series, pg_type: POSTGRES_TYPES):
+    """
+    Convert values to numpy array of big-endian values of the type
+
+    :return: array of values and mask of nulls
+    :raises ValueError: if values can't be converted to the type without loss
+    """
+    null_mask = column.isna().to_numpy()
+    is_object = column.dtype == object
+    non_null = column.to_numpy(dtype=object)[~null_mask] if is_object else None
+
+    if pg_type in (POSTGRES_TYPES.INT, POSTGRES_TYPES.LONG, POSTGRES_TYPES.DOUBLE):
+        if pd.api.types.is_bool_dtype(column.dtype) or (
+            not is_object and not pd.api.types.is_numeric_dtype(column.dtype)
+        ) or (
+            is_object and not all(
+                isinstance(value, (numbers.Number, np.number)) and not isinstance(value, (bool, np.bool_))
+                for value in non_null
+            )
+        ):
+            raise ValueError(f'Column {column.name} has not numeric values')
+        values = pd.to_numeric(column).fillna(0)
+        if pg_type == POSTGRES_TYPES.DOUBLE:
+            return values.to_numpy(dtype=np.float64).astype('>f8'), null_mask
+
+        dtype = '>i4' if pg_type == POSTGRES_TYPES.INT else '>i8'
+        if pd.api.types.is_integer_dtype(values.dtype):
+            values = values.to_numpy(dtype=np.int64)
+        else:
+            values = values.to_numpy(dtype=np.float64)
+            if not np.all(np.mod(values, 1) == 0):
+                raise ValueError(f'Column {column.name} has not integer values')
+        info = np.iinfo(dtype)
+        if len(values) > 0 and (values.min() < info.min or values.max() > info.max):
+            raise ValueError(f'Values of column {column.name} are out of range of {pg_type.name}')
+        return values.astype(dtype), null_mask
+
+    if pg_type == POSTGRES_TYPES.BOOL:
+        if not pd.api.types.is_bool_dtype(column.dtype) and not (
+            is_object and all(isinstance(value, (bool, np.bool_)) for value in non_null)
+        ):
+            raise ValueError(f'Column {column.name} has not boolean values')
+        values = column.to_numpy(dtype=object)
+        values[null_mask] = False
+        return values.astype(bool).astype(np.uint8), null_mask
+
+    # datetime types
+    if (
+        not is_object and not pd.api.types.is_datetime64_any_dtype(column.dtype)
+    ) or (
+        is_object and not all(isinstance(value, (dt.date, np.datetime64)) for value in non_null)
+    ):
+        raise ValueError(f'Column {column.name} has not datetime values')
+    values = pd.to_datetime(column)
+    if getattr(values.dt, 'tz', None) is not None:
+        values = values.dt.tz_convert(None)
+    values = values.to_numpy()
+    if pg_type == POSTGRES_TYPES.DATE:
+        days = values.astype('datetime64[D]').astype(np.int64) - POSTGRES_EPOCH_DAYS
+        days[null_mask] = 0
+        return days.astype('>i4'), null_mask
+
+    microseconds = values.astype('datetime64[us]').astype(np.int64) - POSTGRES_EPOCH_MICROSECONDS
+    microseconds[null_mask] = 0
+    return microseconds.astype('>i8'), null_mask
+
+
+def _get_binary_type(column: pd.Series, declared_type: POSTGRES_TYPES) -> POSTGRES_TYPES:
+    column_dtype = column.dtype
+    if pd.api.types.is_bool_dtype(column_dtype):
+        return POSTGRES_TYPES.BOOL
+    if pd.api.types.is_integer_dtype(column_dtype):
+        return POSTGRES_TYPES.LONG
+    if pd.api.types.is_float_dtype(column_dtype):
+        return POSTGRES_TYPES.DOUBLE
+    if pd.api.types.is_datetime64_any_dtype(column_dtype):
+        return POSTGRES_TYPES.DATE if declared_type == POSTGRES_TYPES.DATE else POSTGRES_TYPES.DATETIME
+    if getattr(column_dtype, 'kind', None) == 'S':
+        return POSTGRES_TYPES.BYTEA
+
+    # object column: declared type is used only if all values can be converted to it
+    if declared_type == POSTGRES_TYPES.BYTEA:
+        if all(isinstance(value, bytes) for value in column.dropna()):
+            return declared_type
+    elif BINARY_TYPES[declared_type][1] > 0:
+        try:
+            _fixed_size_values(column, declared_type)
+            return declared_type
+        except (ValueError, TypeError, OverflowError):
+            pass
+    return POSTGRES_TYPES.VARCHAR
+
+
+def get_binary_types(df: Optional[pd.DataFrame], pg_types: List[POSTGRES_TYPES]) -> List[POSTGRES_TYPES]:
+    """
+    Types of columns for binary format, they are derived from dtypes of result columns.
+    Object columns which can't be converted to declared type without loss are sent as text.
+
+    :param df: result of query, declared types are returned if it is not available
+    :param pg_types: declared types of columns
+    :return: types of columns
+    """
+    if df is None or len(df.columns) != len(pg_types):
+        return list(pg_types)
+    return [_get_binary_type(df.iloc[:, i], pg_type) for i, pg_type in enumerate(pg_types)]
+
+
+def encode_column(column: pd.Series, pg_type: POSTGRES_TYPES, format_code: int) -> List[bytes]:
+    """
+    Encode values of column to pairs: int32 length + value
+
+    :param column: column of dataframe
+    :param pg_type: type of the column
+    :param format_code: text or binary
+    :return: list of encoded values
+    """
+    rows_count = len(column)
+    if format_code == BINARY_FORMAT and BINARY_TYPES[pg_type][1] > 0:
+        size = BINARY_TYPES[pg_type][1]
+        values, null_mask = _fixed_size_values(column, pg_type)
+
+        data = np.empty((rows_count, 4 + size), dtype=np.uint8)
+        data[:, :4] = np.frombuffer(struct.pack('!i', size), dtype=np.uint8)
+        data[:, 4:] = values.view(np.uint8).reshape(rows_count, size)
+        data = data.tobytes()
+        step = 4 + size
+        cells = [data[i * step: (i + 1) * step] for i in range(rows_count)]
+        for i in np.flatnonzero(null_mask):
+            cells[i] = NULL_CELL
+        return cells
+
+    if format_code == BINARY_FORMAT and pg_type == POSTGRES_TYPES.BYTEA:
+        values = column.to_numpy(dtype=object)
+        null_mask = column.isna().to_numpy()
+    else:
+        values = column_to_text(column).to_numpy()
+        null_mask = pd.isna(values)
+
+    cells = []
+    for value, is_null in zip(values, null_mask):
+        if is_null:
+            cells.append(NULL_CELL)
+            continue
+        if not isinstance(value, bytes):
+            value = str(value).encode('utf-8')
+        cells.append(struct.pack('!i', len(value)) + value)
+    return cells
+
+
+def encode_data_rows(df: pd.DataFrame, pg_types: List[POSTGRES_TYPES], format_codes: List[int]) -> bytes:
+    """
+    Encode rows of dataframe to DataRow messages
+
+    :param df: dataframe
+    :param pg_types: types of columns
+    :param format_codes: format of every column
+    :return: encoded messages
+    """
+    columns_count = len(df.columns)
+    columns = [
+        encode_column(df.iloc[:, i], pg_types[i], format_codes[i])
+        for i in range(columns_count)
+    ]
+    messages = []
+    for row in zip(*columns):
+        row = b''.join(row)
+        messages.append(b'D' + struct.pack('!ih', 4 + 2 + len(row), columns_count) + row)
+    return b''.join(messages)
+
+
+def _escape_copy_text(texts: pd.Series) -> pd.Series:
+    for char, replacement in (('\\', '\\\\'), ('\t', '\\t'), ('\n', '\\n'), ('\r', '\\r')):
+        texts = texts.str.replace(char, replacement, regex=False)
+    return texts
+
+
+def _quote_csv(texts: pd.Series) -> pd.Series:
+    need_quotes = texts.str.contains('[",\r\n]', regex=True, na=False) | (texts == '')
+    quoted = '"' + texts.str.replace('"', '""', regex=False) + '"'
+    return texts.where(~need_quotes, quoted)
+
+
+def encode_copy_header(column_names: List[str]) -> bytes:
+    """
+    Header line of csv format
+    """
+    names = _quote_csv(pd.Series(column_names, dtype=object))
+    return (','.join(names) + '\n').encode('utf-8')
+
+
+def encode_copy_rows(df: pd.DataFrame, copy_format: str, pg_types: List[POSTGRES_TYPES]) -> List[bytes]:
+    """
+    Encode rows of dataframe to data of COPY ... TO STDOUT
+
+    :param df: dataframe
+    :param copy_format: text, csv or binary
+    :param pg_types: types of columns
+    :return: encoded rows, one item per row
+    """
+    if len(df) == 0:
+        return []
+    columns_count = len(df.columns)
+
+    if copy_format == 'binary':
+        columns = [
+            encode_column(df.iloc[:, i], pg_types[i], BINARY_FORMAT)
+            for i in range(columns_count)
+        ]
+        row_header = struct.pack('!h', columns_count)
+        return [row_header + b''.join(row) for row in zip(*columns)]
+
+    lines = None
+    for i in range(columns_count):
+        texts = column_to_text(df.iloc[:, i])
+        if copy_format == 'csv':
+            texts = _quote_csv(texts).fillna('')
+            sep = ','
+        else:
+            texts = _escape_copy_text(texts).fillna('\\N')
+            sep = '\t'
+        if lines is None:
+            lines = texts
+        else:
+            lines = lines + sep + texts
+    return [(line + '\n').encode('utf-8') for line in lines]
+
+
+def encode_copy_data(rows: List[bytes]) -> bytes:
+    """
+    Encode rows to CopyData messages: one message per row
+
+    :param rows: encoded rows
+    :return: encoded messages
+    """
+    return b''.join(
+        b'd' + struct.pack('!i', 4 + len(row)) + row
+        for row in rows
+    )
@@ -16,6 +16,7 @@ In particular, three big components are included:
 
 """
 
+import json
 import socket
 import contextlib
 import datetime as dt
@@ -42,6 +43,7 @@ import mindsdb.utilities.profiler as profiler
 from mindsdb.utilities.ml_task_queue.producer import MLTaskProducer
 from mindsdb.utilities.ml_task_queue.const import ML_TASK_TYPE
 from mindsdb.integrations.libs.process_cache import process_cache, empty_callback, MLProcessException
+from mindsdb.integrations.libs.predict_batcher import predict_batcher, get_batching_config
 
 try:
     import torch.multiprocessing as mp
@@ -224,7 +226,7 @@ class BaseMLEngineExec:
             'using': using
         }
 
-        with self._catch_exception(model_name):
+        def predict_fn(dataframe: pd.DataFrame) -> pd.DataFrame:
             task = self.base_ml_executor.apply_async(
                 task_type=ML_TASK_TYPE.PREDICT,
                 model_id=predictor_record.id,
@@ -238,9 +240,28 @@ class BaseMLEngineExec:
                     'predictor_record': predictor_record,
                     'args': args
                 },
-                dataframe=df
+                dataframe=dataframe
             )
-            predictions = task.result()
+            return task.result()
+
+        batching_config = get_batching_config(self.engine)
+        with self._catch_exception(model_name):
+            if batching_config is None:
+                predictions = predict_fn(df)
+            else:
+                batch_key = (
+                    ctx.company_id,
+                    predictor_record.id,
+                    pred_format,
+                    json.dumps(using, sort_keys=True, default=str),
+                    tuple(df.columns)
+                )
+                predictions = predict_batcher.predict(
+                    batch_key, df, predict_fn,
+                    window=batching_config['window'],
+                    max_rows=batching_config['max_rows'],
+                    engine=self.engine
+                )
 
         # mdb indexes
         if '__mindsdb_row_id' not in predictions.columns and '__mindsdb_row_id' in df.columns:
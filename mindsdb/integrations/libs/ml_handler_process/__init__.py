@@ -2,7 +2,7 @@ from mindsdb.integrations.libs.ml_handler_process.create_validation_process impo
 from mindsdb.integrations.libs.ml_handler_process.create_engine_process import create_engine_process
 from mindsdb.integrations.libs.ml_handler_process.update_engine_process import update_engine_process
 from mindsdb.integrations.libs.ml_handler_process.describe_process import describe_process
-from mindsdb.integrations.libs.ml_handler_process.predict_process import predict_process
+from mindsdb.integrations.libs.ml_handler_process.predict_process import predict_process, preload_process
 from mindsdb.integrations.libs.ml_handler_process.update_process import update_process
 from mindsdb.integrations.libs.ml_handler_process.learn_process import learn_process
 from mindsdb.integrations.libs.ml_handler_process.func_call_process import func_call_process
@@ -1,28 +1,122 @@
+"""
+Handlers of models which are resident in ML process: model is not loaded again for the next predict.
+
+Config:
+    "ml_model_residency": {
+        "affinity_wait": 1,  # seconds, how long predict waits for busy process which has the model loaded
+        "preload": [<model id>, ...],  # models which are loaded to ML processes at startup
+        "engines": {
+            "<engine name>": {
+                "max_models": 5,  # max count of resident models in one process
+                "max_memory": 2048  # MB, max estimated memory of resident models in one process
+            }
+        }
+    }
+"""
+import gc
 import time
 from collections import UserDict
+from typing import Optional
+
+from mindsdb.utilities import log
+from mindsdb.utilities.config import Config
+
+logger = log.getLogger(__name__)
+
+DEFAULT_MAX_MODELS = 5
+DEFAULT_AFFINITY_WAIT = 1
+
+
+def get_residency_config() -> dict:
+    return Config().get('ml_model_residency', {})
+
+
+def get_engine_limits(engine: str) -> dict:
+    """
+    Get limits of resident models of engine
+
+    :param engine: name of ML engine
+    :return: dict with 'max_size' (count) and 'max_memory' (bytes or None)
+    """
+    config = get_residency_config().get('engines', {}).get(engine, {})
+    max_memory = config.get('max_memory')
+    return {
+        'max_size': config.get('max_models', DEFAULT_MAX_MODELS),
+        'max_memory': None if max_memory is None else max_memory * 1024 * 1024,
+    }
 
 
 class HandlersCache(UserDict):
-    def __init__(self, max_size: int = 5) -> None:
+    """ Handlers of the resident models. The least recently used handlers are closed and removed
+        if count of handlers exceeds max_size or their estimated memory exceeds max_memory.
+        The handler which is added or used last is never removed.
+    """
+
+    def __init__(self, max_size: int = DEFAULT_MAX_MODELS, max_memory: Optional[int] = None) -> None:
         self._max_size = max_size
+        self._max_memory = max_memory
         super().__init__()
 
+    def set_limits(self, max_size: int, max_memory: Optional[int] = None) -> None:
+        self._max_size = max_size
+        self._max_memory = max_memory
+        self.evict()
+
     def __setitem__(self, key, value) -> None:
-        if len(self.data) > self._max_size:
-            sorted_elements = sorted(
-                self.data.items(),
-                key=lambda x: x[1]['last_usage_at']
-            )
-            del self.data[sorted_elements[0][0]]
+        self.data.pop(key, None)
         self.data[key] = {
             'last_usage_at': time.time(),
-            'handler': value
+            'handler': value,
+            'memory': 0
         }
+        self.evict(keep=key)
 
     def __getitem__(self, key: int) -> object:
         el = super().__getitem__(key)
         el['last_usage_at'] = time.time()
+        # the order of data is the order of usage
+        self.data[key] = self.data.pop(key)
         return el['handler']
 
+    def set_memory(self, key, memory: int) -> None:
+        """ set estimated memory of model
+
+            Args:
+                key: key of handler
+                memory (int): bytes
+        """
+        if key in self.data:
+            self.data[key]['memory'] = memory
+            self.evict(keep=key)
+
+    def memory_usage(self) -> int:
+        return sum(el['memory'] for el in self.data.values())
+
+    def _is_over_limits(self) -> bool:
+        if len(self.data) > self._max_size:
+            return True
+        return self._max_memory is not None and self.memory_usage() > self._max_memory
+
+    def evict(self, keep=None) -> None:
+        """ remove the least recently used handlers until limits are satisfied
+
+            Args:
+                keep: key of handler which is not removed
+        """
+        removed = False
+        while self._is_over_limits():
+            candidates = [key for key in self.data if key != keep]
+            if len(candidates) == 0:
+                break
+            key = candidates[0]
+            handler = self.data.pop(key)['handler']
+            removed = True
+            try:
+                handler.close()
+            except Exception:
+                logger.warning(f'Error on closing of handler of model {key}', exc_info=True)
+        if removed:
+            gc.collect()
+
 
 handlers_cacher = HandlersCache()
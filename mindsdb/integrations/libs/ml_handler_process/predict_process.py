@@ -1,28 +1,54 @@
+import time
 import importlib
 
+import psutil
 from pandas import DataFrame
 
 import mindsdb.interfaces.storage.db as db
+from mindsdb.metrics import metrics
 from mindsdb.interfaces.storage.model_fs import ModelStorage, HandlerStorage
-from mindsdb.integrations.libs.ml_handler_process.handlers_cacher import handlers_cacher
+from mindsdb.integrations.libs.ml_handler_process.handlers_cacher import handlers_cacher, get_engine_limits
 from mindsdb.utilities.functions import mark_process
 
 
+def get_model_handler(integration_id: int, predictor_record: db.Predictor, module_path: str,
+                      ml_engine_name: str, pull_storage: bool = False):
+    """ get resident handler of model or create new one
+
+        Args:
+            integration_id (int): id of ml engine
+            predictor_record (db.Predictor): model record
+            module_path (str): path of handler module
+            ml_engine_name (str): name of ml engine
+            pull_storage (bool): load model files to local storage
+
+        Returns:
+            tuple: handler and flag that handler was created
+    """
+    handlers_cacher.set_limits(**get_engine_limits(ml_engine_name))
+    if predictor_record.id in handlers_cacher:
+        return handlers_cacher[predictor_record.id], False
+
+    module = importlib.import_module(module_path)
+    started_at = time.perf_counter()
+    handlerStorage = HandlerStorage(integration_id)
+    modelStorage = ModelStorage(predictor_record.id)
+    if pull_storage:
+        modelStorage.fileStorage.pull()
+    ml_handler = module.Handler(
+        engine_storage=handlerStorage,
+        model_storage=modelStorage,
+    )
+    handlers_cacher[predictor_record.id] = ml_handler
+    metrics.ML_MODEL_LOAD_TIME.labels(ml_engine_name).observe(time.perf_counter() - started_at)
+    return ml_handler, True
+
+
 @mark_process(name='learn')
 def predict_process(integration_id: int, predictor_record: db.Predictor, args: dict,
                     module_path: str, ml_engine_name: str, dataframe: DataFrame) -> DataFrame:
-    module = importlib.import_module(module_path)
-
-    if predictor_record.id not in handlers_cacher:
-        handlerStorage = HandlerStorage(integration_id)
-        modelStorage = ModelStorage(predictor_record.id)
-        ml_handler = module.Handler(
-            engine_storage=handlerStorage,
-            model_storage=modelStorage,
-        )
-        handlers_cacher[predictor_record.id] = ml_handler
-    else:
-        ml_handler = handlers_cacher[predictor_record.id]
+    memory_before = psutil.Process().memory_info().rss
+    ml_handler, is_cold = get_model_handler(integration_id, predictor_record, module_path, ml_engine_name)
 
     if ml_engine_name == 'lightwood':
         args['code'] = predictor_record.code
@@ -30,6 +56,19 @@ def predict_process(integration_id: int, predictor_record: db.Predictor, args: d
         args['dtype_dict'] = predictor_record.dtype_dict
         args['learn_args'] = predictor_record.learn_args
 
+    started_at = time.perf_counter()
     predictions = ml_handler.predict(dataframe, args)
-    ml_handler.close()
+    metrics.ML_PREDICT_TIME.labels(ml_engine_name, 'cold' if is_cold else 'warm').observe(
+        time.perf_counter() - started_at
+    )
+    if is_cold:
+        # the model is loaded by the first predict in most of engines
+        memory = psutil.Process().memory_info().rss - memory_before
+        handlers_cacher.set_memory(predictor_record.id, max(memory, 0))
     return predictions
+
+
+@mark_process(name='learn')
+def preload_process(integration_id: int, predictor_record: db.Predictor,
+                    module_path: str, ml_engine_name: str) -> None:
+    get_model_handler(integration_id, predictor_record, module_path, ml_engine_name, pull_storage=True)
@@ -0,0 +1,168 @@
+"""
+Micro-batching of predictions.
+
+Concurrent predict requests to the same model (with the same version, params and input columns) are collected
+during a short window and sent to the ML process as one task. Predictions of the batch are split back to callers
+by count of input rows, so batching can be enabled only for engines which return one prediction per input row
+in the same order. If the count of predictions doesn't match, requests of the batch are predicted separately.
+
+Batching is disabled by default and is enabled for engine in config:
+    "predict_batching": {
+        "<engine name>": {
+            "window": 0.01,  # seconds, how long the first request of batch waits for others
+            "max_rows": 1000  # rows, batch is sent as soon as it is reached, bigger requests are not batched
+        }
+    }
+"""
+import time
+import threading
+from typing import Callable, Hashable, List, Optional
+
+import pandas as pd
+
+from mindsdb.metrics import metrics
+from mindsdb.utilities import log
+from mindsdb.utilities.config import Config
+
+logger = log.getLogger(__name__)
+
+DEFAULT_WINDOW = 0.01
+DEFAULT_MAX_ROWS = 1000
+
+
+def get_batching_config(engine: str) -> Optional[dict]:
+    """
+    Get batching settings of engine
+
+    :param engine: name of ML engine
+    :return: dict with 'window' and 'max_rows' or None if batching is disabled for engine
+    """
+    config = Config().get('predict_batching', {}).get(engine)
+    if not isinstance(config, dict):
+        return None
+    return {
+        'window': config.get('window', DEFAULT_WINDOW),
+        'max_rows': config.get('max_rows', DEFAULT_MAX_ROWS),
+    }
+
+
+class _Batch:
+    def __init__(self):
+        self.dataframes: List[pd.DataFrame] = []
+        self.rows = 0
+        self.created_at = time.monotonic()
+        # is set when batch is not accepting new requests anymore
+        self.full = threading.Event()
+        # is set when predictions of batch are ready
+        self.done = threading.Event()
+        self.results = None
+        self.exception = None
+
+    def add(self, df: pd.DataFrame) -> int:
+        self.dataframes.append(df)
+        self.rows += len(df)
+        return len(self.dataframes) - 1
+
+    def get_result(self, index: int) -> pd.DataFrame:
+        if self.exception is not None:
+            raise self.exception
+        return self.results[index]
+
+
+class PredictBatcher:
+    """
+    Collects concurrent predict requests to batches. The first request of batch (leader) waits for the others
+    and executes predict of the whole batch, the other requests wait for its result.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._batches = {}
+
+    def predict(
+        self,
+        key: Hashable,
+        df: pd.DataFrame,
+        predict_fn: Callable,
+        window: float,
+        max_rows: int,
+        engine: str = None,
+    ) -> pd.DataFrame:
+        """
+        Get predictions for dataframe, in one batch with the other requests with the same key
+
+        :param key: requests with the same key can be batched
+        :param df: input data
+        :param predict_fn: function which gets input dataframe and returns predictions
+        :param window: seconds to wait for the other requests
+        :param max_rows: max count of rows in batch
+        :param engine: name of engine for metrics
+        :return: predictions for df
+        """
+        if len(df) >= max_rows or window <= 0:
+            return predict_fn(df)
+
+        with self._lock:
+            batch = self._batches.get(key)
+            is_leader = batch is None or batch.rows + len(df) > max_rows
+            if is_leader:
+                if batch is not None:
+                    # the current batch is sent without waiting for the end of window
+                    self._close(key, batch)
+                batch = _Batch()
+                self._batches[key] = batch
+            index = batch.add(df)
+            if batch.rows >= max_rows:
+                self._close(key, batch)
+
+        if is_leader:
+            batch.full.wait(window)
+            with self._lock:
+                self._close(key, batch)
+            self._execute(batch, predict_fn, engine)
+        else:
+            batch.done.wait()
+        return batch.get_result(index)
+
+    def _close(self, key: Hashable, batch: _Batch) -> None:
+        # is called under lock
+        if self._batches.get(key) is batch:
+            del self._batches[key]
+        batch.full.set()
+
+    def _execute(self, batch: _Batch, predict_fn: Callable, engine: str) -> None:
+        label = str(engine)
+        metrics.PREDICT_BATCH_SIZE.labels(label).observe(len(batch.dataframes))
+        metrics.PREDICT_BATCH_WAIT_TIME.labels(label).observe(time.monotonic() - batch.created_at)
+        started_at = time.monotonic()
+        try:
+            batch.results = self._predict(batch.dataframes, predict_fn)
+        except Exception as e:
+            batch.exception = e
+        finally:
+            metrics.PREDICT_BATCH_LATENCY.labels(label).observe(time.monotonic() - started_at)
+            batch.done.set()
+
+    @staticmethod
+    def _predict(dataframes: List[pd.DataFrame], predict_fn: Callable) -> List[pd.DataFrame]:
+        if len(dataframes) == 1:
+            return [predict_fn(dataframes[0])]
+
+        predictions = predict_fn(pd.concat(dataframes, ignore_index=True))
+        rows = sum(len(df) for df in dataframes)
+        if len(predictions) != rows:
+            logger.warning(
+                f'Count of predictions ({len(predictions)}) is not equal to count of input rows ({rows}), '
+                'requests of batch are predicted separately'
+            )
+            return [predict_fn(df) for df in dataframes]
+
+        results = []
+        offset = 0
+        for df in dataframes:
+            results.append(predictions.iloc[offset:offset + len(df)].reset_index(drop=True))
+            offset += len(df)
+        return results
+
+
+predict_batcher = PredictBatcher()
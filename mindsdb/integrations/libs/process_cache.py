@@ -1,14 +1,19 @@
+import os
 import sys
 import time
 import threading
 from typing import Optional, Callable
-from concurrent.futures import ProcessPoolExecutor, Future
+from concurrent.futures import ProcessPoolExecutor, Future, wait, FIRST_COMPLETED
 
+import psutil
 from pandas import DataFrame
 
 import mindsdb.interfaces.storage.db as db
 from mindsdb.utilities.config import Config
+from mindsdb.metrics import metrics
+from mindsdb.utilities import log
 from mindsdb.utilities.context import context as ctx
+from mindsdb.utilities.dataframe_transport import to_shared, from_shared, SharedFrame
 from mindsdb.utilities.ml_task_queue.const import ML_TASK_TYPE
 from mindsdb.integrations.libs.ml_handler_process import (
     learn_process,
@@ -18,8 +23,60 @@ from mindsdb.integrations.libs.ml_handler_process import (
     create_engine_process,
     update_engine_process,
     create_validation_process,
-    func_call_process
+    func_call_process,
+    preload_process
 )
+from mindsdb.integrations.libs.ml_handler_process.handlers_cacher import (
+    handlers_cacher,
+    get_residency_config,
+    DEFAULT_AFFINITY_WAIT
+)
+
+logger = log.getLogger(__name__)
+
+DEFAULT_POOL_CONFIG = {
+    'min_size': 0,
+    'max_size': os.cpu_count() or 4,
+    'max_queue': 100,
+    'queue_timeout': 300,
+    'max_process_memory': None,
+}
+
+
+def get_pool_config(engine: str) -> dict:
+    """ get settings of pool of processes of the engine
+
+        Config:
+            "ml_process_pool": {
+                "min_size": 0,  # processes which are not stopped when they are unused
+                "max_size": <count of CPU>,  # max count of processes of engine
+                "max_queue": 100,  # max count of tasks which are waiting for free process
+                "queue_timeout": 300,  # seconds, how long task waits for free process
+                "max_process_memory": null,  # MB, idle process which uses more is stopped
+                "max_total_memory": null,  # MB, least recently used idle processes are stopped above it
+                "engines": {"<engine name>": {<the same settings for specific engine>}}
+            }
+
+        Args:
+            engine (str): name of the engine
+
+        Returns:
+            dict
+    """
+    config = Config().get('ml_process_pool', {})
+    pool_config = {
+        key: config.get(key, default)
+        for key, default in DEFAULT_POOL_CONFIG.items()
+    }
+    pool_config.update(config.get('engines', {}).get(engine, {}))
+    pool_config['max_size'] = max(pool_config['max_size'], 1)
+    return pool_config
+
+
+def _to_bytes(megabytes: Optional[float]) -> Optional[int]:
+    if megabytes is None:
+        return None
+    return int(megabytes * 1024 * 1024)
 
 
 def init_ml_handler(module_path):
@@ -115,20 +172,28 @@ class WarmProcess:
             return True
         return False
 
-    def add_marker(self, marker: tuple):
+    def add_marker(self, marker: int):
         """ remember that that process processed task for that model
 
             Args:
-                marker (tuple): identifier of model
+                marker (int): identifier of model
         """
         if marker is not None:
             self._markers.add(marker)
 
-    def has_marker(self, marker: tuple) -> bool:
-        """ check if that process processed task for model
+    def set_markers(self, markers: list):
+        """ set models which are resident in the process
 
             Args:
-                marker (tuple): identifier of model
+                markers (list): identifiers of models
+        """
+        self._markers = set(markers)
+
+    def has_marker(self, marker: int) -> bool:
+        """ check if model is resident in the process
+
+            Args:
+                marker (int): identifier of model
 
             Returns:
                 bool
@@ -137,6 +202,20 @@ class WarmProcess:
             return False
         return marker in self._markers
 
+    def memory_usage(self) -> int:
+        """ get RSS of the process
+
+            Returns:
+                int: bytes
+        """
+        rss = 0
+        for process in list((self.pool._processes or {}).values()):
+            try:
+                rss += psutil.Process(process.pid).memory_info().rss
+            except (psutil.Error, ValueError):
+                pass
+        return rss
+
     def is_marked(self) -> bool:
         """ check if process has any marker
 
@@ -169,7 +248,10 @@ class WarmProcess:
 def warm_function(func, context: str, *args, **kwargs):
     ctx.load(context)
     try:
-        return func(*args, **kwargs)
+        kwargs = {key: from_shared(value) for key, value in kwargs.items()}
+        result = to_shared(func(*args, **kwargs))
+        # models which are resident in the process after the task
+        return result, list(handlers_cacher.keys())
     except Exception as e:
         if type(e) in (ImportError, ModuleNotFoundError):
             raise
@@ -188,6 +270,8 @@ class ProcessCache:
         self._lock = threading.Lock()
         self._ttl = ttl
         self._keep_alive = {}
+        # count of tasks which are waiting for free process, by engine
+        self._queued = {}
         self._stop_event = threading.Event()
         self.cleaner_thread = None
         self._start_clean()
@@ -213,8 +297,12 @@ class ProcessCache:
         """
         self._stop_event.set()
 
-    def init(self):
+    def init(self, preload_models: Optional[bool] = None):
         """ run processes for specified handlers
+
+            Args:
+                preload_models (bool): load models from config to processes,
+                    by default if ML tasks are not sent to redis queue
         """
         from mindsdb.interfaces.database.integrations import integration_controller
         preload_handlers = {}
@@ -244,10 +332,49 @@ class ProcessCache:
                         'last_usage_at': time.time(),
                         'handler_module': handler.__module__,
                         'processes': [
-                            WarmProcess(init_ml_handler, (handler.__module__,))
+                            self._new_process(handler.name, handler.__module__)
                             for _x in range(preload_handlers[handler])
                         ]
                     }
+            else:
+                return
+
+        if preload_models is None:
+            preload_models = config['ml_task_queue']['type'] != 'redis'
+        if preload_models:
+            self._preload_models()
+
+    def _preload_models(self) -> None:
+        """ load models from config to processes
+        """
+        from mindsdb.interfaces.database.integrations import integration_controller
+
+        for model_id in get_residency_config().get('preload', []):
+            try:
+                predictor_record = db.Predictor.query.get(model_id)
+                if predictor_record is None:
+                    logger.warning(f'Model for preload does not exist: {model_id}')
+                    continue
+                integration_record = db.Integration.query.get(predictor_record.integration_id)
+                handler_module = integration_controller.get_handler_module(integration_record.engine)
+                context = ctx.dump()
+                context['company_id'] = predictor_record.company_id
+                task = self.apply_async(
+                    task_type=ML_TASK_TYPE.PRELOAD,
+                    model_id=model_id,
+                    payload={
+                        'handler_meta': {
+                            'module_path': handler_module.__package__,
+                            'engine': handler_module.name,
+                            'integration_id': integration_record.id
+                        },
+                        'context': context,
+                        'predictor_record': predictor_record
+                    }
+                )
+                task.add_done_callback(self._preload_done_callback)
+            except Exception:
+                logger.warning(f"Can't preload model {model_id}", exc_info=True)
 
     def apply_async(self, task_type: ML_TASK_TYPE, model_id: Optional[int],
                     payload: dict, dataframe: Optional[DataFrame] = None) -> Future:
@@ -333,75 +460,235 @@ class ProcessCache:
                 'integration_id': integration_id,
                 'module_path': handler_module_path
             }
+        elif task_type == ML_TASK_TYPE.PRELOAD:
+            func = preload_process
+            kwargs = {
+                'predictor_record': payload['predictor_record'],
+                'ml_engine_name': payload['handler_meta']['engine'],
+                'integration_id': integration_id,
+                'module_path': handler_module_path
+            }
         else:
             raise Exception(f'Unknown ML task type: {task_type}')
 
         ml_engine_name = payload['handler_meta']['engine']
-        model_marker = (model_id, payload['context']['company_id'])
-        with self._lock:
-            if ml_engine_name not in self.cache:
-                warm_process = WarmProcess(init_ml_handler, (handler_module_path,))
-                self.cache[ml_engine_name] = {
-                    'last_usage_at': None,
-                    'handler_module': handler_module_path,
-                    'processes': [warm_process]
-                }
+        model_marker = model_id
+        pool_config = get_pool_config(ml_engine_name)
+        affinity_wait = get_residency_config().get('affinity_wait', DEFAULT_AFFINITY_WAIT)
+        started_at = time.monotonic()
+        affinity_deadline = started_at + affinity_wait
+        queue_deadline = started_at + pool_config['queue_timeout']
+        if kwargs.get('dataframe') is not None:
+            # big dataframe is sent through shared memory instead of pipe, it is written before the lock is taken
+            kwargs['dataframe'] = to_shared(kwargs['dataframe'])
+        is_queued = False
+        try:
+            while True:
+                with self._lock:
+                    warm_process, busy_tasks, reason = self._select_process(
+                        ml_engine_name, handler_module_path, model_marker, pool_config,
+                        wait_for_resident=time.monotonic() < affinity_deadline
+                    )
+                    if warm_process is not None:
+                        task = warm_process.apply_async(warm_function, func, payload['context'], **kwargs)
+                        self.cache[ml_engine_name]['last_usage_at'] = time.time()
+                        break
+
+                    if reason == 'full':
+                        if time.monotonic() >= queue_deadline:
+                            raise TimeoutError(
+                                f'No free ML process of engine {ml_engine_name} after '
+                                f'{pool_config["queue_timeout"]} seconds'
+                            )
+                        if not is_queued:
+                            if self._queued.get(ml_engine_name, 0) >= pool_config['max_queue']:
+                                raise Exception(
+                                    f'Too many ML tasks of engine {ml_engine_name} are waiting for free process'
+                                )
+                            is_queued = True
+                            self._queued[ml_engine_name] = self._queued.get(ml_engine_name, 0) + 1
+                            metrics.ML_PROCESS_POOL_QUEUE.labels(ml_engine_name).inc()
+                        deadline = queue_deadline
+                    else:
+                        # model is resident in busy process: wait for it instead of loading the model in another one
+                        deadline = affinity_deadline
+                wait(busy_tasks, timeout=max(deadline - time.monotonic(), 0), return_when=FIRST_COMPLETED)
+        except Exception:
+            # task was not sent to process
+            self._discard_shared(kwargs)
+            raise
+        finally:
+            if is_queued:
+                with self._lock:
+                    self._queued[ml_engine_name] -= 1
+                metrics.ML_PROCESS_POOL_QUEUE.labels(ml_engine_name).dec()
+
+        metrics.ML_PROCESS_POOL_BUSY.labels(ml_engine_name).inc()
+        task.add_done_callback(lambda _task: metrics.ML_PROCESS_POOL_BUSY.labels(ml_engine_name).dec())
+        return self._load_shared_result(task, kwargs, warm_process)
+
+    @staticmethod
+    def _preload_done_callback(task: Future) -> None:
+        if task.exception() is not None:
+            logger.warning(f"Can't preload model: {task.exception()}")
+
+    def _new_process(self, handler_name: str, handler_module_path: str) -> WarmProcess:
+        """ start new process, is called under lock
+        """
+        metrics.ML_PROCESS_POOL_SIZE.labels(handler_name).inc()
+        return WarmProcess(init_ml_handler, (handler_module_path,))
+
+    def _shutdown_process(self, handler_name: str, process: WarmProcess) -> None:
+        """ stop process, is called under lock
+        """
+        self.cache[handler_name]['processes'].remove(process)
+        process.shutdown()
+        metrics.ML_PROCESS_POOL_SIZE.labels(handler_name).dec()
+
+    def _select_process(self, ml_engine_name: str, handler_module_path: str, model_marker: Optional[int],
+                        pool_config: dict, wait_for_resident: bool) -> tuple:
+        """ choose process for the task, is called under lock
+
+            Args:
+                ml_engine_name (str): name of the engine
+                handler_module_path (str): module of the handler
+                model_marker (int): id of the model of the task
+                pool_config (dict): settings of pool of the engine
+                wait_for_resident (bool): don't choose another process if model is resident in busy process
+
+            Returns:
+                tuple: WarmProcess or None, list of tasks to wait for if there is no process
+                    and the reason of waiting: 'resident' or 'full'
+        """
+        if ml_engine_name not in self.cache:
+            self.cache[ml_engine_name] = {
+                'last_usage_at': None,
+                'handler_module': handler_module_path,
+                'processes': [self._new_process(ml_engine_name, handler_module_path)]
+            }
+
+        processes = self.cache[ml_engine_name]['processes']
+        resident = [p for p in processes if p.has_marker(model_marker)]
+        for process in resident:
+            if process.ready():
+                metrics.ML_TASK_ROUTING.labels(ml_engine_name, 'warm').inc()
+                return process, [], None
+        if wait_for_resident and len(resident) > 0:
+            return None, [p.task for p in resident], 'resident'
+
+        warm_process = next((p for p in processes if p.ready()), None)
+        if warm_process is None:
+            if len(processes) >= pool_config['max_size']:
+                return None, [p.task for p in processes], 'full'
+            warm_process = self._new_process(ml_engine_name, handler_module_path)
+            processes.append(warm_process)
+        if model_marker is not None:
+            metrics.ML_TASK_ROUTING.labels(ml_engine_name, 'cold').inc()
+        return warm_process, [], None
+
+    @staticmethod
+    def _discard_shared(kwargs: dict) -> None:
+        """ remove files of dataframes which were not loaded by process
+        """
+        for value in kwargs.values():
+            if isinstance(value, SharedFrame):
+                value.discard()
+
+    def _load_shared_result(self, task: Future, kwargs: dict, warm_process: WarmProcess) -> Future:
+        """ result of the task may be a dataframe in shared memory, load it when task is done
+
+            Args:
+                task (Future): task of process
+                kwargs (dict): kwargs of the task
+                warm_process (WarmProcess): process of the task
+
+            Returns:
+                Future: future with loaded result
+        """
+        result_future = Future()
+
+        def callback(_task: Future):
+            try:
+                result, resident_models = _task.result()
+                warm_process.set_markers(resident_models)
+                result = from_shared(result)
+            except BaseException as e:
+                # process failed before the input was loaded
+                self._discard_shared(kwargs)
+                result_future.set_exception(e)
             else:
-                warm_process = None
-                if model_marker is not None:
-                    try:
-                        warm_process = next(
-                            p for p in self.cache[ml_engine_name]['processes']
-                            if p.ready() and p.has_marker(model_marker)
-                        )
-                    except StopIteration:
-                        pass
-                if warm_process is None:
-                    try:
-                        warm_process = next(
-                            p for p in self.cache[ml_engine_name]['processes']
-                            if p.ready()
-                        )
-                    except StopIteration:
-                        pass
-                if warm_process is None:
-                    warm_process = WarmProcess(init_ml_handler, (handler_module_path,))
-                    self.cache[ml_engine_name]['processes'].append(warm_process)
-
-            task = warm_process.apply_async(warm_function, func, payload['context'], **kwargs)
-            self.cache[ml_engine_name]['last_usage_at'] = time.time()
-            warm_process.add_marker(model_marker)
-        return task
+                result_future.set_result(result)
+
+        task.add_done_callback(callback)
+        return result_future
 
     def _clean(self) -> None:
-        """ worker that stop unused processes
+        """ worker that stop unused processes and processes which use too much memory
         """
         while self._stop_event.wait(timeout=10) is False:
             with self._lock:
-                for handler_name in self.cache.keys():
-                    processes = self.cache[handler_name]['processes']
-                    processes.sort(key=lambda x: x.is_marked())
-
-                    expected_count = 0
-                    if handler_name in self._keep_alive:
-                        expected_count = self._keep_alive[handler_name]
-
-                    # stop processes which was used, it needs to free memory
-                    for i, process in enumerate(processes):
-                        if (
-                            process.ready()
-                            and process.is_marked()
-                            and (time.time() - process.last_usage_at) > self._ttl
-                        ):
-                            processes.pop(i)
-                            # del process
-                            process.shutdown()
-                            break
-
-                    while expected_count > len(processes):
-                        processes.append(
-                            WarmProcess(init_ml_handler, (self.cache[handler_name]['handler_module'],))
-                        )
+                for handler_name in list(self.cache.keys()):
+                    try:
+                        self._clean_handler_processes(handler_name)
+                    except Exception:
+                        logger.exception(f'Error on cleaning of ML processes of {handler_name}:')
+                try:
+                    self._limit_total_memory()
+                except Exception:
+                    logger.exception('Error on cleaning of ML processes:')
+
+    def _clean_handler_processes(self, handler_name: str) -> None:
+        """ stop idle processes of the handler, is called under lock
+
+            Args:
+                handler_name (str): name of the handler
+        """
+        pool_config = get_pool_config(handler_name)
+        processes = self.cache[handler_name]['processes']
+        min_size = max(pool_config['min_size'], self._keep_alive.get(handler_name, 0))
+        max_process_memory = _to_bytes(pool_config['max_process_memory'])
+
+        # the least recently used first
+        processes.sort(key=lambda x: x.last_usage_at)
+        for process in list(processes):
+            if not process.ready():
+                continue
+            if max_process_memory is not None and process.memory_usage() > max_process_memory:
+                # it will be started again if it is required by min_size
+                logger.info(f'ML process of {handler_name} is stopped: memory limit is exceeded')
+                self._shutdown_process(handler_name, process)
+            elif len(processes) > min_size and (time.time() - process.last_usage_at) > self._ttl:
+                self._shutdown_process(handler_name, process)
+
+        while min_size > len(processes):
+            processes.append(
+                self._new_process(handler_name, self.cache[handler_name]['handler_module'])
+            )
+
+    def _limit_total_memory(self) -> None:
+        """ stop the least recently used idle processes if all processes use too much memory, is called under lock
+        """
+        max_total_memory = _to_bytes(Config().get('ml_process_pool', {}).get('max_total_memory'))
+        if max_total_memory is None:
+            return
+
+        processes = []
+        total_memory = 0
+        for handler_name, handler_cache in self.cache.items():
+            for process in handler_cache['processes']:
+                memory = process.memory_usage()
+                total_memory += memory
+                processes.append((handler_name, process, memory))
+
+        processes.sort(key=lambda x: x[1].last_usage_at)
+        for handler_name, process, memory in processes:
+            if total_memory <= max_total_memory:
+                break
+            if not process.ready():
+                continue
+            logger.info(f'ML process of {handler_name} is stopped: total memory limit is exceeded')
+            self._shutdown_process(handler_name, process)
+            total_memory -= memory
 
     def remove_processes_for_handler(self, handler_name: str) -> None:
         """
@@ -414,10 +701,8 @@ class ProcessCache:
         """
         with self._lock:
             if handler_name in self.cache:
-                for process in self.cache[handler_name]['processes']:
-                    process.shutdown()
-
-                self.cache[handler_name]['processes'] = []
+                for process in list(self.cache[handler_name]['processes']):
+                    self._shutdown_process(handler_name, process)
 
 
 process_cache = ProcessCache()
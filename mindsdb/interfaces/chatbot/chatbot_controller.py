@@ -397,10 +397,12 @@ class ChatBotController:
             raise Exception(f"Chat bot is not running: {chat_bot.name}")
 
         chat_bot_task = ChatBotTask(task_id=task.id, object_id=chat_bot.id)
-
-        if webhook_token in chat_bot_memory:
-            chat_bot_task.set_memory(chat_bot_memory[webhook_token])
-        else:
-            chat_bot_memory[webhook_token] = chat_bot_task.get_memory()
-
-        chat_bot_task.on_webhook(request)
+        try:
+            if webhook_token in chat_bot_memory:
+                chat_bot_task.set_memory(chat_bot_memory[webhook_token])
+            else:
+                chat_bot_memory[webhook_token] = chat_bot_task.get_memory()
+
+            chat_bot_task.on_webhook(request)
+        finally:
+            chat_bot_task.close()
@@ -27,6 +27,8 @@ class ChatBotTask(BaseTask):
         self.bot_id = self.object_id
 
         self.session = SessionController()
+        self.chat_handler = None
+        self._backoffice_handlers = {}
 
         bot_record = db.ChatBots.query.get(self.bot_id)
 
@@ -76,7 +78,35 @@ class ChatBotTask(BaseTask):
         # TODO check deleted, raise errors
         # TODO checks on delete predictor / project/ integration
 
-        self.chat_pooling.run(stop_event)
+        try:
+            self.chat_pooling.run(stop_event)
+        finally:
+            self.close()
+
+    def get_backoffice_handler(self, name: str):
+        """
+        Get handler of backoffice database. It is owned by the task and is kept until the task is closed.
+
+        Args:
+            name (str): name of the database
+        """
+        if name not in self._backoffice_handlers:
+            self._backoffice_handlers[name] = self.session.integration_controller.get_data_handler(name)
+        return self._backoffice_handlers[name]
+
+    def close(self) -> None:
+        """
+        Disconnect handlers owned by the task
+        """
+        handlers = list(self._backoffice_handlers.values())
+        if self.chat_handler is not None:
+            handlers.append(self.chat_handler)
+        for handler in handlers:
+            try:
+                handler.disconnect()
+            except Exception:
+                logger.warning('Error on disconnecting of chatbot handler', exc_info=True)
+        self._backoffice_handlers = {}
 
     def on_message(self, message: ChatBotMessage, chat_id=None, chat_memory=None, table_name=None):
         if not chat_id and chat_memory:
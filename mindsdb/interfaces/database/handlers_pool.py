@@ -0,0 +1,372 @@
+"""
+Pools of connections to integrations.
+
+Every integration of every company has its own pool of data handlers. Handler is taken from the pool for one operation
+(checkout) and is returned after it (checkin), so workers of the thread pools share a bounded number of connections.
+Thread safe handlers (with `thread_safe` attribute) are not checked out exclusively: one handler is shared by
+all callers.
+
+Config:
+    "data_handlers_pool": {
+        "min_size": 0,  # idle connections which are not closed by idle timeout
+        "max_size": 10,  # max count of connections of one integration of one company
+        "idle_ttl": 60,  # seconds, idle connections are closed after it
+        "health_check_interval": 30,  # seconds, connection idle longer than it is checked before checkout
+        "acquire_timeout": 60  # seconds, how long to wait for free connection
+    }
+"""
+import time
+import threading
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable
+
+from mindsdb.integrations.utilities.utils import get_class_name
+from mindsdb.metrics import metrics
+from mindsdb.utilities import log
+from mindsdb.utilities.config import Config
+from mindsdb.utilities.context import context as ctx
+
+logger = log.getLogger(__name__)
+
+DEFAULT_POOL_CONFIG = {
+    'min_size': 0,
+    'max_size': 10,
+    'idle_ttl': 60,
+    'health_check_interval': 30,
+    'acquire_timeout': 60,
+}
+CLEAN_INTERVAL = 3
+
+
+class PoolClosedError(Exception):
+    pass
+
+
+def _disconnect(handler) -> None:
+    try:
+        handler.disconnect()
+    except Exception:
+        pass
+
+
+class HandlerPool:
+    """
+    Pool of handlers of one integration of one company
+    """
+
+    def __init__(
+        self,
+        min_size: int = 0,
+        max_size: int = 10,
+        idle_ttl: float = 60,
+        health_check_interval: float = 30,
+        acquire_timeout: float = 60,
+    ):
+        self.min_size = min_size
+        self.max_size = max(max_size, 1)
+        self.idle_ttl = idle_ttl
+        self.health_check_interval = health_check_interval
+        self.acquire_timeout = acquire_timeout
+
+        self._condition = threading.Condition()
+        # (handler, time of checkin), the last returned handler is at the right
+        self._idle = deque()
+        # count of created handlers: idle and checked out
+        self._size = 0
+        self._waiting = 0
+        self._shared = None
+        self._shared_users = 0
+        self._shared_last_used = 0
+        self._closed = False
+
+        # label for metrics, is known after creation of the first handler
+        self.label = 'unknown'
+        self._reported = {'idle': 0, 'in_use': 0}
+
+    def _report_state(self) -> None:
+        # is called under lock
+        idle = len(self._idle)
+        state = {'idle': idle, 'in_use': self._size - idle}
+        for key, value in state.items():
+            delta = value - self._reported[key]
+            if delta != 0:
+                metrics.DATA_HANDLER_POOL_CONNECTIONS.labels(self.label, key).inc(delta)
+        self._reported = state
+
+    def _is_healthy(self, handler) -> bool:
+        try:
+            return handler.check_connection().success is True
+        except Exception:
+            return False
+
+    def _take(self):
+        """
+        Get idle handler or reserve place for a new one, wait if pool is full
+
+        :return: (handler, time of checkin), handler is None if new handler has to be created
+        """
+        started_at = time.monotonic()
+        deadline = started_at + self.acquire_timeout
+        waiting = False
+        with self._condition:
+            try:
+                while True:
+                    if self._closed:
+                        raise PoolClosedError()
+                    if self._shared is not None:
+                        self._shared_users += 1
+                        self._shared_last_used = time.monotonic()
+                        return self._shared, None
+                    if len(self._idle) > 0:
+                        item = self._idle.pop()
+                        self._report_state()
+                        return item
+                    if self._size < self.max_size:
+                        self._size += 1
+                        self._report_state()
+                        return None, None
+
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise TimeoutError(
+                            f'No free connection in pool of integration after {self.acquire_timeout} seconds, '
+                            f'max size of pool is {self.max_size}'
+                        )
+                    if not waiting:
+                        waiting = True
+                        self._waiting += 1
+                        metrics.DATA_HANDLER_POOL_WAITING.labels(self.label).inc()
+                    self._condition.wait(remaining)
+            finally:
+                if waiting:
+                    self._waiting -= 1
+                    metrics.DATA_HANDLER_POOL_WAITING.labels(self.label).dec()
+                    metrics.DATA_HANDLER_POOL_WAIT_TIME.labels(self.label).observe(time.monotonic() - started_at)
+
+    def _discard(self, handler, reason: str) -> None:
+        with self._condition:
+            if handler is self._shared:
+                self._shared = None
+                self._shared_users = 0
+            self._size -= 1
+            self._report_state()
+            self._condition.notify()
+        metrics.DATA_HANDLER_POOL_EVICTIONS.labels(self.label, reason).inc()
+        _disconnect(handler)
+
+    def acquire(self, create_fn: Callable):
+        """
+        Checkout handler
+
+        :param create_fn: function to create new handler
+        :return: handler
+        """
+        while True:
+            handler, checkin_at = self._take()
+            if handler is None:
+                break
+            if (
+                checkin_at is not None
+                and time.monotonic() - checkin_at > self.health_check_interval
+                and not self._is_healthy(handler)
+            ):
+                self._discard(handler, 'unhealthy')
+                continue
+            return handler
+
+        try:
+            handler = create_fn()
+        except Exception:
+            with self._condition:
+                self._size -= 1
+                self._report_state()
+                self._condition.notify()
+            raise
+
+        with self._condition:
+            if self.label == 'unknown':
+                # move reported values to the right label
+                for key, value in self._reported.items():
+                    metrics.DATA_HANDLER_POOL_CONNECTIONS.labels(self.label, key).dec(value)
+                self.label = get_class_name(handler)
+                self._reported = {'idle': 0, 'in_use': 0}
+                self._report_state()
+            if getattr(handler, 'thread_safe', False) and self._shared is None:
+                self._shared = handler
+                self._shared_users = 1
+                self._shared_last_used = time.monotonic()
+                # the other callers which are waiting for handler can use it too
+                self._condition.notify_all()
+        return handler
+
+    def release(self, handler) -> None:
+        """
+        Checkin handler
+        """
+        with self._condition:
+            if handler is self._shared:
+                self._shared_users -= 1
+                self._shared_last_used = time.monotonic()
+                if not self._closed or self._shared_users > 0:
+                    return
+            elif not self._closed:
+                self._idle.append((handler, time.monotonic()))
+                self._report_state()
+                self._condition.notify()
+                return
+        self._discard(handler, 'closed')
+
+    def evict_idle(self) -> None:
+        """
+        Close handlers which were not used longer than idle_ttl
+        """
+        expired = []
+        with self._condition:
+            threshold = time.monotonic() - self.idle_ttl
+            while (
+                len(self._idle) > 0
+                and self._size - len(expired) > self.min_size
+                and self._idle[0][1] < threshold
+            ):
+                expired.append(self._idle.popleft()[0])
+            if (
+                self._shared is not None
+                and self._shared_users == 0
+                and self.min_size == 0
+                and self._shared_last_used < threshold
+            ):
+                expired.append(self._shared)
+                self._shared = None
+            self._size -= len(expired)
+            self._report_state()
+        for handler in expired:
+            metrics.DATA_HANDLER_POOL_EVICTIONS.labels(self.label, 'idle').inc()
+            _disconnect(handler)
+
+    def is_unused(self) -> bool:
+        with self._condition:
+            return self._size == 0 and self._waiting == 0
+
+    def close(self) -> None:
+        """
+        Close idle handlers, handlers which are checked out are closed on checkin
+        """
+        with self._condition:
+            self._closed = True
+            handlers = [handler for handler, _ in self._idle]
+            self._idle.clear()
+            if self._shared is not None and self._shared_users == 0:
+                handlers.append(self._shared)
+                self._shared = None
+            self._size -= len(handlers)
+            self._report_state()
+            self._condition.notify_all()
+        for handler in handlers:
+            metrics.DATA_HANDLER_POOL_EVICTIONS.labels(self.label, 'closed').inc()
+            _disconnect(handler)
+
+
+class HandlersPool:
+    """
+    Pools of handlers by integration name and company
+    """
+
+    def __init__(self):
+        self.pools = {}
+        self._lock = threading.Lock()
+        self._stop_event = threading.Event()
+        self.cleaner_thread = None
+
+    def __del__(self):
+        self._stop_clean()
+
+    def _start_clean(self) -> None:
+        """ start worker that close idle connections, is called under lock
+        """
+        if (
+            isinstance(self.cleaner_thread, threading.Thread)
+            and self.cleaner_thread.is_alive()
+            and not self._stop_event.is_set()
+        ):
+            return
+        self._stop_event.clear()
+        self.cleaner_thread = threading.Thread(target=self._clean, name='data_handlers_pool_cleaner')
+        self.cleaner_thread.daemon = True
+        self.cleaner_thread.start()
+
+    def _stop_clean(self) -> None:
+        self._stop_event.set()
+
+    @staticmethod
+    def _get_key(name: str) -> tuple:
+        # names of integrations are case insensitive
+        return name.lower(), ctx.company_id
+
+    def _get_pool(self, name: str) -> HandlerPool:
+        key = self._get_key(name)
+        with self._lock:
+            pool = self.pools.get(key)
+            if pool is None:
+                config = Config().get('data_handlers_pool', {})
+                pool = HandlerPool(**{
+                    option: config.get(option, default)
+                    for option, default in DEFAULT_POOL_CONFIG.items()
+                })
+                self.pools[key] = pool
+            self._start_clean()
+        return pool
+
+    @contextmanager
+    def handler(self, name: str, create_fn: Callable):
+        """
+        Checkout handler of integration for the block of code
+
+        :param name: name of integration
+        :param create_fn: function to create new handler
+        """
+        while True:
+            pool = self._get_pool(name)
+            try:
+                handler = pool.acquire(create_fn)
+                break
+            except PoolClosedError:
+                # integration was deleted or changed at the same time, next pool is used
+                continue
+        try:
+            yield handler
+        finally:
+            pool.release(handler)
+
+    def delete(self, name: str) -> None:
+        """ close connections of integration in all threads
+
+            Args:
+                name (str): integration name
+        """
+        with self._lock:
+            pool = self.pools.pop(self._get_key(name), None)
+        if pool is not None:
+            pool.close()
+
+    def _clean(self) -> None:
+        """ worker that close connections which were not in use for ttl
+        """
+        while self._stop_event.wait(timeout=CLEAN_INTERVAL) is False:
+            with self._lock:
+                pools = list(self.pools.items())
+            for key, pool in pools:
+                try:
+                    pool.evict_idle()
+                except Exception:
+                    logger.exception('Error on closing of idle connections:')
+                if pool.is_unused():
+                    with self._lock:
+                        if self.pools.get(key) is pool and pool.is_unused():
+                            del self.pools[key]
+                            pool.close()
+            with self._lock:
+                if len(self.pools) == 0:
+                    # is started again with the next pool
+                    self._stop_event.set()
+                    break
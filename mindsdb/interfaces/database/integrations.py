@@ -1,5 +1,4 @@
 import os
-import sys
 import base64
 import shutil
 import ast
@@ -10,9 +9,9 @@ import threading
 import inspect
 from pathlib import Path
 from copy import deepcopy
-from typing import Optional
 from textwrap import dedent
 from collections import OrderedDict
+from contextlib import contextmanager
 
 from sqlalchemy import func
 
@@ -22,6 +21,8 @@ from mindsdb.utilities.exception import EntityNotExistsError
 from mindsdb.interfaces.storage.fs import FsStore, FileStorage, RESOURCE_GROUP
 from mindsdb.interfaces.storage.model_fs import HandlerStorage
 from mindsdb.interfaces.file.file_controller import FileController
+from mindsdb.interfaces.database.schema_catalog import schema_catalog_controller
+from mindsdb.interfaces.database.handlers_pool import HandlersPool
 from mindsdb.integrations.libs.base import DatabaseHandler
 from mindsdb.integrations.libs.base import BaseMLEngine
 from mindsdb.integrations.libs.api_handler import APIHandler
@@ -36,121 +37,6 @@ import mindsdb.utilities.profiler as profiler
 logger = log.getLogger(__name__)
 
 
-class HandlersCache:
-    """ Cache for data handlers that keep connections opened during ttl time from handler last use
-    """
-
-    def __init__(self, ttl: int = 60):
-        """ init cache
-
-            Args:
-                ttl (int): time to live (in seconds) for record in cache
-        """
-        self.ttl = ttl
-        self.handlers = {}
-        self._lock = threading.RLock()
-        self._stop_event = threading.Event()
-        self.cleaner_thread = None
-
-    def __del__(self):
-        self._stop_clean()
-
-    def _start_clean(self) -> None:
-        """ start worker that close connections after ttl expired
-        """
-        if (
-            isinstance(self.cleaner_thread, threading.Thread)
-            and self.cleaner_thread.is_alive()
-        ):
-            return
-        self._stop_event.clear()
-        self.cleaner_thread = threading.Thread(target=self._clean)
-        self.cleaner_thread.daemon = True
-        self.cleaner_thread.start()
-
-    def _stop_clean(self) -> None:
-        """ stop clean worker
-        """
-        self._stop_event.set()
-
-    def set(self, handler: DatabaseHandler):
-        """ add (or replace) handler in cache
-
-            Args:
-                handler (DatabaseHandler)
-        """
-        with self._lock:
-            try:
-                # If the handler is defined to be thread safe, set 0 as the last element of the key, otherwise set the thrad ID.
-                key = (handler.name, ctx.company_id, 0 if getattr(handler, 'thread_safe', False) else threading.get_native_id())
-                handler.connect()
-                self.handlers[key] = {
-                    'handler': handler,
-                    'expired_at': time.time() + self.ttl
-                }
-            except Exception:
-                pass
-            self._start_clean()
-
-    def get(self, name: str) -> Optional[DatabaseHandler]:
-        """ get handler from cache by name
-
-            Args:
-                name (str): handler name
-
-            Returns:
-                DatabaseHandler
-        """
-        with self._lock:
-            # If the handler is not thread safe, the thread ID will be assigned to the last element of the key.
-            key = (name, ctx.company_id, threading.get_native_id())
-            if key not in self.handlers:
-                # If the handler is thread safe, a 0 will be assigned to the last element of the key.
-                key = (name, ctx.company_id, 0)
-            if (
-                key not in self.handlers
-                or self.handlers[key]['expired_at'] < time.time()
-            ):
-                return None
-            self.handlers[key]['expired_at'] = time.time() + self.ttl
-            return self.handlers[key]['handler']
-
-    def delete(self, name: str) -> None:
-        """ delete handler from cache
-
-            Args:
-                name (str): handler name
-        """
-        with self._lock:
-            key = (name, ctx.company_id, threading.get_native_id())
-            if key in self.handlers:
-                try:
-                    self.handlers[key].disconnect()
-                except Exception:
-                    pass
-                del self.handlers[key]
-            if len(self.handlers) == 0:
-                self._stop_clean()
-
-    def _clean(self) -> None:
-        """ worker that delete from cache handlers that was not in use for ttl
-        """
-        while self._stop_event.wait(timeout=3) is False:
-            with self._lock:
-                for key in list(self.handlers.keys()):
-                    if (
-                        self.handlers[key]['expired_at'] < time.time()
-                        and sys.getrefcount(self.handlers[key]) == 2    # returned ref count is always 1 higher
-                    ):
-                        try:
-                            self.handlers[key].disconnect()
-                        except Exception:
-                            pass
-                        del self.handlers[key]
-                if len(self.handlers) == 0:
-                    self._stop_event.set()
-
-
 class IntegrationController:
     @staticmethod
     def _is_not_empty_str(s):
@@ -159,7 +45,7 @@ class IntegrationController:
     def __init__(self):
         self._import_lock = threading.Lock()
         self._load_handler_modules()
-        self.handlers_cache = HandlersCache()
+        self.handlers_pool = HandlersPool()
 
     def _add_integration_record(self, name, engine, connection_args):
         integration_record = db.Integration(
@@ -213,7 +99,7 @@ class IntegrationController:
         return integration_id
 
     def modify(self, name, data):
-        self.handlers_cache.delete(name)
+        self.handlers_pool.delete(name)
         integration_record = self._get_integration_record(name)
         old_data = deepcopy(integration_record.data)
         for k in old_data:
@@ -221,13 +107,15 @@ class IntegrationController:
                 data[k] = old_data[k]
 
         integration_record.data = data
+        # integration can point to another database now
+        schema_catalog_controller.delete(integration_id=integration_record.id)
         db.session.commit()
 
     def delete(self, name):
         if name in ('files', 'lightwood'):
             raise Exception('Unable to drop: is system database')
 
-        self.handlers_cache.delete(name)
+        self.handlers_pool.delete(name)
 
         # check permanent integration
         if name in self.handler_modules:
@@ -265,6 +153,7 @@ class IntegrationController:
             if model.deleted_at is not None:
                 model.integration_id = None
 
+        schema_catalog_controller.delete(integration_id=integration_record.id)
         db.session.delete(integration_record)
         db.session.commit()
 
@@ -504,20 +393,44 @@ class IntegrationController:
 
         return handler
 
+    @contextmanager
+    def data_handler(self, name: str, case_sensitive: bool = False):
+        """Checkout DATA handler (DB or API) from pool of integration for the block of code:
+            with integration_controller.data_handler(name) as handler:
+                handler.query(...)
+
+        Args:
+            name (str): name of the handler
+            case_sensitive (bool): should case be taken into account when searching by name
+        """
+        with self.handlers_pool.handler(
+            name, lambda: self._create_data_handler(name, case_sensitive)
+        ) as handler:
+            yield handler
+
     @profiler.profile()
     def get_data_handler(self, name: str, case_sensitive: bool = False, connect=True) -> BaseHandler:
-        """Get DATA handler (DB or API) by name
+        """Get DATA handler (DB or API) by name.
+        Handler is not taken from pool: it is owned by caller, which can keep it for long time (chatbots, triggers).
+        Use data_handler() for queries.
+
         Args:
             name (str): name of the handler
             case_sensitive (bool): should case be taken into account when searching by name
+            connect (bool): connect handler
 
         Returns:
             BaseHandler: data handler
         """
-        handler = self.handlers_cache.get(name)
-        if handler is not None:
-            return handler
+        handler = self._create_data_handler(name, case_sensitive)
+        if connect:
+            try:
+                handler.connect()
+            except Exception:
+                pass
+        return handler
 
+    def _create_data_handler(self, name: str, case_sensitive: bool = False) -> BaseHandler:
         integration_record = self._get_integration_record(name, case_sensitive)
         integration_engine = integration_record.engine
 
@@ -586,11 +499,7 @@ class IntegrationController:
             integration_engine, handler_ars
         )
         HandlerClass = self.handler_modules[integration_engine].Handler
-        handler = HandlerClass(**handler_ars)
-        if connect:
-            self.handlers_cache.set(handler)
-
-        return handler
+        return HandlerClass(**handler_ars)
 
     def reload_handler_module(self, handler_name):
         importlib.reload(self.handler_modules[handler_name])
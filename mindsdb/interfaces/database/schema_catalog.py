@@ -0,0 +1,235 @@
+"""
+Schema catalog: tables and columns of integrations, stored in db.
+It is used to answer information_schema queries without requests to integrations.
+
+Catalog of integration is loaded on the first lookup. After TTL it is still used, but it is refreshed in background.
+Catalog is removed when the integration is changed or a table is created or dropped through mindsdb,
+and can be refreshed explicitly by 'REFRESH SCHEMA <database>'.
+
+Config:
+    "schema_catalog": {
+        "ttl": 3600,  # seconds, 0 disables catalog: schema is requested from integration every time
+        "integrations": {"<integration name>": <ttl>}  # TTL of specific integrations
+    }
+"""
+import datetime
+import threading
+from typing import Callable, List, Optional
+
+import sqlalchemy as sa
+from sqlalchemy.exc import IntegrityError
+
+from mindsdb.interfaces.storage import db
+from mindsdb.utilities import log
+from mindsdb.utilities.config import Config
+from mindsdb.utilities.context import context as ctx
+from mindsdb.utilities.context_executor import get_shared_executor
+
+logger = log.getLogger(__name__)
+
+DEFAULT_SCHEMA_CATALOG_TTL = 3600
+
+
+def load_schema(datanode, table_names: Optional[List[str]] = None, with_columns: bool = True) -> List[dict]:
+    """
+    Request schema from integration
+
+    :param datanode: IntegrationDataNode of integration
+    :param table_names: load only these tables (case-insensitive)
+    :param with_columns: load columns of tables
+    :return: list of tables: {'name', 'type', 'columns': [{'name', 'type'}]}
+    """
+    if table_names is not None:
+        table_names = {name.lower() for name in table_names}
+
+    tables = []
+    for table_row in datanode.get_tables():
+        table_name = table_row.TABLE_NAME
+        if table_names is not None and str(table_name).lower() not in table_names:
+            continue
+        columns = None
+        if with_columns:
+            columns = [
+                {
+                    'name': column['name'],
+                    'type': None if column.get('type') is None else str(column['type'])
+                }
+                for column in datanode.get_table_columns(table_name)
+            ]
+        tables.append({
+            'name': table_name,
+            'type': table_row.TABLE_TYPE,
+            'columns': columns
+        })
+    return tables
+
+
+class SchemaCatalogController:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        # (company_id, integration name) of catalogs which are refreshing in background
+        self._refreshing = set()
+
+    @staticmethod
+    def get_ttl(integration_name: str) -> int:
+        config = Config().get('schema_catalog', {})
+        ttl = config.get('integrations', {}).get(integration_name)
+        if ttl is None:
+            ttl = config.get('ttl', DEFAULT_SCHEMA_CATALOG_TTL)
+        return ttl
+
+    @staticmethod
+    def _get_integration_record(integration_name: str) -> Optional[db.Integration]:
+        return db.Integration.query.filter(
+            db.Integration.company_id == ctx.company_id,
+            sa.func.lower(db.Integration.name) == integration_name.lower()
+        ).first()
+
+    @staticmethod
+    def _get_catalog_record(integration_id: int) -> Optional[db.SchemaCatalog]:
+        return db.SchemaCatalog.query.filter_by(integration_id=integration_id).first()
+
+    def get_tables(
+        self,
+        integration_name: str,
+        get_datanode: Callable,
+        table_names: Optional[List[str]] = None,
+        with_columns: bool = True,
+    ) -> List[dict]:
+        """
+        Get schema of integration from catalog
+
+        :param integration_name: name of integration
+        :param get_datanode: function which returns IntegrationDataNode, is used if catalog has to be loaded
+        :param table_names: return only these tables (case-insensitive)
+        :param with_columns: columns of tables are required
+        :return: list of tables: {'name', 'type', 'columns': [{'name', 'type'}]}
+        """
+        ttl = self.get_ttl(integration_name)
+        if ttl <= 0:
+            return load_schema(get_datanode(), table_names, with_columns)
+
+        integration_record = self._get_integration_record(integration_name)
+        if integration_record is None:
+            return load_schema(get_datanode(), table_names, with_columns)
+
+        catalog_record = self._get_catalog_record(integration_record.id)
+        if catalog_record is None or catalog_record.refreshed_at is None:
+            if table_names is None and with_columns:
+                # full schema is required anyway
+                catalog_record = self.refresh(integration_name, get_datanode())
+            else:
+                # load only requested part now and the whole catalog in background
+                self.refresh_in_background(integration_name, get_datanode)
+                return load_schema(get_datanode(), table_names, with_columns)
+        elif catalog_record.refreshed_at + datetime.timedelta(seconds=ttl) < datetime.datetime.now():
+            self.refresh_in_background(integration_name, get_datanode)
+
+        query = db.SchemaCatalogTable.query.filter(
+            db.SchemaCatalogTable.catalog_id == catalog_record.id
+        )
+        if table_names is not None:
+            query = query.filter(
+                sa.func.lower(db.SchemaCatalogTable.name).in_({name.lower() for name in table_names})
+            )
+        return [
+            {
+                'name': record.name,
+                'type': record.type,
+                'columns': record.columns if with_columns else None
+            }
+            for record in query.order_by(db.SchemaCatalogTable.id).all()
+        ]
+
+    def refresh(self, integration_name: str, datanode) -> db.SchemaCatalog:
+        """
+        Request schema from integration and store it to catalog
+
+        :param integration_name: name of integration
+        :param datanode: IntegrationDataNode of integration
+        :return: record of catalog
+        """
+        integration_record = self._get_integration_record(integration_name)
+        if integration_record is None:
+            raise Exception(f'Integration does not exist: {integration_name}')
+
+        tables = load_schema(datanode)
+
+        catalog_record = self._get_catalog_record(integration_record.id)
+        if catalog_record is None:
+            catalog_record = db.SchemaCatalog(
+                company_id=ctx.company_id,
+                integration_id=integration_record.id
+            )
+            db.session.add(catalog_record)
+        else:
+            db.SchemaCatalogTable.query.filter_by(catalog_id=catalog_record.id).delete()
+        catalog_record.refreshed_at = datetime.datetime.now()
+        try:
+            db.session.flush()
+        except IntegrityError:
+            # catalog was created by another process at the same time
+            db.session.rollback()
+            return self._get_catalog_record(integration_record.id)
+
+        db.session.add_all([
+            db.SchemaCatalogTable(
+                catalog_id=catalog_record.id,
+                name=table['name'],
+                type=table['type'],
+                columns=table['columns']
+            )
+            for table in tables
+        ])
+        db.session.commit()
+        return catalog_record
+
+    def refresh_in_background(self, integration_name: str, get_datanode: Callable):
+        key = (ctx.company_id, integration_name.lower())
+        with self._lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        def _refresh():
+            try:
+                # datanode is created in the worker, handlers are not shared between threads
+                self.refresh(integration_name, get_datanode())
+            except Exception:
+                db.session.rollback()
+                logger.warning(f"Can't refresh schema catalog of '{integration_name}'", exc_info=True)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(key)
+
+        get_shared_executor().submit(_refresh)
+
+    def delete(self, integration_name: str = None, integration_id: int = None):
+        """
+        Remove catalog of integration, it will be loaded again on the next lookup.
+        Changes are committed by caller.
+        """
+        if integration_id is None:
+            integration_record = self._get_integration_record(integration_name)
+            if integration_record is None:
+                return
+            integration_id = integration_record.id
+
+        catalog_record = self._get_catalog_record(integration_id)
+        if catalog_record is None:
+            return
+        db.SchemaCatalogTable.query.filter_by(catalog_id=catalog_record.id).delete()
+        db.session.delete(catalog_record)
+
+    def invalidate(self, integration_name: str):
+        """
+        Remove catalog of integration after changes of its schema
+        """
+        if self.get_ttl(integration_name) <= 0:
+            return
+        self.delete(integration_name)
+        db.session.commit()
+
+
+schema_catalog_controller = SchemaCatalogController()
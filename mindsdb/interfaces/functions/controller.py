@@ -27,7 +27,7 @@ def function_maker(n_args, other_function):
         lambda arg_0: other_function(arg_0),
         lambda arg_0, arg_1: other_function(arg_0, arg_1),
         lambda arg_0, arg_1, arg_2: other_function(arg_0, arg_1, arg_2),
-        lambda arg_0, arg_1, arg_2, arg_3: other_function(arg_0, arg_1, arg_2, arg_2),
+        lambda arg_0, arg_1, arg_2, arg_3: other_function(arg_0, arg_1, arg_2, arg_3),
     ][n_args]
 
 
@@ -178,17 +178,45 @@ class DuckDBFunctions:
         ]
 
         self.functions[name] = {
-            'callback': function_maker(len(input_types), meta['callback']),
+            'callback': meta['callback'],
             'input': input_types,
             'output': python_to_duckdb_type(meta['output_type'])
         }
 
-    def register(self, connection):
+    @staticmethod
+    def _get_signature(info) -> tuple:
+        return tuple(str(param) for param in info['input']), str(info['output'])
+
+    @staticmethod
+    def _make_proxy(name, bound: dict):
+        def proxy(*args):
+            callback = bound.get(name)
+            if callback is None:
+                raise RuntimeError(f'Function is not available: {name}')
+            return callback(*args)
+        return proxy
+
+    def register(self, connection, registered: dict, bound: dict) -> None:
+        """
+        Register functions in duckdb connection and bind them to callbacks of the session.
+        Function is created in the connection once for every name and signature and reused by next queries:
+        it calls the callback from `bound`, which has to be cleared after the query
+        :param connection: duckdb connection
+        :param registered: signatures of functions created in the connection, by name
+        :param bound: callbacks of the current query, by name
+        """
         for name, info in self.functions.items():
-            connection.create_function(
-                name,
-                info['callback'],
-                info['input'],
-                info['output'],
-                null_handling="special"
-            )
+            signature = self._get_signature(info)
+            if registered.get(name) != signature:
+                if name in registered:
+                    connection.remove_function(name)
+                    del registered[name]
+                connection.create_function(
+                    name,
+                    function_maker(len(info['input']), self._make_proxy(name, bound)),
+                    info['input'],
+                    info['output'],
+                    null_handling="special"
+                )
+                registered[name] = signature
+            bound[name] = info['callback']
@@ -1,5 +1,6 @@
 import os
 import copy
+from contextlib import contextmanager
 from typing import Dict, List, Optional
 
 import pandas as pd
@@ -42,7 +43,6 @@ class KnowledgeBaseTable:
 
     def __init__(self, kb: db.KnowledgeBase, session):
         self._kb = kb
-        self._vector_db = None
         self.session = session
         self.document_preprocessor = None
         self.document_loader = None
@@ -86,8 +86,8 @@ class KnowledgeBaseTable:
         query.targets = targets
 
         # send to vectordb
-        db_handler = self.get_vector_db()
-        resp = db_handler.query(query)
+        with self.vector_db() as db_handler:
+            resp = db_handler.query(query)
         return resp.data_frame
 
     def insert_files(self, file_names: List[str]):
@@ -179,8 +179,8 @@ class KnowledgeBaseTable:
         query.table = Identifier(parts=[self._kb.vector_database_table])
 
         # send to vectordb
-        db_handler = self.get_vector_db()
-        db_handler.query(query)
+        with self.vector_db() as db_handler:
+            db_handler.query(query)
 
     def delete_query(self, query: Delete):
         """
@@ -194,8 +194,8 @@ class KnowledgeBaseTable:
         query.table = Identifier(parts=[self._kb.vector_database_table])
 
         # send to vectordb
-        db_handler = self.get_vector_db()
-        db_handler.query(query)
+        with self.vector_db() as db_handler:
+            db_handler.query(query)
 
     def hybrid_search(
         self,
@@ -212,22 +212,22 @@ class KnowledgeBaseTable:
         keywords_query = None
         if keywords is not None:
             keywords_query = ' '.join(keywords)
-        db_handler = self.get_vector_db()
-        return db_handler.hybrid_search(
-            self._kb.vector_database_table,
-            embeddings,
-            query=keywords_query,
-            metadata=metadata,
-            distance_function=distance_function
-        )
+        with self.vector_db() as db_handler:
+            return db_handler.hybrid_search(
+                self._kb.vector_database_table,
+                embeddings,
+                query=keywords_query,
+                metadata=metadata,
+                distance_function=distance_function
+            )
 
     def clear(self):
         """
         Clear data in KB table
         Sends delete to vector db table
         """
-        db_handler = self.get_vector_db()
-        db_handler.delete(self._kb.vector_database_table)
+        with self.vector_db() as db_handler:
+            db_handler.delete(self._kb.vector_database_table)
 
     def insert(self, df: pd.DataFrame):
         """
@@ -257,8 +257,8 @@ class KnowledgeBaseTable:
         df = pd.concat([df, df_emb], axis=1)
 
         # send to vector db
-        db_handler = self.get_vector_db()
-        db_handler.do_upsert(self._kb.vector_database_table, df)
+        with self.vector_db() as db_handler:
+            db_handler.do_upsert(self._kb.vector_database_table, df)
 
     def _adapt_column_names(self, df: pd.DataFrame) -> pd.DataFrame:
 
@@ -387,17 +387,16 @@ class KnowledgeBaseTable:
                     node.args[0].parts = [TableField.EMBEDDINGS.value]
                     node.args[1].value = [self._content_to_embeddings(node.args[1].value)]
 
-    def get_vector_db(self) -> VectorStoreHandler:
+    @contextmanager
+    def vector_db(self) -> VectorStoreHandler:
         """
-        helper to get vector db handler
+        helper to checkout vector db handler from pool for the block of code
         """
-        if self._vector_db is None:
-            database = db.Integration.query.get(self._kb.vector_database_id)
-            if database is None:
-                raise ValueError('Vector database not found. Is it deleted?')
-            database_name = database.name
-            self._vector_db = self.session.integration_controller.get_data_handler(database_name)
-        return self._vector_db
+        database = db.Integration.query.get(self._kb.vector_database_id)
+        if database is None:
+            raise ValueError('Vector database not found. Is it deleted?')
+        with self.session.integration_controller.data_handler(database.name) as db_handler:
+            yield db_handler
 
     def _df_to_embeddings(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -581,9 +580,8 @@ class KnowledgeBaseController:
         vector_database_id = self.session.integration_controller.get(vector_db_name)['id']
 
         # create table in vectordb
-        self.session.datahub.get(vector_db_name).integration_handler.create_table(
-            vector_table_name
-        )
+        with self.session.integration_controller.data_handler(vector_db_name) as vector_db_handler:
+            vector_db_handler.create_table(vector_table_name)
 
         kb = db.KnowledgeBase(
             name=name,
@@ -681,9 +679,8 @@ class KnowledgeBaseController:
         vector_db = db.Integration.query.get(kb.vector_database_id)
         if vector_db:
             database_name = vector_db.name
-            self.session.datahub.get(database_name).integration_handler.drop_table(
-                kb.vector_database_table
-            )
+            with self.session.integration_controller.data_handler(database_name) as vector_db_handler:
+                vector_db_handler.drop_table(kb.vector_database_table)
 
         # kb exists
         db.session.delete(kb)
@@ -125,10 +125,10 @@ def _build_vector_store_config_from_knowledge_base(rag_params: Dict, knowledge_b
     if vector_store_type == VectorStoreType.CHROMA.value:
         # For chromadb used, we get persist_directory
         vector_store_folder_name = knowledge_base.vector_database.data['persist_directory']
-        integration_handler = executor.session.integration_controller.get_data_handler(
+        with executor.session.integration_controller.data_handler(
             knowledge_base.vector_database.name
-        )
-        persist_dir = integration_handler.handler_storage.folder_get(vector_store_folder_name)
+        ) as integration_handler:
+            persist_dir = integration_handler.handler_storage.folder_get(vector_store_folder_name)
         vector_store_config['persist_directory'] = persist_dir
 
     elif vector_store_type == VectorStoreType.PGVECTOR.value:
@@ -137,9 +137,9 @@ def _build_vector_store_config_from_knowledge_base(rag_params: Dict, knowledge_b
 
         # get pgvector runtime data
         kb_table = executor.session.kb_controller.get_table(knowledge_base.name, knowledge_base.project_id)
-        vector_db = kb_table.get_vector_db()
-        connection_params = vector_db.connection_args
-        vector_store_config['collection_name'] = vector_db._check_table(knowledge_base.vector_database_table)
+        with kb_table.vector_db() as vector_db:
+            connection_params = vector_db.connection_args
+            vector_store_config['collection_name'] = vector_db._check_table(knowledge_base.vector_database_table)
 
         vector_store_config['connection_string'] = _create_conn_string(connection_params)
 
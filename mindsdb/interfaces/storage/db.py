@@ -249,6 +249,35 @@ class Integration(Base):
     )
 
 
+class SchemaCatalog(Base):
+    """Stored schema of integration, is used to answer information_schema queries"""
+    __tablename__ = "schema_catalog"
+    id = Column(Integer, primary_key=True)
+    company_id = Column(Integer)
+    integration_id = Column(
+        Integer, ForeignKey("integration.id", name="fk_integration_id"), nullable=False
+    )
+    refreshed_at = Column(DateTime, nullable=True)
+    created_at = Column(DateTime, default=datetime.datetime.now)
+    __table_args__ = (
+        UniqueConstraint("integration_id", name="unique_schema_catalog_integration_id"),
+    )
+
+
+class SchemaCatalogTable(Base):
+    __tablename__ = "schema_catalog_table"
+    id = Column(Integer, primary_key=True)
+    catalog_id = Column(
+        Integer, ForeignKey("schema_catalog.id", name="fk_catalog_id"), nullable=False
+    )
+    name = Column(String, nullable=False)
+    type = Column(String)
+    columns = Column(Json)
+    __table_args__ = (
+        Index("schema_catalog_table_catalog_id_name_index", "catalog_id", "name"),
+    )
+
+
 class File(Base):
     __tablename__ = "file"
     id = Column(Integer, primary_key=True)
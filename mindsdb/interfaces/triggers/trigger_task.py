@@ -53,7 +53,13 @@ class TriggerTask(BaseTask):
             else:
                 columns = columns.split('|')
 
-        data_handler.subscribe(stop_event, self._callback, trigger.table_name, columns=columns)
+        try:
+            data_handler.subscribe(stop_event, self._callback, trigger.table_name, columns=columns)
+        finally:
+            try:
+                data_handler.disconnect()
+            except Exception:
+                logger.warning('Error on disconnecting of trigger handler', exc_info=True)
 
     def _callback(self, row, key=None):
         logger.debug(f'trigger call: {row}, {key}')
@@ -36,12 +36,11 @@ class TriggersController:
         db_name = table.parts[0]
 
         db_integration = session.integration_controller.get(db_name)
-        db_handler = session.integration_controller.get_data_handler(db_name)
+        with session.integration_controller.data_handler(db_name) as db_handler:
+            if not hasattr(db_handler, 'subscribe'):
+                raise Exception(f'Handler {db_integration["engine"]} does''t support subscription')
 
-        if not hasattr(db_handler, 'subscribe'):
-            raise Exception(f'Handler {db_integration["engine"]} does''t support subscription')
-
-        df = db_handler.get_tables().data_frame
+            df = db_handler.get_tables().data_frame
         column = 'table_name'
         if column not in df.columns:
             column = df.columns[0]
@@ -2,7 +2,7 @@ from http import HTTPStatus
 import functools
 import time
 
-from prometheus_client import Histogram, Summary
+from prometheus_client import Counter, Gauge, Histogram, Summary
 
 
 INTEGRATION_HANDLER_QUERY_TIME = Summary(
@@ -17,6 +17,157 @@ INTEGRATION_HANDLER_RESPONSE_SIZE = Summary(
     ('integration', 'response_type')
 )
 
+SHARED_EXECUTOR_WORKERS = Gauge(
+    'mindsdb_shared_executor_workers',
+    'Max count of workers of the shared thread pool executor',
+    multiprocess_mode='livesum'
+)
+
+SHARED_EXECUTOR_BUSY_WORKERS = Gauge(
+    'mindsdb_shared_executor_busy_workers',
+    'How many workers of the shared thread pool executor are executing tasks',
+    multiprocess_mode='livesum'
+)
+
+SHARED_EXECUTOR_QUEUE_SIZE = Gauge(
+    'mindsdb_shared_executor_queue_size',
+    'How many tasks are waiting for a free worker of the shared thread pool executor',
+    multiprocess_mode='livesum'
+)
+
+FILE_CACHE_HITS = Counter(
+    'mindsdb_file_cache_hits',
+    'How many values were found in local file cache',
+    ('category',)
+)
+
+FILE_CACHE_MISSES = Counter(
+    'mindsdb_file_cache_misses',
+    'How many values were not found in local file cache',
+    ('category',)
+)
+
+FILE_CACHE_EVICTIONS = Counter(
+    'mindsdb_file_cache_evictions',
+    'How many values were removed from local file cache to fit into its size limits',
+    ('category',)
+)
+
+API_CONNECTIONS = Gauge(
+    'mindsdb_api_connections',
+    'How many client connections are open in sql API',
+    ('api',),
+    multiprocess_mode='livesum'
+)
+
+API_COMMAND_QUEUE_TIME = Histogram(
+    'mindsdb_api_command_queue_seconds',
+    'How long commands of client connections wait for a free worker of sql API',
+    ('api',)
+)
+
+PLAN_CACHE_HITS = Counter(
+    'mindsdb_plan_cache_hits',
+    'How many times parsed query or planner data were taken from cache',
+    ('cache',)
+)
+
+PLAN_CACHE_MISSES = Counter(
+    'mindsdb_plan_cache_misses',
+    'How many times parsed query or planner data were not found in cache',
+    ('cache',)
+)
+
+PLAN_CACHE_SAVED_SECONDS = Counter(
+    'mindsdb_plan_cache_saved_seconds',
+    'Time of parsing and catalog lookups which was saved by plan cache',
+    ('cache',)
+)
+
+DATA_HANDLER_POOL_CONNECTIONS = Gauge(
+    'mindsdb_data_handler_pool_connections',
+    'How many connections to integrations are open, by state: idle or in_use',
+    ('integration', 'state'),
+    multiprocess_mode='livesum'
+)
+
+DATA_HANDLER_POOL_WAITING = Gauge(
+    'mindsdb_data_handler_pool_waiting',
+    'How many callers are waiting for a free connection to integration',
+    ('integration',),
+    multiprocess_mode='livesum'
+)
+
+DATA_HANDLER_POOL_WAIT_TIME = Histogram(
+    'mindsdb_data_handler_pool_wait_seconds',
+    'How long callers wait for a free connection to integration when pool is full',
+    ('integration',)
+)
+
+DATA_HANDLER_POOL_EVICTIONS = Counter(
+    'mindsdb_data_handler_pool_evictions',
+    'How many connections to integrations were closed by pool, by reason: idle, unhealthy or closed',
+    ('integration', 'reason')
+)
+
+PREDICT_BATCH_SIZE = Histogram(
+    'mindsdb_predict_batch_size',
+    'How many predict requests were sent to ML engine in one batch',
+    ('engine',),
+    buckets=(1, 2, 4, 8, 16, 32, 64, 128, 256)
+)
+
+PREDICT_BATCH_WAIT_TIME = Histogram(
+    'mindsdb_predict_batch_wait_seconds',
+    'How long the batch of predict requests was collected before sending to ML engine',
+    ('engine',)
+)
+
+PREDICT_BATCH_LATENCY = Histogram(
+    'mindsdb_predict_batch_latency_seconds',
+    'How long the batch of predict requests was predicted by ML engine',
+    ('engine',)
+)
+
+ML_MODEL_LOAD_TIME = Histogram(
+    'mindsdb_ml_model_load_seconds',
+    'How long handler of model is created in ML process when model is not resident in it',
+    ('engine',)
+)
+
+ML_PREDICT_TIME = Histogram(
+    'mindsdb_ml_predict_seconds',
+    'How long predict takes in ML process, by residency: cold (model is loaded by this predict) or warm',
+    ('engine', 'residency')
+)
+
+ML_TASK_ROUTING = Counter(
+    'mindsdb_ml_task_routing',
+    'How many ML tasks were sent to process which has the model loaded (warm) or to another process (cold)',
+    ('engine', 'residency')
+)
+
+ML_PROCESS_POOL_SIZE = Gauge(
+    'mindsdb_ml_process_pool_size',
+    'How many ML processes are running',
+    ('engine',),
+    multiprocess_mode='livesum'
+)
+
+ML_PROCESS_POOL_BUSY = Gauge(
+    'mindsdb_ml_process_pool_busy',
+    'How many ML processes are executing tasks',
+    ('engine',),
+    multiprocess_mode='livesum'
+)
+
+ML_PROCESS_POOL_QUEUE = Gauge(
+    'mindsdb_ml_process_pool_queue',
+    'How many ML tasks are waiting for a free ML process',
+    ('engine',),
+    multiprocess_mode='livesum'
+)
+
 _REST_API_LATENCY = Histogram(
     'mindsdb_rest_api_latency_seconds',
     'How long REST API requests take to complete, grouped by method, endpoint, and status',
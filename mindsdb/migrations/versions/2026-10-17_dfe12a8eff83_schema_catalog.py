@@ -0,0 +1,50 @@
+"""schema_catalog
+
+Revision ID: dfe12a8eff83
+Revises: 6c57ed39a82b
+Create Date: 2026-10-17 10:12:41.523807
+
+"""
+from alembic import op
+import sqlalchemy as sa
+import mindsdb.interfaces.storage.db  # noqa
+
+
+# revision identifiers, used by Alembic.
+revision = 'dfe12a8eff83'
+down_revision = '6c57ed39a82b'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    op.create_table(
+        'schema_catalog',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('company_id', sa.Integer(), nullable=True),
+        sa.Column('integration_id', sa.Integer(), nullable=False),
+        sa.Column('refreshed_at', sa.DateTime(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['integration_id'], ['integration.id'], name='fk_integration_id'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('integration_id', name='unique_schema_catalog_integration_id')
+    )
+    op.create_table(
+        'schema_catalog_table',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('catalog_id', sa.Integer(), nullable=False),
+        sa.Column('name', sa.String(), nullable=False),
+        sa.Column('type', sa.String(), nullable=True),
+        sa.Column('columns', sa.String(), nullable=True),
+        sa.ForeignKeyConstraint(['catalog_id'], ['schema_catalog.id'], name='fk_catalog_id'),
+        sa.PrimaryKeyConstraint('id')
+    )
+    with op.batch_alter_table('schema_catalog_table', schema=None) as batch_op:
+        batch_op.create_index('schema_catalog_table_catalog_id_name_index', ['catalog_id', 'name'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('schema_catalog_table', schema=None) as batch_op:
+        batch_op.drop_index('schema_catalog_table_catalog_id_name_index')
+    op.drop_table('schema_catalog_table')
+    op.drop_table('schema_catalog')
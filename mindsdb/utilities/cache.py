@@ -19,6 +19,7 @@ How to use it:
 Configuration:
 
 - max_size size of cache in count of records, default is 500
+- max_bytes size of local cache in bytes, default is 1Gb
 - serializer, module for serialization, default is dill
 
 It can be set via:
@@ -54,7 +55,11 @@ How to test:
 
 import os
 import time
+import uuid
+import threading
 from abc import ABC
+from contextlib import contextmanager
+from collections import OrderedDict
 from pathlib import Path
 import hashlib
 import typing as t
@@ -62,19 +67,41 @@ import typing as t
 import pandas as pd
 import walrus
 
+if os.name == 'posix':
+    import fcntl
+
 from mindsdb.utilities.config import Config
 from mindsdb.utilities.json_encoder import CustomJSONEncoder
-from mindsdb.interfaces.storage.fs import FileLock
+from mindsdb.metrics import metrics
 from mindsdb.utilities.context import context as ctx
 
 _CACHE_MAX_SIZE = 500
+_CACHE_MAX_BYTES = 1024 ** 3
+_SHARD_PREFIX = 'shard_'
+_LOCK_FILE_NAME = '.lock'
+_INDEX_RESCAN_INTERVAL = 60
 
 
-def dataframe_checksum(df: pd.DataFrame):
+def rows_hashes(df: pd.DataFrame) -> pd.Series:
+    """ hash of every row of dataframe, index is not used
+
+        Args:
+            df (pd.DataFrame): input dataframe
 
-    return str_checksum(str(
-        df.set_axis(range(len(df.columns)), axis=1).to_records(index=False)
-    ))
+        Returns:
+            pd.Series: uint64 hashes
+    """
+    try:
+        return pd.util.hash_pandas_object(df, index=False)
+    except TypeError:
+        # unhashable values in object columns (dicts, lists)
+        return pd.util.hash_pandas_object(df.astype(str), index=False)
+
+
+def dataframe_checksum(df: pd.DataFrame):
+    checksum = hashlib.sha256(rows_hashes(df).values.tobytes())
+    checksum.update(str_checksum(str(list(df.columns))).encode())
+    return checksum.hexdigest()
 
 
 def json_checksum(obj: t.Union[dict, list]):
@@ -109,6 +136,13 @@ class BaseCache(ABC):
     def get_df(self, name):
         return self.get(name)
 
+    def get_many(self, names: t.List[str]) -> list:
+        return [self.get(name) for name in names]
+
+    def set_many(self, values: dict):
+        for name, value in values.items():
+            self.set(name, value)
+
     def serialize(self, value):
         return self.serializer.dumps(value)
 
@@ -116,8 +150,149 @@ class BaseCache(ABC):
         return self.serializer.loads(value)
 
 
+class FileCacheIndex:
+    """
+    In-memory LRU index of files of cache directory, it is shared between all FileCache instances of the directory.
+    It is built from files of the directory, ordered by their modification time (readers update it).
+    Other processes can add or remove files, so limits of the cache are checked for the whole directory:
+    before eviction the index is rebuilt from the directory under file lock. It also happens every
+    _INDEX_RESCAN_INTERVAL seconds, so the directory can exceed limits by writes of other processes for that time.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.entries = OrderedDict()  # name: size of file
+        self.total_bytes = 0
+        self.lock = threading.Lock()
+        self.loaded = False
+        self.scanned_at = 0
+
+    def load(self):
+        if self.loaded:
+            return
+        with self.lock:
+            if self.loaded:
+                return
+            self._scan()
+
+    def rescan(self):
+        with self.lock:
+            self._scan()
+
+    def _scan(self):
+        # files with the same modification time are ordered as in current index
+        positions = {name: i for i, name in enumerate(self.entries)}
+        files = []
+        for item in self.path.iterdir():
+            if item.name.startswith('.'):
+                # lock file
+                continue
+            try:
+                if item.is_dir():
+                    if not item.name.startswith(_SHARD_PREFIX):
+                        # directory of other company
+                        continue
+                    for file in item.iterdir():
+                        if file.name.startswith('.'):
+                            # not finished write
+                            continue
+                        stat = file.stat()
+                        files.append((stat.st_mtime, positions.get(file.name, -1), file.name, stat.st_size))
+                else:
+                    # file from flat layout of previous versions, it is not reachable anymore
+                    item.unlink()
+            except FileNotFoundError:
+                pass
+
+        files.sort()
+        self.entries = OrderedDict()
+        self.total_bytes = 0
+        for _, _, name, size in files:
+            self.entries[name] = size
+            self.total_bytes += size
+        self.loaded = True
+        self.scanned_at = time.time()
+
+    def is_rescan_required(self) -> bool:
+        return time.time() - self.scanned_at > _INDEX_RESCAN_INTERVAL
+
+    def is_over_limits(self, max_count: t.Optional[int], max_bytes: t.Optional[int]) -> bool:
+        with self.lock:
+            return (
+                (max_count is not None and len(self.entries) > max_count)
+                or (max_bytes is not None and self.total_bytes > max_bytes)
+            )
+
+    @contextmanager
+    def file_lock(self):
+        """
+        Exclusive lock of the directory between processes
+        """
+        if os.name != 'posix':
+            yield
+            return
+
+        fd = os.open(self.path / _LOCK_FILE_NAME, os.O_RDWR | os.O_CREAT)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX)
+            yield
+        finally:
+            # lock is released with closing of the file
+            os.close(fd)
+
+    def touch(self, name: str, size: int):
+        with self.lock:
+            old_size = self.entries.pop(name, None)
+            if old_size is not None:
+                self.total_bytes -= old_size
+            self.entries[name] = size
+            self.total_bytes += size
+
+    def remove(self, name: str):
+        with self.lock:
+            size = self.entries.pop(name, None)
+            if size is not None:
+                self.total_bytes -= size
+
+    def pop_oldest(self, max_count: t.Optional[int], max_bytes: t.Optional[int]) -> t.List[str]:
+        """
+        Remove the least recently used entries from index until it fits into limits
+
+        :return: names of removed entries
+        """
+        removed = []
+        with self.lock:
+            while len(self.entries) > 0 and (
+                (max_count is not None and len(self.entries) > max_count)
+                or (max_bytes is not None and self.total_bytes > max_bytes)
+            ):
+                name, size = self.entries.popitem(last=False)
+                self.total_bytes -= size
+                removed.append(name)
+        return removed
+
+
+_file_cache_indexes = {}
+_file_cache_indexes_lock = threading.Lock()
+
+
+def _get_file_cache_index(path: Path) -> FileCacheIndex:
+    with _file_cache_indexes_lock:
+        index = _file_cache_indexes.get(path)
+        if index is None:
+            index = FileCacheIndex(path)
+            _file_cache_indexes[path] = index
+    return index
+
+
 class FileCache(BaseCache):
-    def __init__(self, category, path=None, **kwargs):
+    """
+    Values are stored in files of subdirectories (shards) of cache directory.
+    Files are written to temporary file and renamed: readers never see not finished file and no locks are required.
+    Size of cache is limited by count of values (max_size) and by size in bytes (max_bytes)
+    """
+
+    def __init__(self, category, path=None, max_bytes=None, **kwargs):
         super().__init__(**kwargs)
 
         if path is None:
@@ -131,62 +306,104 @@ class FileCache(BaseCache):
         cache_path.mkdir(parents=True, exist_ok=True)
 
         self.path = cache_path
+        self.category = category
 
-    def clear_old_cache(self):
-        with FileLock(self.path):
-            # buffer to delete, to not run delete on every adding
-            buffer_size = 5
+        if max_bytes is None:
+            max_bytes = self.config['cache'].get('max_bytes', _CACHE_MAX_BYTES)
+        self.max_bytes = max_bytes
 
-            if self.max_size is None:
-                return
+        self.index = _get_file_cache_index(cache_path)
 
-            cur_count = len(os.listdir(self.path))
+    def clear_old_cache(self):
+        self.index.load()
+        if not self.index.is_over_limits(self.max_size, self.max_bytes) and not self.index.is_rescan_required():
+            return
 
-            if cur_count > self.max_size + buffer_size:
+        with self.index.file_lock():
+            # take into account files of other processes
+            self.index.rescan()
+            names = self.index.pop_oldest(self.max_size, self.max_bytes)
+            for name in names:
                 try:
-                    files = sorted(Path(self.path).iterdir(), key=os.path.getmtime)
-                    for file in files[:cur_count - self.max_size]:
-                        self.delete_file(file)
+                    self.delete_file(self.file_path(name))
                 except FileNotFoundError:
                     pass
+                metrics.FILE_CACHE_EVICTIONS.labels(self.category).inc()
 
     def file_path(self, name):
-        return self.path / name
+        shard = hashlib.md5(name.encode()).hexdigest()[:2]
+        return self.path / f'{_SHARD_PREFIX}{shard}' / name
 
-    def set_df(self, name, df):
+    def _write(self, name, write_fnc):
         path = self.file_path(name)
-        df.to_pickle(path)
+        path.parent.mkdir(exist_ok=True)
+
+        tmp_path = path.parent / f'.{name}.{uuid.uuid4().hex}'
+        try:
+            write_fnc(tmp_path)
+            os.replace(tmp_path, path)
+        except Exception:
+            try:
+                os.unlink(tmp_path)
+            except FileNotFoundError:
+                pass
+            raise
+
+        self.index.load()
+        self.index.touch(name, path.stat().st_size)
+
+    def _write_bytes(self, name, value):
+        def write_fnc(path):
+            with open(path, 'wb') as fd:
+                fd.write(value)
+        self._write(name, write_fnc)
+
+    def _read(self, name, read_fnc):
+        path = self.file_path(name)
+        try:
+            value = read_fnc(path)
+            size = path.stat().st_size
+            # for LRU order in other processes
+            os.utime(path)
+        except FileNotFoundError:
+            self.index.remove(name)
+            metrics.FILE_CACHE_MISSES.labels(self.category).inc()
+            return None
+
+        self.index.load()
+        self.index.touch(name, size)
+        metrics.FILE_CACHE_HITS.labels(self.category).inc()
+        return value
+
+    def set_df(self, name, df):
+        self._write(name, df.to_pickle)
         self.clear_old_cache()
 
     def set(self, name, value):
-        path = self.file_path(name)
-        value = self.serialize(value)
+        self._write_bytes(name, self.serialize(value))
+        self.clear_old_cache()
 
-        with open(path, 'wb') as fd:
-            fd.write(value)
+    def set_many(self, values):
+        for name, value in values.items():
+            self._write_bytes(name, self.serialize(value))
         self.clear_old_cache()
 
     def get_df(self, name):
-        path = self.file_path(name)
-        with FileLock(self.path):
-            if not os.path.exists(path):
-                return None
-            value = pd.read_pickle(path)
-        return value
+        return self._read(name, pd.read_pickle)
 
     def get(self, name):
-        path = self.file_path(name)
-
-        with FileLock(self.path):
-            if not os.path.exists(path):
-                return None
+        def read_fnc(path):
             with open(path, 'rb') as fd:
-                value = fd.read()
-        value = self.deserialize(value)
-        return value
+                return fd.read()
+
+        value = self._read(name, read_fnc)
+        if value is None:
+            return None
+        return self.deserialize(value)
 
     def delete(self, name):
         path = self.file_path(name)
+        self.index.remove(name)
         self.delete_file(path)
 
     def delete_file(self, path):
@@ -248,6 +465,28 @@ class RedisCache(BaseCache):
             return None
         return self.deserialize(value)
 
+    def get_many(self, names):
+        if len(names) == 0:
+            return []
+        values = self.client.mget([self.redis_key(name) for name in names])
+        return [
+            None if value is None else self.deserialize(value)
+            for value in values
+        ]
+
+    def set_many(self, values):
+        if len(values) == 0:
+            return
+        timestamp = int(time.time() * 1000)
+        pipeline = self.client.pipeline()
+        for name, value in values.items():
+            key = self.redis_key(name)
+            pipeline.set(key, self.serialize(value))
+            pipeline.hset(self.category, key, timestamp)
+        pipeline.execute()
+
+        self.clear_old_cache(None)
+
     def delete(self, name):
         key = self.redis_key(name)
 
@@ -271,6 +510,12 @@ class NoCache:
     def set(self, name, value):
         pass
 
+    def get_many(self, names):
+        return [None] * len(names)
+
+    def set_many(self, values):
+        pass
+
 
 def get_cache(category, **kwargs):
     config = Config()
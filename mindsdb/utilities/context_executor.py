@@ -1,8 +1,12 @@
-import time
-import types
-from concurrent.futures import ThreadPoolExecutor
+import os
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 import contextvars
 
+from mindsdb.metrics import metrics
+from mindsdb.utilities.config import Config
+
 
 class ContextThreadPoolExecutor(ThreadPoolExecutor):
     '''Handles copying context variables to threads created by ThreadPoolExecutor'''
@@ -16,44 +20,119 @@ class ContextThreadPoolExecutor(ThreadPoolExecutor):
             var.set(value)
 
 
-def execute_in_threads(func, tasks, thread_count=3, queue_size_k=1.5):
+class SharedContextExecutor(ThreadPoolExecutor):
+    '''Long-lived executor: copies context variables of the caller to every submitted task'''
+
+    def __init__(self, max_workers=None):
+        self._local = threading.local()
+        super().__init__(max_workers=max_workers, thread_name_prefix='mindsdb_shared')
+        metrics.SHARED_EXECUTOR_WORKERS.set(self._max_workers)
+
+    def submit(self, fn, /, *args, **kwargs):
+        context = contextvars.copy_context()
+        metrics.SHARED_EXECUTOR_QUEUE_SIZE.inc()
+        future = super().submit(context.run, self._run_task, fn, *args, **kwargs)
+        future.add_done_callback(self._on_done)
+        return future
+
+    @staticmethod
+    def _on_done(future):
+        if future.cancelled():
+            # task was removed from queue without execution
+            metrics.SHARED_EXECUTOR_QUEUE_SIZE.dec()
+
+    def _run_task(self, fn, *args, **kwargs):
+        metrics.SHARED_EXECUTOR_QUEUE_SIZE.dec()
+        metrics.SHARED_EXECUTOR_BUSY_WORKERS.inc()
+        self._local.is_worker = True
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            metrics.SHARED_EXECUTOR_BUSY_WORKERS.dec()
+
+    def is_worker_thread(self) -> bool:
+        return getattr(self._local, 'is_worker', False)
+
+
+_shared_executor = None
+_shared_executor_lock = threading.Lock()
+
+
+def get_shared_executor() -> SharedContextExecutor:
+    """
+    Executor which is shared between all queries. Size is set by 'executor.shared_pool_size' in config
+    """
+    global _shared_executor
+    if _shared_executor is None:
+        with _shared_executor_lock:
+            if _shared_executor is None:
+                max_workers = Config().get('executor', {}).get('shared_pool_size')
+                if max_workers is None:
+                    max_workers = min(32, (os.cpu_count() or 1) + 4)
+                _shared_executor = SharedContextExecutor(max_workers=max_workers)
+    return _shared_executor
+
+
+def execute_in_threads(func, tasks, thread_count=3, queue_size_k=1.5, ordered=False):
     """
     Should be used as generator.
-    Can accept input tasks as generator and keep queue size the same to not overflow the RAM
+    Can accept input tasks as generator and keep queue size the same to not overflow the RAM.
+    Tasks are executed in shared executor, results are yielded as soon as tasks are completed.
+    If it is called from a thread of shared executor (nested call): tasks are executed sequentially
+    in the current thread, because waiting for tasks queued behind the caller can lead to deadlock.
 
     :param func: callable, function to execute in threads
     :param tasks: generator or iterable, list of input for function
-    :param thread_count: number of threads
-    :param queue_size_k: how a queue for workers is bigger than count of threads
+    :param thread_count: max number of tasks of this call which are executed at the same time
+    :param queue_size_k: in ordered mode: how many completed results can wait for the slower previous task,
+        relative to thread_count
+    :param ordered: yield results in order of input tasks
     :return: yield results
     """
-    executor = ContextThreadPoolExecutor(max_workers=thread_count)
+    executor = get_shared_executor()
 
-    queue_size = int(thread_count * queue_size_k)
+    if executor.is_worker_thread():
+        # nested call from shared executor, waiting other tasks of the executor can lead to deadlock
+        for args in tasks:
+            yield func(*args)
+        return
 
-    if not isinstance(tasks, types.GeneratorType):
-        tasks = iter(tasks)
+    if ordered:
+        queue_size = max(int(thread_count * queue_size_k), thread_count, 1)
+    else:
+        queue_size = max(thread_count, 1)
 
-    futures = None
-    while futures is None or len(futures) > 0:
-        if futures is None:
-            futures = []
+    tasks = iter(tasks)
+    futures = deque()
+    is_input_finished = False
 
-        # add new portion
-        for i in range(queue_size):
-            try:
-                args = next(tasks)
+    try:
+        while True:
+            # add new portion
+            while not is_input_finished and len(futures) < queue_size:
+                running = sum(1 for future in futures if not future.done())
+                if running >= thread_count:
+                    break
+                try:
+                    args = next(tasks)
+                except StopIteration:
+                    is_input_finished = True
+                    break
                 futures.append(executor.submit(func, *args))
-            except StopIteration:
-                break
 
-        # save results
-        for task in futures:
-            if task.done():
-                yield task.result()
-
-        # remove completed tasks
-        futures[:] = [t for t in futures if not t.done()]
+            if len(futures) == 0:
+                break
 
-        time.sleep(0.1)
-    executor.shutdown(wait=False)
+            if ordered:
+                # wait for the first task in queue
+                future = futures.popleft()
+                yield future.result()
+            else:
+                done, _ = wait(futures, return_when=FIRST_COMPLETED)
+                for future in list(futures):
+                    if future in done:
+                        futures.remove(future)
+                        yield future.result()
+    finally:
+        for future in futures:
+            future.cancel()
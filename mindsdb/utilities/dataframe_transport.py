@@ -0,0 +1,270 @@
+"""
+Transport of dataframes between processes without copying them through a pipe or into a single redis value.
+
+Dataframe is serialized by pickle protocol 5 with out-of-band buffers: pickle stream contains only metadata and
+object columns, data of numeric columns is kept in separate buffers.
+ - local ML processes: buffers are written to a memory-mapped file in /dev/shm (in temp dir if it is not available
+   or doesn't have enough free space, /dev/shm is only 64Mb in docker by default). Receiver maps the file and builds
+   dataframe over the mapped memory, the file is removed after it. If the file can't be written, dataframe is sent
+   through pipe.
+ - redis: pickle stream and buffers are split into chunks of limited size.
+
+Config:
+    "dataframe_transport": {
+        "shared_min_size": 1048576,  # bytes, smaller dataframes are sent through pipe as before
+        "min_free_space": 0.1,  # part of filesystem which has to stay free after the file is written
+        "chunk_size": 67108864  # bytes, max size of one redis value
+    }
+"""
+import os
+import mmap
+import pickle
+import struct
+import tempfile
+from typing import Any, List, Tuple
+
+from pandas import DataFrame
+
+from mindsdb.utilities import log
+from mindsdb.utilities.config import Config
+
+logger = log.getLogger(__name__)
+
+DEFAULT_SHARED_MIN_SIZE = 1024 * 1024
+DEFAULT_MIN_FREE_SPACE = 0.1
+DEFAULT_CHUNK_SIZE = 64 * 1024 * 1024
+# buffers in file are aligned for numpy
+ALIGNMENT = 64
+SHM_DIR = '/dev/shm'
+
+
+def _get_config() -> dict:
+    return Config().get('dataframe_transport', {})
+
+
+def dump_buffers(obj: Any) -> Tuple[bytes, List[memoryview]]:
+    """
+    Serialize object with out-of-band buffers
+
+    :param obj: object to serialize
+    :return: pickle stream and list of buffers
+    """
+    buffers = []
+
+    def buffer_callback(buffer: pickle.PickleBuffer):
+        try:
+            buffers.append(buffer.raw())
+        except BufferError:
+            # not contiguous buffer is serialized in-band
+            return True
+        return False
+
+    header = pickle.dumps(obj, protocol=5, buffer_callback=buffer_callback)
+    return header, buffers
+
+
+def _has_free_space(path: str, size: int) -> bool:
+    """
+    Check that filesystem of the path has enough space for the file and keeps headroom after it
+    """
+    if not hasattr(os, 'statvfs'):
+        return True
+    stat = os.statvfs(path)
+    min_free_space = _get_config().get('min_free_space', DEFAULT_MIN_FREE_SPACE)
+    return stat.f_bavail * stat.f_frsize - size >= stat.f_blocks * stat.f_frsize * min_free_space
+
+
+def _get_shared_dirs(size: int) -> List[str]:
+    """
+    Directories to write file of the size: /dev/shm is preferred, temp dir is the fallback
+    """
+    dirs = []
+    for path in (SHM_DIR, tempfile.gettempdir()):
+        if path in dirs or not os.path.isdir(path) or not os.access(path, os.W_OK):
+            continue
+        try:
+            if _has_free_space(path, size):
+                dirs.append(path)
+        except OSError:
+            continue
+    return dirs
+
+
+def _align(offset: int) -> int:
+    return (offset + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+
+class SharedFrame:
+    """
+    Picklable reference to dataframe which is stored in memory-mapped file.
+    Dataframe can be loaded only once: file is removed after loading.
+    """
+
+    def __init__(self, path: str, header_size: int, layout: List[Tuple[int, int]]):
+        self.path = path
+        self.header_size = header_size
+        # (offset, size) of buffers
+        self.layout = layout
+
+    @classmethod
+    def dump(cls, obj: Any) -> 'SharedFrame':
+        """
+        Write object to file in the first directory which has enough free space
+
+        :raises OSError: if file can't be written in any directory
+        """
+        header, buffers = dump_buffers(obj)
+        layout = []
+        offset = len(header)
+        for buffer in buffers:
+            offset = _align(offset)
+            layout.append((offset, buffer.nbytes))
+            offset += buffer.nbytes
+
+        dirs = _get_shared_dirs(offset)
+        if len(dirs) == 0:
+            raise OSError(f'Not enough free space to write {offset} bytes to shared memory or temp dir')
+        for i, dir_path in enumerate(dirs):
+            try:
+                path = cls._write(dir_path, header, buffers, layout)
+            except OSError:
+                if i == len(dirs) - 1:
+                    raise
+                logger.debug(f"Can't write dataframe to {dir_path}, trying the next directory", exc_info=True)
+            else:
+                return cls(path, len(header), layout)
+
+    @staticmethod
+    def _write(dir_path: str, header: bytes, buffers: List[memoryview], layout: List[Tuple[int, int]]) -> str:
+        fd, path = tempfile.mkstemp(prefix='mindsdb_df_', dir=dir_path)
+        try:
+            with os.fdopen(fd, 'wb') as fd_file:
+                fd_file.write(header)
+                offset = len(header)
+                for buffer, (aligned, size) in zip(buffers, layout):
+                    fd_file.write(b'\0' * (aligned - offset))
+                    fd_file.write(buffer)
+                    offset = aligned + size
+        except BaseException:
+            os.remove(path)
+            raise
+        return path
+
+    def load(self) -> Any:
+        with open(self.path, 'rb') as fd_file:
+            if os.name == 'nt' or len(self.layout) == 0:
+                # mapped file can't be removed on windows
+                data = memoryview(bytearray(fd_file.read()))
+            else:
+                # copy-on-write mapping: arrays of dataframe are writable, the file is not changed
+                data = memoryview(mmap.mmap(fd_file.fileno(), 0, access=mmap.ACCESS_COPY))
+        self.discard()
+        buffers = [data[offset:offset + size] for offset, size in self.layout]
+        return pickle.loads(data[:self.header_size], buffers=buffers)
+
+    def discard(self) -> None:
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
+
+
+def to_shared(obj: Any) -> Any:
+    """
+    Put dataframe to shared memory if it is big enough
+
+    :param obj: any object
+    :return: SharedFrame or input object if it is small or can't be written
+    """
+    if not isinstance(obj, DataFrame):
+        return obj
+    min_size = _get_config().get('shared_min_size', DEFAULT_SHARED_MIN_SIZE)
+    if min_size is None or min_size < 0 or obj.memory_usage(index=True, deep=False).sum() < min_size:
+        return obj
+    try:
+        return SharedFrame.dump(obj)
+    except OSError as e:
+        logger.warning(f"Can't put dataframe to shared memory, it is sent through pipe: {e}")
+        return obj
+
+
+def from_shared(obj: Any) -> Any:
+    """
+    Load dataframe if it was put to shared memory
+
+    :param obj: SharedFrame or any object
+    :return: object
+    """
+    if isinstance(obj, SharedFrame):
+        return obj.load()
+    return obj
+
+
+_LENGTH = struct.Struct('!Q')
+
+
+def _join(pieces: List[memoryview]):
+    if len(pieces) == 1:
+        return pieces[0]
+    return b''.join(pieces)
+
+
+def dump_chunks(obj: Any, chunk_size: int = None) -> list:
+    """
+    Serialize object into chunks of limited size
+
+    :param obj: object to serialize
+    :param chunk_size: max size of chunk
+    :return: list of chunks: bytes or memoryview of buffers of object
+    """
+    if chunk_size is None:
+        chunk_size = _get_config().get('chunk_size', DEFAULT_CHUNK_SIZE)
+    header, buffers = dump_buffers(obj)
+    layout = pickle.dumps((len(header), [buffer.nbytes for buffer in buffers]))
+    parts = [_LENGTH.pack(len(layout)), layout, header] + buffers
+
+    chunks = []
+    pieces = []
+    pieces_size = 0
+    for part in parts:
+        part = memoryview(part)
+        while len(part) > 0:
+            piece = part[:chunk_size - pieces_size]
+            part = part[len(piece):]
+            pieces.append(piece)
+            pieces_size += len(piece)
+            if pieces_size == chunk_size:
+                chunks.append(_join(pieces))
+                pieces = []
+                pieces_size = 0
+    if pieces_size > 0:
+        chunks.append(_join(pieces))
+    return chunks
+
+
+def load_chunks(chunks: list) -> Any:
+    """
+    Load object from chunks made by dump_chunks
+
+    :param chunks: list of chunks
+    :return: object
+    """
+    # one writable copy, arrays of dataframe point to it
+    data = bytearray(sum(len(chunk) for chunk in chunks))
+    offset = 0
+    for chunk in chunks:
+        data[offset:offset + len(chunk)] = chunk
+        offset += len(chunk)
+    data = memoryview(data)
+
+    layout_size, = _LENGTH.unpack_from(data)
+    offset = _LENGTH.size
+    header_size, buffer_sizes = pickle.loads(data[offset:offset + layout_size])
+    offset += layout_size
+    header = data[offset:offset + header_size]
+    offset += header_size
+    buffers = []
+    for size in buffer_sizes:
+        buffers.append(data[offset:offset + size])
+        offset += size
+    return pickle.loads(header, buffers=buffers)
@@ -2,6 +2,8 @@ from enum import Enum
 
 
 TASKS_STREAM_NAME = b'ml-tasks'
+# predict tasks are read from separate stream, so they are not queued behind learn tasks
+TASKS_PREDICT_STREAM_NAME = b'ml-tasks-predict'
 TASKS_STREAM_CONSUMER_GROUP_NAME = 'ml_executors'
 TASKS_STREAM_CONSUMER_NAME = 'ml_executor'
 
@@ -16,6 +18,7 @@ class ML_TASK_TYPE(Enum):
     UPDATE_ENGINE = b'update_engine'
     UPDATE = b'update'
     FUNC_CALL = b'func_call'
+    PRELOAD = b'preload'
 
 
 class ML_TASK_STATUS(Enum):
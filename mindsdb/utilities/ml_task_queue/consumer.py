@@ -4,8 +4,7 @@ import signal
 import tempfile
 import threading
 from pathlib import Path
-from functools import wraps
-from collections.abc import Callable
+from concurrent.futures import ThreadPoolExecutor
 
 import psutil
 from walrus import Database
@@ -15,7 +14,9 @@ from redis.exceptions import ConnectionError as RedisConnectionError
 from mindsdb.utilities.config import Config
 from mindsdb.utilities.context import context as ctx
 from mindsdb.integrations.libs.process_cache import process_cache
-from mindsdb.utilities.ml_task_queue.utils import RedisKey, StatusNotifier, to_bytes, from_bytes
+from mindsdb.utilities.ml_task_queue.utils import (
+    RedisKey, StatusNotifier, to_bytes, from_bytes, set_dataframe, get_dataframe
+)
 from mindsdb.utilities.ml_task_queue.base import BaseRedisQueue
 from mindsdb.utilities.fs import clean_unlinked_process_marks
 from mindsdb.utilities.functions import mark_process
@@ -23,6 +24,7 @@ from mindsdb.utilities.ml_task_queue.const import (
     ML_TASK_TYPE,
     ML_TASK_STATUS,
     TASKS_STREAM_NAME,
+    TASKS_PREDICT_STREAM_NAME,
     TASKS_STREAM_CONSUMER_NAME,
     TASKS_STREAM_CONSUMER_GROUP_NAME
 )
@@ -31,46 +33,41 @@ from mindsdb.utilities.sentry import sentry_sdk  # noqa: F401
 
 logger = log.getLogger(__name__)
 
-
-def _save_thread_link(func: Callable) -> Callable:
-    """ Decorator for MLTaskConsumer.
-        Save thread in which func is executed to a list.
-    """
-    @wraps(func)
-    def wrapper(self, *args, **kwargs) -> None:
-        current_thread = threading.current_thread()
-        self._listen_message_threads.append(current_thread)
-        try:
-            result = func(self, *args, **kwargs)
-        finally:
-            self._listen_message_threads.remove(current_thread)
-        return result
-    return wrapper
+PREDICT_LANE = 'predict'
+LEARN_LANE = 'learn'
 
 
 class MLTaskConsumer(BaseRedisQueue):
     """ Listener of ML tasks queue and tasks executioner.
-        Each new message waited and executed in separate thread.
+        Tasks are executed concurrently in a thread pool. There are two lanes with separate streams:
+        predict tasks and the others (learn, finetune, etc). Tasks of the second lane can't take all workers,
+        so long learning doesn't block predictions.
+
+        Config:
+            "ml_task_queue": {
+                "consumer": {
+                    "max_tasks": <count of CPU>,  # max count of tasks which are executed at the same time
+                    "max_learn_tasks": <max_tasks / 2>  # max count of not predict tasks of them
+                }
+            }
 
         Attributes:
-            _ready_event (Event): set if ready to start new queue listen thread
             _stop_event (Event): set if need to stop all threads/processes
             cpu_stat (list[float]): CPU usage statistic. Each value is 0-100 float representing CPU usage in %
             _collect_cpu_stat_thread (Thread): pointer to thread that collecting CPU usage statistic
-            _listen_message_threads (list[Thread]): list of pointers to threads where queue messages are listening/processing
+            _executor (ThreadPoolExecutor): workers which execute tasks
+            _running (dict): count of executing tasks by lane
+            status_notifier (StatusNotifier): publishes statuses of all executing tasks
             db (Redis): database object
             cache: redis cache abstrtaction
             consumer_group: redis consumer group object
     """
 
     def __init__(self) -> None:
-        self._ready_event = threading.Event()
-        self._ready_event.set()
-
         self._stop_event = threading.Event()
         self._stop_event.clear()
 
-        process_cache.init()
+        process_cache.init(preload_models=True)
 
         # region collect cpu usage statistic
         self.cpu_stat = [0] * 10
@@ -78,10 +75,21 @@ class MLTaskConsumer(BaseRedisQueue):
         self._collect_cpu_stat_thread.start()
         # endregion
 
-        self._listen_message_threads = []
+        config = Config().get('ml_task_queue', {})
+
+        # region concurrency limits
+        consumer_config = config.get('consumer', {})
+        self.max_tasks = max(consumer_config.get('max_tasks', os.cpu_count() or 1), 1)
+        self.max_learn_tasks = min(
+            max(consumer_config.get('max_learn_tasks', self.max_tasks // 2), 1),
+            self.max_tasks
+        )
+        self._running = {PREDICT_LANE: 0, LEARN_LANE: 0}
+        self._running_condition = threading.Condition()
+        self._executor = ThreadPoolExecutor(self.max_tasks, thread_name_prefix='ml_task')
+        # endregion
 
         # region connect to redis
-        config = Config().get('ml_task_queue', {})
         self.db = Database(
             host=config.get('host', 'localhost'),
             port=config.get('port', 6379),
@@ -93,12 +101,18 @@ class MLTaskConsumer(BaseRedisQueue):
         self.wait_redis_ping(60)
 
         self.db.Stream(TASKS_STREAM_NAME)
+        self.db.Stream(TASKS_PREDICT_STREAM_NAME)
         self.cache = self.db.cache()
-        self.consumer_group = self.db.consumer_group(TASKS_STREAM_CONSUMER_GROUP_NAME, [TASKS_STREAM_NAME])
+        self.consumer_group = self.db.consumer_group(
+            TASKS_STREAM_CONSUMER_GROUP_NAME, [TASKS_STREAM_NAME, TASKS_PREDICT_STREAM_NAME]
+        )
         self.consumer_group.create()
         self.consumer_group.consumer(TASKS_STREAM_CONSUMER_NAME)
         # endregion
 
+        self.status_notifier = StatusNotifier(self.db, self.cache)
+        self.status_notifier.start()
+
     def _collect_cpu_stat(self) -> None:
         """ Collect CPU usage statistic. Executerd in thread.
         """
@@ -115,125 +129,183 @@ class MLTaskConsumer(BaseRedisQueue):
         """
         return sum(self.cpu_stat) / len(self.cpu_stat)
 
-    def wait_free_resources(self) -> None:
-        """ Sleep in thread untill there are free resources. Checks:
+    def has_free_resources(self) -> bool:
+        """ Check if there are free resources:
             - avg CPU usage is less than 60%
             - current CPU usage is less than 60%
-            - current tasks count is less than (N CPU cores) / 8
+            - current learn processes count is less than (N CPU cores) / 8
+
+            Returns:
+                bool
         """
+        if self.get_avg_cpu_usage() > 60 or max(self.cpu_stat[-3:]) > 60:
+            return False
         config = Config()
         is_cloud = config.get('cloud', False)
         processes_dir = Path(tempfile.gettempdir()).joinpath('mindsdb/processes/learn/')
-        while True:
-            while self.get_avg_cpu_usage() > 60 or max(self.cpu_stat[-3:]) > 60:
-                time.sleep(1)
-            if is_cloud and processes_dir.is_dir():
-                clean_unlinked_process_marks()
-                while (len(list(processes_dir.iterdir())) * 8) >= os.cpu_count():
-                    time.sleep(1)
-                    clean_unlinked_process_marks()
-            if (self.get_avg_cpu_usage() > 60 or max(self.cpu_stat[-3:]) > 60) is False:
-                return
-
-    @_save_thread_link
-    def _listen(self) -> None:
-        """ Listen message queue untill get new message. Execute task.
+        if is_cloud and processes_dir.is_dir():
+            clean_unlinked_process_marks()
+            if (len(list(processes_dir.iterdir())) * 8) >= os.cpu_count():
+                return False
+        return True
+
+    def wait_free_resources(self) -> None:
+        """ Sleep in thread untill there are free resources.
         """
-        message = None
-        while message is None:
-            self.wait_free_resources()
-            self.wait_redis_ping()
-            if self._stop_event.is_set():
-                return
+        while self.has_free_resources() is False:
+            time.sleep(1)
 
-            try:
-                message = self.consumer_group.read(count=1, block=1000, consumer=TASKS_STREAM_CONSUMER_NAME)
-            except RedisConnectionError as e:
-                logger.error(f"Can't connect to Redis: {e}")
-                self._stop_event.set()
-                return
-            except Exception:
-                self._stop_event.set()
-                raise
+    def _get_free_streams(self) -> dict:
+        """ Get streams of lanes which have free workers. The lane of learn tasks is read only if there are
+            free resources.
+
+            Returns:
+                dict: stream name -> max count of tasks to read
+        """
+        with self._running_condition:
+            free = self.max_tasks - sum(self._running.values())
+            if free <= 0:
+                return {}
+            streams = {TASKS_PREDICT_STREAM_NAME: free}
+            free_learn = min(free, self.max_learn_tasks - self._running[LEARN_LANE])
+        if free_learn > 0 and self.has_free_resources():
+            streams[TASKS_STREAM_NAME] = free_learn
+        return streams
 
-            if message.get(TASKS_STREAM_NAME) is None or len(message.get(TASKS_STREAM_NAME)) == 0:
-                message = None
+    def _read(self, streams: list, count: int, block: int = None) -> list:
+        """ Read new messages from streams
 
+            Args:
+                streams (list): names of streams
+                count (int): max count of messages of every stream
+                block (int): milliseconds to wait for messages
+
+            Returns:
+                list: (stream name, message id, message content)
+        """
+        response = self.db.xreadgroup(
+            TASKS_STREAM_CONSUMER_GROUP_NAME,
+            TASKS_STREAM_CONSUMER_NAME,
+            {stream_name: '>' for stream_name in streams},
+            count=count,
+            block=block
+        )
+        messages = []
+        for stream_name, stream_messages in (response or {}).items():
+            for message_id, message_content in stream_messages[0]:
+                messages.append((stream_name, message_id, message_content))
+        return messages
+
+    def _read_messages(self) -> list:
+        """ Read new messages from the lanes which have free workers, predict tasks first
+
+            Returns:
+                list: (stream name, message id, message content)
+        """
+        streams = self._get_free_streams()
+        if len(streams) == 0:
+            with self._running_condition:
+                self._running_condition.wait(timeout=1)
+            return []
+
+        messages = self._read(
+            [TASKS_PREDICT_STREAM_NAME], count=streams[TASKS_PREDICT_STREAM_NAME]
+        )
+        if len(messages) > 0:
+            return messages
+        # one message of every stream can be returned, so workers can be exceeded by one learn task
+        return self._read(list(streams), count=1, block=1000)
+
+    def _submit(self, stream_name: bytes, message_id: bytes, message_content: dict) -> None:
+        """ Take message from the queue and start its execution in the thread pool
+        """
+        self.consumer_group.streams[stream_name].ack(message_id)
+        self.consumer_group.streams[stream_name].delete(message_id)
+
+        lane = PREDICT_LANE if stream_name == TASKS_PREDICT_STREAM_NAME else LEARN_LANE
+        redis_key = RedisKey(message_content.get(b'redis_key'))
+        with self._running_condition:
+            self._running[lane] += 1
         try:
-            message = message[TASKS_STREAM_NAME][0][0]
-            message_id = message[0].decode()
-            message_content = message[1]
-            self.consumer_group.streams[TASKS_STREAM_NAME].ack(message_id)
-            self.consumer_group.streams[TASKS_STREAM_NAME].delete(message_id)
+            # the task can wait for free worker
+            self.status_notifier.set_status(redis_key, ML_TASK_STATUS.WAITING)
+            self._executor.submit(self._execute, lane, redis_key, message_content)
+        except Exception:
+            self._task_done(lane, redis_key)
+            raise
+
+    def _task_done(self, lane: str, redis_key: RedisKey) -> None:
+        self.status_notifier.remove(redis_key)
+        with self._running_condition:
+            self._running[lane] -= 1
+            self._running_condition.notify_all()
 
+    def _execute(self, lane: str, redis_key: RedisKey, message_content: dict) -> None:
+        """ Execute task, is executed in the thread pool
+        """
+        try:
             payload = from_bytes(message_content[b'payload'])
             task_type = ML_TASK_TYPE(message_content[b'task_type'])
             model_id = int(message_content[b'model_id'])
-            company_id = message_content[b'company_id']
-            if len(company_id) == 0:
-                company_id = None
-            redis_key = RedisKey(message_content.get(b'redis_key'))
-
-            # region read dataframe
-            dataframe_bytes = self.cache.get(redis_key.dataframe)
-            dataframe = None
-            if dataframe_bytes is not None:
-                dataframe = from_bytes(dataframe_bytes)
-                self.cache.delete(redis_key.dataframe)
-            # endregion
 
-            ctx.load(payload['context'])
-        finally:
-            self._ready_event.set()
+            dataframe = get_dataframe(self.db, redis_key.dataframe)
 
-        try:
+            ctx.load(payload['context'])
+            self.status_notifier.set_status(redis_key, ML_TASK_STATUS.PROCESSING)
             task = process_cache.apply_async(
                 task_type=task_type,
                 model_id=model_id,
                 payload=payload,
                 dataframe=dataframe
             )
-            status_notifier = StatusNotifier(redis_key, ML_TASK_STATUS.PROCESSING, self.db, self.cache)
-            status_notifier.start()
             result = task.result()
         except Exception as e:
+            self.status_notifier.remove(redis_key)
             self.wait_redis_ping()
-            status_notifier.stop()
             exception_bytes = to_bytes(e)
             self.cache.set(redis_key.exception, exception_bytes, 10)
             self.db.publish(redis_key.status, ML_TASK_STATUS.ERROR.value)
             self.cache.set(redis_key.status, ML_TASK_STATUS.ERROR.value, 180)
         else:
+            self.status_notifier.remove(redis_key)
             self.wait_redis_ping()
-            status_notifier.stop()
             if isinstance(result, DataFrame):
-                dataframe_bytes = to_bytes(result)
-                self.cache.set(redis_key.dataframe, dataframe_bytes, 10)
+                set_dataframe(self.db, redis_key.dataframe, result, 10)
             self.db.publish(redis_key.status, ML_TASK_STATUS.COMPLETE.value)
             self.cache.set(redis_key.status, ML_TASK_STATUS.COMPLETE.value, 180)
+        finally:
+            self._task_done(lane, redis_key)
 
     def run(self) -> None:
-        """ Start new listen thread each time when _ready_event is set
+        """ Read messages of the queue while there are free workers
         """
-        self._ready_event.set()
         while self._stop_event.is_set() is False:
-            self._ready_event.wait(timeout=1)
-            if self._ready_event.is_set() is False:
-                continue
-            self._ready_event.clear()
-            threading.Thread(target=self._listen).start()
+            try:
+                self.wait_redis_ping()
+                messages = self._read_messages()
+            except RedisConnectionError as e:
+                logger.error(f"Can't connect to Redis: {e}")
+                break
+            except Exception:
+                self.stop()
+                raise
+            for stream_name, message_id, message_content in messages:
+                self._submit(stream_name, message_id, message_content)
         self.stop()
 
     def stop(self) -> None:
         """ Stop all executing threads
         """
         self._stop_event.set()
-        for thread in (*self._listen_message_threads, self._collect_cpu_stat_thread):
-            try:
-                if thread.is_alive():
-                    thread.join()
-            except Exception:
-                pass
+        with self._running_condition:
+            self._running_condition.notify_all()
+        self._executor.shutdown(wait=True)
+        self.status_notifier.stop()
+        try:
+            if self._collect_cpu_stat_thread.is_alive():
+                self._collect_cpu_stat_thread.join()
+        except Exception:
+            pass
 
 
 @mark_process(name='internal', custom_mark='ml_task_consumer')
@@ -5,11 +5,12 @@ from pandas import DataFrame
 
 from mindsdb.utilities.context import context as ctx
 from mindsdb.utilities.config import Config
-from mindsdb.utilities.ml_task_queue.utils import RedisKey, to_bytes
+from mindsdb.utilities.ml_task_queue.utils import RedisKey, set_dataframe
 from mindsdb.utilities.ml_task_queue.task import Task
 from mindsdb.utilities.ml_task_queue.base import BaseRedisQueue
 from mindsdb.utilities.ml_task_queue.const import (
     TASKS_STREAM_NAME,
+    TASKS_PREDICT_STREAM_NAME,
     ML_TASK_TYPE,
     ML_TASK_STATUS
 )
@@ -24,7 +25,8 @@ class MLTaskProducer(BaseRedisQueue):
 
         Attributes:
             db (Redis): database object
-            stream
+            stream: stream of learn and other tasks
+            predict_stream: stream of predict tasks
             cache
             pubsub
     """
@@ -43,6 +45,7 @@ class MLTaskProducer(BaseRedisQueue):
         self.wait_redis_ping(60)
 
         self.stream = self.db.Stream(TASKS_STREAM_NAME)
+        self.predict_stream = self.db.Stream(TASKS_PREDICT_STREAM_NAME)
         self.cache = self.db.cache()
         self.pubsub = self.db.pubsub()
 
@@ -53,7 +56,7 @@ class MLTaskProducer(BaseRedisQueue):
                 task_type (ML_TASK_TYPE): type of the task
                 model_id (int): model identifier
                 payload (dict): lightweight model data that will be added to stream message
-                dataframe (DataFrame): dataframe will be transfered via regular redis storage
+                dataframe (DataFrame): dataframe will be transfered via redis storage in chunks
 
             Returns:
                 Task: object representing the task
@@ -71,10 +74,13 @@ class MLTaskProducer(BaseRedisQueue):
 
             self.wait_redis_ping()
             if dataframe is not None:
-                self.cache.set(redis_key.dataframe, to_bytes(dataframe), 180)
+                set_dataframe(self.db, redis_key.dataframe, dataframe, 180)
             self.cache.set(redis_key.status, ML_TASK_STATUS.WAITING, 180)
 
-            self.stream.add(message)
+            if task_type == ML_TASK_TYPE.PREDICT:
+                self.predict_stream.add(message)
+            else:
+                self.stream.add(message)
             return Task(self.db, redis_key)
         except ConnectionError:
             logger.error('Cant send message to redis: connect failed')
@@ -3,7 +3,7 @@ from collections.abc import Callable
 import redis
 from pandas import DataFrame
 
-from mindsdb.utilities.ml_task_queue.utils import RedisKey, from_bytes
+from mindsdb.utilities.ml_task_queue.utils import RedisKey, from_bytes, get_dataframe
 from mindsdb.utilities.ml_task_queue.const import ML_TASK_STATUS
 
 
@@ -36,10 +36,7 @@ class Task:
                 continue
             ml_task_status = ML_TASK_STATUS(msg['data'])
             if ml_task_status == ML_TASK_STATUS.COMPLETE:
-                dataframe_bytes = cache.get(self.redis_key.dataframe)
-                if dataframe_bytes is not None:
-                    self.dataframe = from_bytes(dataframe_bytes)
-                cache.delete(self.redis_key.dataframe)
+                self.dataframe = get_dataframe(self.db, self.redis_key.dataframe)
             elif ml_task_status == ML_TASK_STATUS.ERROR:
                 exception_bytes = cache.get(self.redis_key.exception)
                 if exception_bytes is not None:
@@ -7,9 +7,13 @@ from walrus import Database
 from redis.exceptions import ConnectionError as RedisConnectionError
 
 from mindsdb.utilities.context import context as ctx
+from mindsdb.utilities.dataframe_transport import dump_chunks, load_chunks
 from mindsdb.utilities.ml_task_queue.const import ML_TASK_STATUS
+from mindsdb.utilities import log
 from mindsdb.utilities.sentry import sentry_sdk  # noqa: F401
 
+logger = log.getLogger(__name__)
+
 
 def to_bytes(obj: object) -> bytes:
     """ dump object into bytes
@@ -35,6 +39,44 @@ def from_bytes(b: bytes) -> object:
     return pickle.loads(b)
 
 
+def set_dataframe(db: Database, key: str, dataframe: object, ttl: int) -> None:
+    """ store object in redis as chunks of limited size
+
+        Args:
+            db (Database): redis db object
+            key (str): key of object, chunks are stored with keys '<key>-<n>'
+            dataframe (object): object to store
+            ttl (int): seconds to keep object
+    """
+    chunks = dump_chunks(dataframe)
+    pipeline = db.pipeline(transaction=False)
+    for i, chunk in enumerate(chunks):
+        pipeline.set(f'{key}-{i}', chunk, ex=ttl)
+    pipeline.set(key, len(chunks), ex=ttl)
+    pipeline.execute()
+
+
+def get_dataframe(db: Database, key: str) -> object:
+    """ load object stored by set_dataframe and remove it from redis
+
+        Args:
+            db (Database): redis db object
+            key (str): key of object
+
+        Returns:
+            object: stored object or None if it is not in redis
+    """
+    count = db.get(key)
+    if count is None:
+        return None
+    chunk_keys = [f'{key}-{i}' for i in range(int(count))]
+    chunks = db.mget(chunk_keys)
+    db.delete(key, *chunk_keys)
+    if any(chunk is None for chunk in chunks):
+        raise KeyError(f'Dataframe is expired in redis: {key}')
+    return load_chunks(chunks)
+
+
 def wait_redis_ping(db: Database, timeout: int = 30):
     """ Wait when redis.ping return True
 
@@ -90,24 +132,43 @@ class RedisKey:
 
 
 class StatusNotifier(threading.Thread):
-    """ Worker that updates task status in redis with fixed frequency
+    """ Worker that updates statuses of all in-flight tasks in redis with fixed frequency
     """
 
-    def __init__(self, redis_key: RedisKey, ml_task_status: ML_TASK_STATUS, db, cache) -> None:
-        threading.Thread.__init__(self)
-        self.redis_key = redis_key
-        self.ml_task_status = ml_task_status
+    def __init__(self, db, cache) -> None:
+        threading.Thread.__init__(self, name='ml_task_status_notifier')
+        self.daemon = True
         self.db = db
         self.cache = cache
+        # RedisKey -> ML_TASK_STATUS
+        self._tasks = {}
+        self._lock = threading.Lock()
         self._stop_event = threading.Event()
 
-    def set_status(self, ml_task_status: ML_TASK_STATUS):
-        """ change status
+    def _notify(self, redis_key: RedisKey, ml_task_status: ML_TASK_STATUS) -> None:
+        self.db.publish(redis_key.status, ml_task_status.value)
+        self.cache.set(redis_key.status, ml_task_status.value, 180)
+
+    def set_status(self, redis_key: RedisKey, ml_task_status: ML_TASK_STATUS):
+        """ add task or change its status, the status is published immediately
 
             Args:
+                redis_key (RedisKey): keys of the task
                 ml_task_status (ML_TASK_STATUS): new status
         """
-        self.ml_task_status = ml_task_status
+        with self._lock:
+            self._tasks[redis_key.base] = (redis_key, ml_task_status)
+        wait_redis_ping(self.db)
+        self._notify(redis_key, ml_task_status)
+
+    def remove(self, redis_key: RedisKey) -> None:
+        """ stop status updating of the task
+
+            Args:
+                redis_key (RedisKey): keys of the task
+        """
+        with self._lock:
+            self._tasks.pop(redis_key.base, None)
 
     def stop(self) -> None:
         """ stop status updating
@@ -115,10 +176,16 @@ class StatusNotifier(threading.Thread):
         self._stop_event.set()
 
     def run(self):
-        """ start update status with fixed frequency
+        """ update statuses with fixed frequency
         """
-        while not self._stop_event.is_set():
-            wait_redis_ping(self.db)
-            self.db.publish(self.redis_key.status, self.ml_task_status.value)
-            self.cache.set(self.redis_key.status, self.ml_task_status.value, 180)
-            time.sleep(5)
+        while self._stop_event.wait(timeout=5) is False:
+            # under lock: status of removed task is not published after its final status
+            with self._lock:
+                if len(self._tasks) == 0:
+                    continue
+                try:
+                    wait_redis_ping(self.db)
+                    for redis_key, ml_task_status in self._tasks.values():
+                        self._notify(redis_key, ml_task_status)
+                except Exception:
+                    logger.warning('Error on updating of ML tasks statuses', exc_info=True)
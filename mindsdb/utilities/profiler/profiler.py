@@ -69,6 +69,34 @@ def stop_current_node():
         profiling['pointer'] = None
 
 
+def add_node(tag: str, start_at: float, stop_at: float):
+    """ Add completed node to the current node. Is used for code executed in other threads,
+        which can not use profiling pointer of the current thread
+
+        Args:
+            tag (str): name of new node
+            start_at (float): perf_counter value at start
+            stop_at (float): perf_counter value at stop
+    """
+    if profiling_enabled() is False:
+        return
+    profiling = ctx.profiling
+    if profiling['pointer'] is None:
+        return
+    current_node = _get_current_node(profiling)
+    current_node['children'].append({
+        'start_at': start_at,
+        'stop_at': stop_at,
+        # cpu time of other thread is not measured
+        'start_at_thread': 0,
+        'stop_at_thread': 0,
+        'start_at_process': 0,
+        'stop_at_process': 0,
+        'name': tag,
+        'children': []
+    })
+
+
 def set_meta(**kwargs):
     """ Add any additional info to profiling data
 
@@ -4,7 +4,7 @@ import pytest
 from walrus import Database
 
 from mindsdb.api.executor.data_types.response_type import RESPONSE_TYPE
-from mindsdb.utilities.ml_task_queue.const import TASKS_STREAM_NAME
+from mindsdb.utilities.ml_task_queue.const import TASKS_STREAM_NAME, TASKS_PREDICT_STREAM_NAME
 
 from tests.utils.http_test_helpers import HTTPHelperMixin
 
@@ -115,6 +115,7 @@ class TestMLTaskQueue(HTTPHelperMixin):
 
         db = Database(protocol=3)
         assert db.xlen(TASKS_STREAM_NAME) == 0
+        assert db.xlen(TASKS_PREDICT_STREAM_NAME) == 0
 
     def test_finetune(self):
         """ check that finetune is work
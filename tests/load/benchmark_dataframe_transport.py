@@ -0,0 +1,64 @@
+"""
+Compare transport of dataframe to ML process: pickle through pipe and shared memory file,
+and storing of dataframe in redis: one pickled value and chunks
+
+How to run:
+    env PYTHONPATH=./ python tests/load/benchmark_dataframe_transport.py
+"""
+import time
+import pickle
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+import pandas as pd
+
+from mindsdb.utilities.dataframe_transport import SharedFrame, dump_chunks, load_chunks
+
+
+def make_table(rows):
+    return pd.DataFrame({
+        'id': np.arange(rows),
+        'value': np.random.rand(rows),
+        'feature_a': np.random.rand(rows),
+        'feature_b': np.random.randint(0, 1000, rows),
+    })
+
+
+def measure(func, repeats):
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def pipe_task(df):
+    # the same dataframe is returned as a prediction
+    return df
+
+
+def shared_task(shared_frame):
+    return SharedFrame.dump(shared_frame.load())
+
+
+def run(pool, rows, repeats=3):
+    df = make_table(rows)
+
+    pipe_time = measure(lambda: pool.submit(pipe_task, df).result(), repeats)
+    shared_time = measure(lambda: pool.submit(shared_task, SharedFrame.dump(df)).result().load(), repeats)
+
+    single_time = measure(lambda: pickle.loads(pickle.dumps(df, protocol=5)), repeats)
+    chunks_time = measure(lambda: load_chunks(dump_chunks(df, 16 * 1024 * 1024)), repeats)
+
+    print(
+        f'rows: {rows:>9}  pipe: {pipe_time * 1000:10.2f} ms  shared: {shared_time * 1000:10.2f} ms  '
+        f'redis value: {single_time * 1000:10.2f} ms  chunks: {chunks_time * 1000:10.2f} ms'
+    )
+
+
+if __name__ == '__main__':
+    with ProcessPoolExecutor(1) as pool:
+        pool.submit(pipe_task, None).result()
+        for rows in (10_000, 1_000_000, 10_000_000):
+            run(pool, rows)
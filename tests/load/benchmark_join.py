@@ -0,0 +1,53 @@
+"""
+Compare hash join and duckdb join used in JoinStep
+
+How to run:
+    env PYTHONPATH=./ python tests/load/benchmark_join.py
+"""
+import time
+
+import numpy as np
+import pandas as pd
+
+from mindsdb.api.executor.sql_query.steps.join_step import hash_join, duckdb_join
+
+
+def make_tables(rows):
+    table_a = pd.DataFrame({
+        'A_t_id': np.arange(rows),
+        'A_t_name': [f'name_{i}' for i in range(rows)],
+        'A_t_value': np.random.rand(rows),
+    })
+    table_b = pd.DataFrame({
+        'B_m_id': np.random.permutation(rows),
+        'B_m_prediction': np.random.rand(rows),
+    })
+    return table_a, table_b
+
+
+def measure(func, repeats):
+    durations = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        func()
+        durations.append(time.perf_counter() - start)
+    return min(durations)
+
+
+def run(rows, repeats=3):
+    table_a, table_b = make_tables(rows)
+
+    hash_time = measure(
+        lambda: hash_join(table_a, table_b, [('A_t_id', 'B_m_id')], 'left join'),
+        repeats
+    )
+    duckdb_time = measure(
+        lambda: duckdb_join(table_a, table_b, 'table_a.A_t_id = table_b.B_m_id', 'left join'),
+        repeats
+    )
+    print(f'rows: {rows:>9}  hash join: {hash_time * 1000:10.2f} ms  duckdb: {duckdb_time * 1000:10.2f} ms')
+
+
+if __name__ == '__main__':
+    for rows in (10_000, 1_000_000):
+        run(rows)
@@ -87,3 +87,120 @@ class TestCashe(unittest.TestCase):
         # get first, must be deleted
         df2 = cache.get('first')
         assert df2 is None
+
+        # test many
+        cache.set_many({'many1': df, 'many2': df.head(1)})
+        df1, df2, df3 = cache.get_many(['many1', 'many2', 'missing'])
+        assert len(df1) == len(df)
+        assert len(df2) == 1
+        assert df3 is None
+
+    def test_file_max_bytes(self):
+        cache = FileCache('predict_bytes', max_size=100, max_bytes=3500)
+
+        for i in range(5):
+            cache.set(str(i), b'x' * 1000)
+        # the oldest ones are evicted
+        assert cache.get('0') is None
+        assert cache.get('1') is None
+        assert cache.get('4') is not None
+
+        # reading moves value to the end of LRU queue
+        cache.get('2')
+        cache.set('5', b'x' * 1000)
+        assert cache.get('2') is not None
+        assert cache.get('3') is None
+
+    def test_file_other_process(self):
+        cache = FileCache('predict_shared', max_size=3)
+        cache.set('1', b'x')
+        cache.set('2', b'x')
+        time.sleep(0.05)
+
+        # file of other process, it is not in index of this process
+        path = cache.file_path('other')
+        path.parent.mkdir(exist_ok=True)
+        path.write_bytes(cache.serialize(b'x'))
+        time.sleep(0.05)
+
+        cache.set('3', b'x')
+        cache.set('4', b'x')
+
+        # limit is applied to all files of directory
+        files = [file for shard in cache.path.iterdir() if shard.is_dir() for file in shard.iterdir()]
+        assert len(files) == 3
+        assert cache.get('1') is None
+        assert cache.get('2') is None
+        assert cache.get('other') == b'x'
+
+    def test_checksum(self):
+        # values in the middle of big dataframe are not shown in its repr
+        df = pd.DataFrame({'a': range(1000), 'b': ['x'] * 1000})
+        df2 = df.copy()
+        df2.loc[500, 'a'] = -1
+
+        assert dataframe_checksum(df) != dataframe_checksum(df2)
+        assert dataframe_checksum(df) == dataframe_checksum(df.copy())
+
+    def test_plan_cache(self):
+        from mindsdb.api.executor.sql_query.plan_cache import PlanCache
+
+        cache = PlanCache('test', max_size=2)
+        calls = []
+
+        def create():
+            calls.append(1)
+            return {'a': [1]}
+
+        value = cache.get_or_create('x', create, version=1)
+        # changes of returned value don't affect cache
+        value['a'].append(2)
+        assert cache.get_or_create('x', create, version=1) == {'a': [1]}
+        assert len(calls) == 1
+
+        # catalog was changed
+        cache.get_or_create('x', create, version=2)
+        assert len(calls) == 2
+
+        # the oldest is evicted
+        cache.get_or_create('y', create)
+        cache.get_or_create('z', create)
+        cache.get_or_create('x', create, version=2)
+        assert len(calls) == 5
+
+    def test_row_cache(self):
+        from types import SimpleNamespace
+        from unittest.mock import patch
+        from mindsdb.api.executor.sql_query.steps.apply_predictor_step import ApplyPredictorStepCall
+
+        cache = FileCache('predict_rows', path=tempfile.mkdtemp(), max_size=100)
+        step_call = ApplyPredictorStepCall.__new__(ApplyPredictorStepCall)
+        step_call.session = SimpleNamespace(stream_batch_size=None)
+
+        inputs = []
+
+        def apply_predictor(project_name, predictor_name, df, version, params):
+            inputs.append(list(df['a']))
+            return pd.DataFrame({'a': df['a'].values, 'p': df['a'].values * 2})
+
+        step_call.apply_predictor = apply_predictor
+
+        def predict(values):
+            df = pd.DataFrame({'a': values, '__mindsdb_row_id': range(len(values))})
+            with patch('mindsdb.api.executor.sql_query.steps.apply_predictor_step.get_cache', return_value=cache):
+                return step_call.apply_predictor_with_row_cache('proj', 'model', 1, df, None, {})
+
+        predict([1, 2, 3])
+        predictions = predict([3, 4, 2, 4])
+
+        # only not cached rows are predicted
+        assert inputs == [[1, 2, 3], [4, 4]]
+        assert list(predictions['p']) == [6, 8, 4, 8]
+        # types of partially cached predictions are kept
+        assert predictions['p'].dtype == 'int64'
+
+        # the same value of another type is not taken from cache
+        df = pd.DataFrame({'a': [1.0]})
+        with patch('mindsdb.api.executor.sql_query.steps.apply_predictor_step.get_cache', return_value=cache):
+            step_call.apply_predictor_with_row_cache('proj', 'model', 1, df, None, {})
+        assert inputs[-1] == [1.0]
@@ -0,0 +1,102 @@
+import threading
+import unittest
+
+import pandas as pd
+import pytest
+from mindsdb_sql import parse_sql
+
+from mindsdb.api.executor.utilities import sql as sql_utils
+from mindsdb.api.executor.utilities.sql import (
+    get_duckdb_connection, render_to_postgres, _parse_query, query_df_with_type_infer_fallback
+)
+from mindsdb.interfaces.functions.controller import DuckDBFunctions
+
+
+class FakeFunctionsController:
+    def __init__(self, callbacks):
+        self.callbacks = callbacks
+
+    def check_function(self, node):
+        name = node.op
+        if name not in self.callbacks:
+            return
+        return {
+            'name': name,
+            'callback': self.callbacks[name],
+            'input_types': ['int'],
+            'output_type': 'int'
+        }
+
+
+class TestDuckDBConnection(unittest.TestCase):
+
+    def test_thread_connection(self):
+        with get_duckdb_connection() as con:
+            first = con
+            # nested call uses temporary connection
+            with get_duckdb_connection() as nested:
+                assert nested is not first
+
+        with get_duckdb_connection() as con:
+            # reused in the same thread
+            assert con is first
+
+        connections = []
+
+        def get_connection():
+            with get_duckdb_connection() as con:
+                connections.append(con)
+
+        thread = threading.Thread(target=get_connection)
+        thread.start()
+        thread.join()
+
+        assert connections[0] is not first
+
+    def test_render_cache(self):
+        query = parse_sql('select a, b from tbl where a = 1')
+        query_str = render_to_postgres(query)
+
+        key = query.to_string()
+        assert sql_utils._render_cache[key] == query_str
+
+        # equal AST gets the same string from cache
+        sql_utils._render_cache[key] = 'cached'
+        assert render_to_postgres(parse_sql('select a, b from tbl where a = 1')) == 'cached'
+        del sql_utils._render_cache[key]
+
+    def test_parse_query(self):
+        _parse_query.cache_clear()
+
+        query = _parse_query('select * from tbl')
+        assert _parse_query('select * from tbl') is query
+        assert _parse_query.cache_info().hits == 1
+
+    def test_functions(self):
+        df = pd.DataFrame({'a': [1, 2, 3]})
+
+        def make_functions(callback):
+            functions = DuckDBFunctions(FakeFunctionsController({'inc': callback}))
+            functions.check_function(parse_sql('select inc(a) from df').targets[0])
+            return functions
+
+        result, _ = query_df_with_type_infer_fallback(
+            'select inc(a) as x from df', {'df': df}, user_functions=make_functions(lambda x: x + 1)
+        )
+        assert list(result['x']) == [2, 3, 4]
+
+        local = sql_utils._duckdb_thread_connection
+        signature = local.functions['inc']
+        # callbacks of the session are not kept after the query
+        assert local.bound_functions == {}
+
+        # function of other session is reused in connection, with its own callback
+        result, _ = query_df_with_type_infer_fallback(
+            'select inc(a) as x from df', {'df': df}, user_functions=make_functions(lambda x: x + 10)
+        )
+        assert list(result['x']) == [11, 12, 13]
+        assert local.functions['inc'] is signature
+
+        # not available without session
+        with pytest.raises(Exception):
+            query_df_with_type_infer_fallback('select inc(a) as x from df', {'df': df})
@@ -1,4 +1,4 @@
-from unittest.mock import patch
+from unittest.mock import patch, MagicMock
 import datetime as dt
 import tempfile
 import pytest
@@ -1128,6 +1128,218 @@ class TestSteps(BaseExecutorMockPredictor):
             limit 1
         """)
 
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_stream_batch_size(self, mock_handler):
+        df = pd.DataFrame([
+            {'a': i, 'b': str(i)}
+            for i in range(5)
+        ])
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+
+        predictor = {
+            'name': 'task_model',
+            'predict': 'p',
+            'dtypes': {
+                'p': dtype.float,
+                'a': dtype.integer,
+                'b': dtype.categorical
+            },
+            'predicted_value': 3.14
+        }
+        self.set_predictor(predictor)
+
+        self.execute('set stream_batch_size = 2')
+        ret = self.execute('''
+            SELECT t.a, m.p
+            FROM pg.tasks t
+            JOIN mindsdb.task_model m
+        ''')
+
+        # model was called by batches
+        assert self.mock_predict.call_count == 3
+
+        ret_df = self.ret_to_df(ret)
+        assert list(ret_df['a']) == list(range(5))
+        assert list(ret_df['p']) == [3.14] * 5
+
+    def test_stream_batch_size_value(self):
+        from mindsdb.api.executor.exceptions import WrongArgumentError
+
+        for value in ("'abc'", '-1', '2.5'):
+            with pytest.raises(WrongArgumentError):
+                self.execute(f'set stream_batch_size = {value}')
+
+        # 0 disables batches
+        self.execute('set stream_batch_size = 0')
+        assert self.command_executor.session.stream_batch_size is None
+
+    @patch('mindsdb.api.executor.sql_query.steps_scheduler.DEFAULT_SEMI_JOIN', True)
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_semi_join(self, mock_handler):
+        tables = {
+            'tasks': pd.DataFrame([
+                {'a': 1, 'b': 'x'},
+                {'a': 2, 'b': 'y'},
+                {'a': 3, 'b': 'x'},
+            ]),
+            'events': pd.DataFrame([
+                {'a': i % 5, 'c': i}
+                for i in range(10)
+            ]),
+        }
+        self.set_handler(mock_handler, name='pg', tables=tables)
+        self.set_handler(mock_handler, name='pg2', tables=tables)
+
+        ret = self.execute('''
+            SELECT t.a, e.c
+            FROM pg.tasks t
+            JOIN pg2.events e ON t.a = e.a
+            WHERE t.b = 'x'
+        ''')
+        ret_df = self.ret_to_df(ret)
+        assert sorted(ret_df['c']) == [1, 3, 6, 8]
+
+        # events were filtered by keys of tasks
+        queries = [call[0][0].to_string() for call in mock_handler().query.call_args_list]
+        events_query = [q for q in queries if 'events' in q][0]
+        assert 'IN (1, 3)' in events_query
+
+        # disabled by default
+        mock_handler().query.reset_mock()
+        with patch('mindsdb.api.executor.sql_query.steps_scheduler.DEFAULT_SEMI_JOIN', False):
+            ret = self.execute('''
+                SELECT t.a, e.c
+                FROM pg.tasks t
+                JOIN pg2.events e ON t.a = e.a
+                WHERE t.b = 'x'
+            ''')
+        assert sorted(self.ret_to_df(ret)['c']) == [1, 3, 6, 8]
+        queries = [call[0][0].to_string() for call in mock_handler().query.call_args_list]
+        events_query = [q for q in queries if 'events' in q][0]
+        assert 'IN (' not in events_query
+
+        from mindsdb_sql import parse_sql
+        from mindsdb_sql.planner.steps import FetchDataframeStep
+        from mindsdb.api.executor.sql_query.semi_join import _is_simple_fetch
+
+        def fetch_step(sql):
+            return FetchDataframeStep(integration='pg2', query=parse_sql(sql))
+
+        assert _is_simple_fetch(fetch_step('select * from events where c > 1'))
+        # ordered fetch can't be split to chunks
+        assert not _is_simple_fetch(fetch_step('select * from events order by c'))
+
+    def test_catalog_snapshot(self):
+        from mindsdb.api.executor.sql_query.catalog import CatalogSnapshot
+
+        self.set_predictor({
+            'name': 'task_model',
+            'predict': 'p',
+            'dtypes': {'p': dtype.float, 'a': dtype.integer},
+            'predicted_value': 1
+        })
+
+        catalog = CatalogSnapshot(self.command_executor.session)
+        records = catalog.get_model_records([
+            ('mindsdb', 'task_model', None),
+            ('mindsdb', 'task_model', 2),
+            ('mindsdb', 'unknown_model', None),
+            ('unknown_project', 'task_model', None),
+        ])
+        assert records[('mindsdb', 'task_model', None)].name == 'task_model'
+        assert records[('mindsdb', 'task_model', 2)] is None
+        assert records[('mindsdb', 'unknown_model', None)] is None
+        assert records[('unknown_project', 'task_model', None)] is None
+
+        assert catalog.get_agent('unknown_model', 'mindsdb') is None
+        assert 'mindsdb' in catalog.get_databases_dict()
+
+
+class TestSchemaCatalog(BaseExecutorMockPredictor):
+
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_schema_catalog(self, mock_handler):
+        df = pd.DataFrame([{'a': 1, 'b': 'x'}])
+        self.set_handler(mock_handler, name='pg', tables={'tbl1': df, 'tbl2': df})
+
+        # catalog is loaded on first lookup
+        ret = self.execute("select * from information_schema.columns where table_schema = 'pg'")
+        ret_df = self.ret_to_df(ret)
+        assert sorted(ret_df['TABLE_NAME']) == ['tbl1', 'tbl1', 'tbl2', 'tbl2']
+        assert mock_handler().get_columns.call_count == 2
+
+        # filters are applied to catalog, integration is not requested
+        ret = self.execute("""
+            select * from information_schema.columns where table_schema = 'pg' and table_name = 'tbl2'
+        """)
+        ret_df = self.ret_to_df(ret)
+        assert list(ret_df['COLUMN_NAME']) == ['a', 'b']
+
+        ret = self.execute("select * from information_schema.tables where table_schema = 'pg'")
+        ret_df = self.ret_to_df(ret)
+        assert sorted(ret_df['TABLE_NAME']) == ['tbl1', 'tbl2']
+        assert mock_handler().get_columns.call_count == 2
+
+        # explicit refresh, statement is not supported by parser
+        from mindsdb.api.executor.utilities.statements import parse_query
+        self.command_executor.execute_command(parse_query('refresh schema pg'))
+        assert mock_handler().get_columns.call_count == 4
+
+
+class TestSessionPool(BaseExecutorMockPredictor):
+
+    def test_session_pool(self):
+        from mindsdb.api.executor.controllers import SessionPool
+
+        pool = SessionPool(max_size=1)
+        with pool.session() as session:
+            # controllers are created on first access
+            assert 'datahub' not in session.__dict__
+            assert 'model_controller' not in session.__dict__
+            session.database = 'pg'
+            session.datahub.get('pg')
+            model_controller = session.model_controller
+
+        with pool.session() as session2:
+            assert session2 is session
+            assert session2.database is None
+            assert 'datahub' not in session2.__dict__
+            assert session2.model_controller is model_controller
+            cursor = MagicMock()
+            session2.register_cursor(1, cursor)
+
+            # pool is empty, new session is created
+            with pool.session() as session3:
+                assert session3 is not session2
+
+        # cursors are closed on release
+        cursor.close.assert_called_once()
+
+
+class TestFakeMysqlProxy(BaseExecutorMockPredictor):
+
+    @patch('mindsdb.integrations.handlers.postgres_handler.Handler')
+    def test_query_data(self, mock_handler):
+        from mindsdb.api.executor.data_types.response_type import RESPONSE_TYPE
+        from mindsdb.api.mysql.mysql_proxy.classes.fake_mysql_proxy import FakeMysqlProxy
+
+        df = pd.DataFrame([
+            {'a': 1, 'b': dt.datetime(2020, 1, 2, 3, 4, 5)},
+            {'a': 2, 'b': dt.datetime(2020, 1, 3, 3, 4, 5)},
+        ])
+        self.set_handler(mock_handler, name='pg', tables={'tasks': df})
+
+        session = self.command_executor.session
+        session.api_type = 'http'
+        mysql_proxy = FakeMysqlProxy(session=session)
+        result = mysql_proxy.process_query('select * from pg.tasks')
+
+        # rows are available as lists with json types for http api
+        assert result.type == RESPONSE_TYPE.TABLE
+        assert [column['name'] for column in result.columns] == ['a', 'b']
+        assert [row[0] for row in result.data] == [1, 2]
+        assert result.data[0][1].startswith('2020-01-02 03:04:05')
+
 
 class TestExecutionTools:
 
@@ -1144,6 +1356,63 @@ class TestExecutionTools:
         df = pd.DataFrame(d)
         query_df(df, 'select * from models')
 
+    def test_query_df_types(self):
+        # typed columns and column with mixed types
+        df = pd.DataFrame([
+            {'a': 1, 'b': 'x', 'c': 1},
+            {'a': 2, 'b': None, 'c': 'y'},
+            {'a': 3, 'b': 'z', 'c': 2.5},
+        ])
+
+        res = query_df(df[['a', 'b']], 'select a, b from t where a > 1')
+        assert res.to_dict('records') == [{'a': 2, 'b': None}, {'a': 3, 'b': 'z'}]
+
+        res = query_df(df, 'select a from t where a < 3')
+        assert list(res['a']) == [1, 2]
+
+    def test_hash_join(self):
+        from mindsdb.api.executor.sql_query.steps.join_step import hash_join, duckdb_join
+
+        table_a = pd.DataFrame([[1, 'a'], [2, 'b'], [3, 'c']], columns=['A_id', 'A_x'])
+        table_b = pd.DataFrame([[3, 'z'], [1, 'x']], columns=['B_id', 'B_y'])
+
+        for join_type in ('join', 'left join', 'right join'):
+            res = hash_join(table_a, table_b, [('A_id', 'B_id')], join_type)
+            expected = duckdb_join(table_a, table_b, 'table_a.A_id = table_b.B_id', join_type)
+
+            sort_cols = ['A_id', 'B_id']
+            res = res.sort_values(sort_cols).reset_index(drop=True).replace({np.nan: None})
+            expected = expected.sort_values(sort_cols).reset_index(drop=True).replace({np.nan: None})
+            assert res.to_dict('records') == expected.to_dict('records')
+
+        # null keys are not joined by hash join
+        table_b.loc[0, 'B_id'] = None
+        assert hash_join(table_a, table_b, [('A_id', 'B_id')], 'join') is None
+
+    def test_result_cursor(self):
+        from mindsdb.api.executor.sql_query.result_set import ResultSet
+        from mindsdb.api.executor.data_types.result_cursor import ResultCursor
+
+        df = pd.DataFrame([[i, str(i)] for i in range(10)], columns=['a', 'b'])
+        cursor = ResultCursor(ResultSet().from_df(df))
+
+        assert cursor.fetch(4) == [[i, str(i)] for i in range(4)]
+        assert cursor.fetch(4) == [[i, str(i)] for i in range(4, 8)]
+        assert not cursor.is_exhausted
+
+        # the rest
+        assert cursor.fetch(4) == [[8, '8'], [9, '9']]
+        assert cursor.is_exhausted
+        assert cursor.result_set is None
+        assert cursor.fetch(4) == []
+
+        # closed before end
+        cursor = ResultCursor(ResultSet().from_df(df))
+        cursor.fetch(4)
+        cursor.close()
+        with pytest.raises(RuntimeError):
+            cursor.fetch(4)
+
 
 class TestIfExistsIfNotExists(BaseExecutorMockPredictor):
 
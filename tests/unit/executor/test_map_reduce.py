@@ -0,0 +1,111 @@
+import threading
+import time
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+import pandas as pd
+import pytest
+from mindsdb_sql import parse_sql
+from mindsdb_sql.planner.steps import FetchDataframeStep
+
+from mindsdb.api.executor.exceptions import LogicError
+from mindsdb.api.executor.sql_query.result_set import ResultSet
+from mindsdb.api.executor.sql_query.steps.map_reduce_step import MapReduceStepCall, ResultSetAccumulator
+from mindsdb.utilities.context_executor import execute_in_threads
+
+
+def result_set(data):
+    return ResultSet().from_df(pd.DataFrame(data))
+
+
+class FakeSQLQuery:
+    def __init__(self):
+        self.steps_data = {}
+        self.context = {}
+        self.session = None
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+
+    def execute_step(self, step, steps_data=None):
+        with self.lock:
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+
+        value = step.query.where.args[1].value
+        # the first var finishes last
+        time.sleep(0.2 if value == 1 else 0.05)
+
+        with self.lock:
+            self.running -= 1
+        return result_set({'b': [f'x{value}'], 'a': [value]})
+
+
+class TestResultSetAccumulator(unittest.TestCase):
+
+    def test_order(self):
+        data = ResultSetAccumulator()
+        data.add(result_set({'a': [1, 2], 'b': ['x', 'y']}))
+        # empty result is skipped
+        data.add(ResultSet())
+        # columns are aligned by names of the first result
+        data.add(result_set({'b': ['z'], 'a': [3]}))
+
+        df = data.get_result().get_raw_df()
+        assert list(df.iloc[:, 0]) == [1, 2, 3]
+        assert list(df.iloc[:, 1]) == ['x', 'y', 'z']
+
+    def test_single(self):
+        first = result_set({'a': [1]})
+        data = ResultSetAccumulator()
+        data.add(first)
+        assert data.get_result() is first
+
+        assert len(ResultSetAccumulator().get_result().columns) == 0
+
+    def test_columns_mismatch(self):
+        data = ResultSetAccumulator()
+        data.add(result_set({'a': [1], 'b': ['x']}))
+
+        with pytest.raises(LogicError):
+            data.add(result_set({'a': [2], 'c': ['y']}))
+
+        with pytest.raises(LogicError):
+            data.add(result_set({'a': [2], 'b': ['y'], 'c': ['z']}))
+
+
+class TestMapReduceVars(unittest.TestCase):
+
+    def get_step(self, values):
+        sql_query = FakeSQLQuery()
+        sql_query.steps_data[0] = result_set({'a': values})
+
+        substep = FetchDataframeStep(integration='pg', query=parse_sql("select * from tbl where a = '$var[a]'"))
+        step = SimpleNamespace(values=SimpleNamespace(step_num=0), step=substep)
+        return MapReduceStepCall(sql_query), step, sql_query
+
+    @patch.object(MapReduceStepCall, 'get_max_threads', return_value=4)
+    def test_parallel_vars(self, mock_max_threads):
+        call, step, sql_query = self.get_step([1, 2, 3])
+
+        data = call._reduce_vars(step)
+
+        # substeps were executed in threads, results are in order of vars
+        assert sql_query.max_running == 3
+        df = data.get_raw_df()
+        assert list(df.iloc[:, 0]) == ['x1', 'x2', 'x3']
+        assert list(df.iloc[:, 1]) == [1, 2, 3]
+
+        # original substep is not modified
+        assert step.step.query.where.args[1].value == '$var[a]'
+
+    @patch.object(MapReduceStepCall, 'get_max_threads', return_value=4)
+    def test_nested_vars(self, mock_max_threads):
+        # executed in thread of shared executor: vars are executed sequentially
+        call, step, sql_query = self.get_step([1, 2])
+
+        results = list(execute_in_threads(call._reduce_vars, [(step,)], thread_count=2))
+
+        assert sql_query.max_running == 1
+        assert list(results[0].get_raw_df().iloc[:, 1]) == [1, 2]
@@ -0,0 +1,103 @@
+import threading
+import time
+import unittest
+
+from mindsdb_sql import parse_sql
+from mindsdb_sql.parser.ast import Parameter
+from mindsdb_sql.planner.step_result import Result
+from mindsdb_sql.planner.steps import FetchDataframeStep
+
+from mindsdb.api.executor.sql_query.steps_scheduler import StepsScheduler, get_fetch_dependencies
+
+
+def fetch_step(step_num, integration='pg', depends_on=None):
+    query = parse_sql('select * from tbl where a = 1')
+    if depends_on is not None:
+        query.where.args[1] = Parameter(Result(depends_on))
+    step = FetchDataframeStep(integration=integration, query=query)
+    step.step_num = step_num
+    return step
+
+
+class FakeSQLQuery:
+    def __init__(self, delay=0.2):
+        self.steps_data = {}
+        self.context = {'database': 'mindsdb'}
+        self.delay = delay
+        self.lock = threading.Lock()
+        self.running = 0
+        self.max_running = 0
+        self.executed = []
+
+    def execute_step(self, step):
+        with self.lock:
+            # results of dependencies must be available
+            assert get_fetch_dependencies(step).issubset(self.steps_data.keys())
+            self.running += 1
+            self.max_running = max(self.max_running, self.running)
+        time.sleep(self.delay)
+        with self.lock:
+            self.running -= 1
+            self.executed.append(step.step_num)
+        return f'result {step.step_num}'
+
+
+class FakeSemiJoin:
+    def __init__(self, driver_step_num):
+        self.driver_step_num = driver_step_num
+
+
+class TestStepsScheduler(unittest.TestCase):
+
+    def get_scheduler(self, sql_query, max_threads=4):
+        scheduler = StepsScheduler(sql_query)
+        scheduler.max_threads = max_threads
+        scheduler.use_semi_join = False
+        return scheduler
+
+    def test_dependencies(self):
+        assert get_fetch_dependencies(fetch_step(0)) == set()
+        assert get_fetch_dependencies(fetch_step(1, depends_on=0)) == {0}
+
+        # probe of semi-join depends on driver
+        scheduler = self.get_scheduler(FakeSQLQuery())
+        scheduler.semi_joins = {2: FakeSemiJoin(0)}
+        assert scheduler.get_dependencies(fetch_step(2, depends_on=1)) == {0, 1}
+
+    def test_order_semi_joins(self):
+        scheduler = self.get_scheduler(FakeSQLQuery())
+        scheduler.semi_joins = {0: FakeSemiJoin(2)}
+
+        steps = [fetch_step(0), fetch_step(1), fetch_step(2)]
+        ordered = scheduler._order_semi_joins(steps)
+        assert [step.step_num for step in ordered] == [1, 2, 0]
+        # input is not modified
+        assert [step.step_num for step in steps] == [0, 1, 2]
+
+    def test_concurrent_fetches(self):
+        sql_query = FakeSQLQuery()
+        scheduler = self.get_scheduler(sql_query)
+
+        steps = [fetch_step(0), fetch_step(1, integration='pg2'), fetch_step(2, depends_on=0)]
+        result = scheduler.execute(steps)
+
+        assert result == 'result 2'
+        # independent fetches were executed together, dependent one waited for them
+        assert sql_query.max_running == 2
+        assert sql_query.executed[-1] == 2
+        assert set(sql_query.steps_data.keys()) == {0, 1, 2}
+
+    def test_max_parallel_fetches(self):
+        sql_query = FakeSQLQuery(delay=0.05)
+        scheduler = self.get_scheduler(sql_query, max_threads=2)
+
+        scheduler.execute([fetch_step(i) for i in range(5)])
+        assert sql_query.max_running == 2
+        assert sorted(sql_query.executed) == list(range(5))
+
+        # disabled
+        sql_query = FakeSQLQuery(delay=0.05)
+        scheduler = self.get_scheduler(sql_query, max_threads=1)
+        scheduler.execute([fetch_step(i) for i in range(3)])
+        assert sql_query.max_running == 1
+        assert sql_query.executed == [0, 1, 2]
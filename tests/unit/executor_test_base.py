@@ -305,6 +305,10 @@ class BaseExecutorTest(BaseUnitTest):
         self.db.session.add(r)
         self.db.session.commit()
 
+        # connections of previous mock handler
+        from mindsdb.interfaces.database.integrations import integration_controller
+        integration_controller.handlers_pool.delete(name)
+
         from mindsdb.integrations.libs.response import RESPONSE_TYPE
         from mindsdb.integrations.libs.response import HandlerResponse as Response
 
@@ -0,0 +1,148 @@
+import socket
+import threading
+import time
+
+import pytest
+
+from mindsdb.api.common.connection_server import ConnectionServer, ConnectionSocket
+from mindsdb.utilities.context import context as ctx
+
+
+class EchoHandler:
+    """
+    First line from client is company_id, every next line is returned back with company_id of connection
+    """
+
+    def __init__(self, request, client_address, server):
+        self.socket = request
+        self.rfile = request.makefile('rb')
+
+    def handle_connect(self):
+        ctx.set_default()
+        ctx.company_id = int(self.rfile.readline())
+        self.socket.sendall(b'hi\n')
+        return True
+
+    def handle_command(self):
+        line = self.rfile.readline()
+        if line in (b'', b'quit\n'):
+            return False
+        time.sleep(0.1)
+        self.socket.sendall(f'{ctx.company_id}:'.encode() + line)
+        return True
+
+    def has_buffered_data(self):
+        self.socket.setblocking(False)
+        try:
+            return len(self.rfile.peek(1)) > 0
+        finally:
+            self.socket.setblocking(True)
+
+    def close(self):
+        self.rfile.close()
+
+
+class TestConnectionServer:
+
+    def test_commands(self):
+        server = ConnectionServer(
+            ('127.0.0.1', 0), EchoHandler, 'test',
+            max_connections=2, max_workers=4, tenant_max_workers=1
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        results = {}
+
+        def client(company_id):
+            sock = socket.create_connection(server.server_address)
+            rfile = sock.makefile('rb')
+            sock.sendall(f'{company_id}\n'.encode())
+            assert rfile.readline() == b'hi\n'
+            # both commands are received at once
+            sock.sendall(b'a\nb\n')
+            results[threading.get_ident()] = (company_id, [rfile.readline(), rfile.readline()])
+            sock.sendall(b'quit\n')
+            sock.close()
+
+        try:
+            start = time.time()
+            threads = [threading.Thread(target=client, args=(i % 2,)) for i in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join(timeout=10)
+
+            assert len(results) == 4
+            for company_id, lines in results.values():
+                assert lines == [f'{company_id}:a\n'.encode(), f'{company_id}:b\n'.encode()]
+
+            # 4 commands of every company are executed one by one
+            assert time.time() - start >= 0.4
+        finally:
+            server.server_close()
+
+    def test_stalled_client(self):
+        server = ConnectionServer(
+            ('127.0.0.1', 0), EchoHandler, 'test',
+            max_workers=1, handshake_timeout=0.5
+        )
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+        try:
+            # client which doesn't send handshake takes the only worker until timeout
+            stalled = socket.create_connection(server.server_address)
+
+            sock = socket.create_connection(server.server_address)
+            sock.settimeout(5)
+            rfile = sock.makefile('rb')
+            sock.sendall(b'1\n')
+            assert rfile.readline() == b'hi\n'
+
+            # stalled connection is closed
+            stalled.settimeout(5)
+            assert stalled.recv(1) == b''
+
+            sock.close()
+            stalled.close()
+        finally:
+            server.server_close()
+
+    def test_send_timeout(self):
+        server_side, client = socket.socketpair()
+        server_side = ConnectionSocket.from_socket(server_side)
+        server_side.settimeout(0.3)
+        data = b'x' * 20 * 1024 * 1024
+
+        received = []
+
+        def slow_reader():
+            while True:
+                chunk = client.recv(1024 * 1024)
+                if not chunk:
+                    break
+                received.append(len(chunk))
+                time.sleep(0.01)
+
+        reader = threading.Thread(target=slow_reader)
+        reader.start()
+        start = time.time()
+        try:
+            # total time of sending is more than timeout, client is receiving data
+            server_side.sendall(data)
+            assert time.time() - start > 0.3
+        finally:
+            server_side.close()
+            reader.join(timeout=10)
+            client.close()
+        assert sum(received) == len(data)
+
+        # client doesn't receive data
+        server_side, client = socket.socketpair()
+        server_side = ConnectionSocket.from_socket(server_side)
+        server_side.settimeout(0.3)
+        try:
+            with pytest.raises(socket.timeout):
+                server_side.sendall(data)
+        finally:
+            server_side.close()
+            client.close()
@@ -0,0 +1,38 @@
+import time
+import random
+
+from mindsdb.utilities.context import context as ctx
+from mindsdb.utilities.context_executor import execute_in_threads
+
+
+def _task(value):
+    time.sleep(random.random() / 100)
+    return value, ctx.company_id
+
+
+class TestExecuteInThreads:
+
+    def test_ordered(self):
+        ctx.set_default()
+        ctx.company_id = 123
+
+        tasks = ((i,) for i in range(20))
+        results = list(execute_in_threads(_task, tasks, thread_count=4, ordered=True))
+
+        assert [value for value, _ in results] == list(range(20))
+        # context is copied to threads
+        assert all(company_id == 123 for _, company_id in results)
+
+    def test_unordered(self):
+        tasks = [(i,) for i in range(20)]
+        results = list(execute_in_threads(_task, tasks, thread_count=4))
+
+        assert sorted(value for value, _ in results) == list(range(20))
+
+    def test_nested(self):
+        # call from task of shared executor is executed in the same thread
+        def nested(value):
+            return sum(execute_in_threads(lambda x: x, [(i,) for i in range(value)], thread_count=2))
+
+        results = list(execute_in_threads(nested, [(i,) for i in range(5)], thread_count=2, ordered=True))
+        assert results == [0, 0, 1, 3, 6]
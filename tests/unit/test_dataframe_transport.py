@@ -0,0 +1,76 @@
+import os
+import tempfile
+
+import numpy as np
+import pandas as pd
+
+from mindsdb.utilities import dataframe_transport
+from mindsdb.utilities.dataframe_transport import SharedFrame, dump_chunks, load_chunks, to_shared
+
+
+def make_table(rows):
+    return pd.DataFrame({
+        'id': np.arange(rows),
+        'value': np.random.rand(rows),
+        'name': [f'name_{i}' for i in range(rows)],
+    })
+
+
+class TestDataframeTransport:
+
+    def test_shared_frame(self):
+        df = make_table(1000)
+
+        shared_frame = SharedFrame.dump(df)
+        assert os.path.exists(shared_frame.path)
+
+        loaded = shared_frame.load()
+        pd.testing.assert_frame_equal(loaded, df)
+        # file is removed after loading
+        assert not os.path.exists(shared_frame.path)
+
+        # dataframe can be changed
+        loaded.loc[0, 'value'] = -1
+        assert loaded['value'][0] == -1
+
+    def test_chunks(self):
+        df = make_table(1000)
+
+        chunks = dump_chunks(df, chunk_size=1000)
+        assert len(chunks) > 1
+        assert all(len(chunk) <= 1000 for chunk in chunks)
+
+        loaded = load_chunks(chunks)
+        pd.testing.assert_frame_equal(loaded, df)
+
+        loaded.loc[0, 'id'] = -1
+        assert loaded['id'][0] == -1
+
+        # all in one chunk
+        loaded = load_chunks(dump_chunks(df, chunk_size=1024 * 1024))
+        pd.testing.assert_frame_equal(loaded, df)
+
+    def test_shared_frame_fallback(self, monkeypatch):
+        df = make_table(1000)
+
+        # shared memory is full: temp dir is used
+        monkeypatch.setattr(
+            dataframe_transport, '_has_free_space',
+            lambda path, size: path != dataframe_transport.SHM_DIR
+        )
+        shared_frame = SharedFrame.dump(df)
+        assert os.path.dirname(shared_frame.path) == tempfile.gettempdir()
+        pd.testing.assert_frame_equal(shared_frame.load(), df)
+
+        # no space anywhere: dataframe is sent as is
+        monkeypatch.setattr(dataframe_transport, '_has_free_space', lambda path, size: False)
+        monkeypatch.setattr(dataframe_transport, '_get_config', lambda: {'shared_min_size': 0})
+        assert to_shared(df) is df
+
+        # error on writing
+        def write(*args, **kwargs):
+            raise OSError('No space left on device')
+
+        monkeypatch.setattr(dataframe_transport, '_has_free_space', lambda path, size: True)
+        monkeypatch.setattr(SharedFrame, '_write', staticmethod(write))
+        assert to_shared(df) is df
@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from mindsdb.interfaces.database.handlers_pool import HandlerPool, HandlersPool
+
+
+class StatusResponse:
+    def __init__(self, success):
+        self.success = success
+
+
+class FakeHandler:
+    def __init__(self, thread_safe=False):
+        self.thread_safe = thread_safe
+        self.connected = True
+        self.healthy = True
+
+    def check_connection(self):
+        return StatusResponse(self.healthy)
+
+    def disconnect(self):
+        self.connected = False
+
+
+class TestHandlerPool:
+
+    def test_max_size(self):
+        pool = HandlerPool(max_size=2, acquire_timeout=5)
+        created = []
+        active = []
+        max_active = [0]
+        lock = threading.Lock()
+
+        def create():
+            handler = FakeHandler()
+            created.append(handler)
+            return handler
+
+        def task():
+            handler = pool.acquire(create)
+            with lock:
+                active.append(handler)
+                max_active[0] = max(max_active[0], len(active))
+            time.sleep(0.05)
+            with lock:
+                active.remove(handler)
+            pool.release(handler)
+
+        threads = [threading.Thread(target=task) for _ in range(6)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        assert len(created) == 2
+        assert max_active[0] == 2
+
+        # pool is full
+        handlers = [pool.acquire(create), pool.acquire(create)]
+        pool.acquire_timeout = 0.1
+        with pytest.raises(TimeoutError):
+            pool.acquire(create)
+        for handler in handlers:
+            pool.release(handler)
+
+    def test_health_check_and_eviction(self):
+        pool = HandlerPool(max_size=2, health_check_interval=0, idle_ttl=0)
+
+        handler = pool.acquire(FakeHandler)
+        pool.release(handler)
+
+        # broken connection is replaced
+        handler.healthy = False
+        new_handler = pool.acquire(FakeHandler)
+        assert new_handler is not handler
+        assert handler.connected is False
+        pool.release(new_handler)
+
+        pool.evict_idle()
+        assert new_handler.connected is False
+        assert pool.is_unused()
+
+    def test_thread_safe_handler(self):
+        pool = HandlerPool(max_size=1, acquire_timeout=0.1)
+
+        handler1 = pool.acquire(lambda: FakeHandler(thread_safe=True))
+        handler2 = pool.acquire(lambda: FakeHandler(thread_safe=True))
+        assert handler1 is handler2
+
+        pool.close()
+        pool.release(handler1)
+        assert handler1.connected is True
+        pool.release(handler2)
+        assert handler1.connected is False
+
+
+class TestHandlersPool:
+
+    def test_name_case(self):
+        pools = HandlersPool()
+        with pools.handler('MyDB', FakeHandler) as handler1:
+            pass
+        # one pool for the integration, regardless of case of its name
+        with pools.handler('mydb', FakeHandler) as handler2:
+            assert handler2 is handler1
+        assert len(pools.pools) == 1
+
+        # connections are closed on change of integration
+        pools.delete('MYDB')
+        assert handler1.connected is False
+        assert len(pools.pools) == 0
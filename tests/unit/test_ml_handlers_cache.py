@@ -0,0 +1,43 @@
+from mindsdb.integrations.libs.ml_handler_process.handlers_cacher import HandlersCache
+
+
+class FakeHandler:
+    def __init__(self):
+        self.closed = False
+
+    def close(self):
+        self.closed = True
+
+
+class TestHandlersCache:
+
+    def test_max_size(self):
+        cache = HandlersCache(max_size=2)
+        handlers = [FakeHandler() for _ in range(3)]
+        cache[1] = handlers[0]
+        cache[2] = handlers[1]
+        # model 1 is used last
+        assert cache[1] is handlers[0]
+        cache[3] = handlers[2]
+
+        assert set(cache.keys()) == {1, 3}
+        assert handlers[1].closed is True
+        assert handlers[0].closed is False
+
+    def test_max_memory(self):
+        cache = HandlersCache(max_size=10, max_memory=100)
+        handlers = [FakeHandler() for _ in range(3)]
+        cache[1] = handlers[0]
+        cache.set_memory(1, 60)
+        cache[2] = handlers[1]
+        cache.set_memory(2, 30)
+        assert set(cache.keys()) == {1, 2}
+
+        cache[3] = handlers[2]
+        cache.set_memory(3, 50)
+        assert set(cache.keys()) == {2, 3}
+        assert handlers[0].closed is True
+
+        # the last model is kept even if it exceeds the limit
+        cache.set_memory(3, 200)
+        assert set(cache.keys()) == {3}
@@ -0,0 +1,188 @@
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import Future, ThreadPoolExecutor
+from types import SimpleNamespace
+
+import pytest
+
+from mindsdb.utilities.context import context as ctx
+from mindsdb.utilities.ml_task_queue import consumer as consumer_module
+from mindsdb.utilities.ml_task_queue.consumer import MLTaskConsumer, PREDICT_LANE, LEARN_LANE
+from mindsdb.utilities.ml_task_queue.utils import RedisKey, StatusNotifier, to_bytes
+from mindsdb.utilities.ml_task_queue.const import (
+    ML_TASK_TYPE,
+    ML_TASK_STATUS,
+    TASKS_STREAM_NAME,
+    TASKS_PREDICT_STREAM_NAME,
+)
+
+
+class FakeDB:
+    def __init__(self):
+        self.streams = {TASKS_PREDICT_STREAM_NAME: [], TASKS_STREAM_NAME: []}
+        self.reads = []
+        self.published = []
+
+    def ping(self):
+        return True
+
+    def publish(self, key, value):
+        self.published.append((key, value))
+
+    def get(self, key):
+        return None
+
+    def xreadgroup(self, group, consumer, streams, count=None, block=None):
+        self.reads.append((list(streams), count))
+        response = {}
+        for name in streams:
+            messages = self.streams[name][:count]
+            del self.streams[name][:count]
+            if len(messages) > 0:
+                response[name] = [messages]
+        return response
+
+
+class FakeCache:
+    def __init__(self):
+        self.data = {}
+
+    def set(self, key, value, timeout):
+        self.data[key] = value
+
+
+class FakeStream:
+    def ack(self, message_id):
+        pass
+
+    def delete(self, message_id):
+        pass
+
+
+class FakeProcessCache:
+    def __init__(self):
+        self.tasks = []
+
+    def apply_async(self, **kwargs):
+        task = Future()
+        self.tasks.append(task)
+        return task
+
+
+def wait_for(predicate, timeout=5):
+    end_time = time.time() + timeout
+    while not predicate():
+        assert time.time() < end_time
+        time.sleep(0.01)
+
+
+def make_message(key, task_type=ML_TASK_TYPE.PREDICT):
+    return {
+        b'redis_key': key,
+        b'payload': to_bytes({'context': ctx.dump()}),
+        b'task_type': task_type.value,
+        b'model_id': b'1',
+    }
+
+
+@pytest.fixture
+def process_cache(monkeypatch):
+    process_cache = FakeProcessCache()
+    monkeypatch.setattr(consumer_module, 'process_cache', process_cache)
+    return process_cache
+
+
+@pytest.fixture
+def make_consumer():
+    consumers = []
+
+    def make(max_tasks=2, max_learn_tasks=1, free_resources=True):
+        consumer = MLTaskConsumer.__new__(MLTaskConsumer)
+        consumer.max_tasks = max_tasks
+        consumer.max_learn_tasks = max_learn_tasks
+        consumer._running = {PREDICT_LANE: 0, LEARN_LANE: 0}
+        consumer._running_condition = threading.Condition()
+        consumer._executor = ThreadPoolExecutor(max_tasks)
+        consumer.db = FakeDB()
+        consumer.cache = FakeCache()
+        consumer.consumer_group = SimpleNamespace(streams=defaultdict(FakeStream))
+        # statuses are published on change, periodic updates are not started
+        consumer.status_notifier = StatusNotifier(consumer.db, consumer.cache)
+        consumer.has_free_resources = lambda: free_resources
+        consumers.append(consumer)
+        return consumer
+
+    yield make
+    for consumer in consumers:
+        consumer._executor.shutdown(wait=False)
+
+
+class TestMLTaskConsumer:
+
+    def test_limits(self, make_consumer):
+        consumer = make_consumer(max_tasks=3, max_learn_tasks=1)
+        assert consumer._get_free_streams() == {TASKS_PREDICT_STREAM_NAME: 3, TASKS_STREAM_NAME: 1}
+
+        consumer._running[LEARN_LANE] = 1
+        assert consumer._get_free_streams() == {TASKS_PREDICT_STREAM_NAME: 2}
+
+        consumer._running[PREDICT_LANE] = 2
+        assert consumer._get_free_streams() == {}
+
+        # all workers are busy: nothing is read
+        assert consumer._read_messages() == []
+        assert consumer.db.reads == []
+
+    def test_no_free_resources(self, make_consumer):
+        consumer = make_consumer(free_resources=False)
+        assert consumer._get_free_streams() == {TASKS_PREDICT_STREAM_NAME: 2}
+
+        consumer.db.streams[TASKS_STREAM_NAME].append((b'1', make_message(b'learn', ML_TASK_TYPE.LEARN)))
+        assert consumer._read_messages() == []
+        # learn stream is not read
+        assert all(TASKS_STREAM_NAME not in streams for streams, _ in consumer.db.reads)
+
+    def test_predict_first(self, make_consumer):
+        consumer = make_consumer(max_tasks=2)
+        db = consumer.db
+        db.streams[TASKS_STREAM_NAME].append((b'1', make_message(b'learn', ML_TASK_TYPE.LEARN)))
+        for i in range(3):
+            db.streams[TASKS_PREDICT_STREAM_NAME].append((str(i).encode(), make_message(b'predict')))
+
+        # only predict stream is read while it has messages, no more than free workers
+        messages = consumer._read_messages()
+        assert [stream for stream, _, _ in messages] == [TASKS_PREDICT_STREAM_NAME] * 2
+        assert db.reads == [([TASKS_PREDICT_STREAM_NAME], 2)]
+
+        db.streams[TASKS_PREDICT_STREAM_NAME].clear()
+        messages = consumer._read_messages()
+        assert [stream for stream, _, _ in messages] == [TASKS_STREAM_NAME]
+        assert db.reads[-1] == ([TASKS_PREDICT_STREAM_NAME, TASKS_STREAM_NAME], 1)
+
+    def test_statuses(self, make_consumer, process_cache):
+        consumer = make_consumer()
+        notifier = consumer.status_notifier
+
+        consumer._submit(TASKS_PREDICT_STREAM_NAME, b'1', make_message(b'ok'))
+        consumer._submit(TASKS_STREAM_NAME, b'2', make_message(b'fail', ML_TASK_TYPE.LEARN))
+        assert consumer._running == {PREDICT_LANE: 1, LEARN_LANE: 1}
+        assert consumer._get_free_streams() == {}
+
+        ok_key, fail_key = RedisKey(b'ok'), RedisKey(b'fail')
+        assert (ok_key.status, ML_TASK_STATUS.WAITING.value) in consumer.db.published
+
+        wait_for(lambda: len(process_cache.tasks) == 2)
+        # in-flight tasks are updated by notifier
+        assert set(notifier._tasks.keys()) == {b'ok', b'fail'}
+        assert (ok_key.status, ML_TASK_STATUS.PROCESSING.value) in consumer.db.published
+
+        first_task, second_task = process_cache.tasks
+        first_task.set_result(None)
+        second_task.set_exception(Exception('error'))
+
+        wait_for(lambda: sum(consumer._running.values()) == 0)
+
+        assert notifier._tasks == {}
+        statuses = {consumer.cache.data[ok_key.status], consumer.cache.data[fail_key.status]}
+        assert statuses == {ML_TASK_STATUS.COMPLETE.value, ML_TASK_STATUS.ERROR.value}
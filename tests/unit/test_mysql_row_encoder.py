@@ -0,0 +1,49 @@
+import datetime as dt
+
+import pandas as pd
+
+from mindsdb.api.mysql.mysql_proxy.data_types.mysql_packets import ResultsetRowPacket
+from mindsdb.api.mysql.mysql_proxy.utilities.row_encoder import TextRowsEncoder, column_max_length
+
+
+class Session:
+    packet_sequence_number = 250
+
+
+def _encode_by_packets(rows, seq):
+    session = Session()
+    session.packet_sequence_number = seq
+    data = b''
+    for row in rows:
+        data += ResultsetRowPacket(session=session, data=row).accum()
+        session.packet_sequence_number = (session.packet_sequence_number + 1) % 256
+    return data
+
+
+class TestTextRowsEncoder:
+
+    def test_same_as_packets(self):
+        rows = [
+            [1, 1.5, 'a', dt.datetime(2020, 1, 2, 3, 4, 5), None, True],
+            [2, 2.25, 'б' * 300, dt.datetime(2021, 1, 1), 'x', False],
+        ] * 5
+        df = pd.DataFrame(rows)
+        df[4] = df[4].astype(object)
+
+        session = Session()
+        encoder = TextRowsEncoder(session, frame_size=100, chunk_rows=3)
+        frames = list(encoder.iter_frames([df]))
+
+        assert len(frames) > 1
+        assert b''.join(frames) == _encode_by_packets(rows, 250)
+        # sequence number is continued after rows
+        assert session.packet_sequence_number == (250 + len(rows)) % 256
+
+    def test_column_max_length(self):
+        df = pd.DataFrame({
+            'a': [1, 22222, -3],
+            'b': [1.5, 0.25, 100.0],
+            'c': ['x', 'yyyy', None],
+        })
+        for name in df.columns:
+            assert column_max_length(df[name]) == max(len(str(value)) for value in df[name])
@@ -0,0 +1,102 @@
+import datetime as dt
+import struct
+
+import pandas as pd
+import pytest
+
+from mindsdb.api.postgres.postgres_proxy.postgres_packets.postgres_fields import POSTGRES_TYPES
+from mindsdb.api.postgres.postgres_proxy.utilities.result_encoder import (
+    BINARY_FORMAT,
+    TEXT_FORMAT,
+    encode_column,
+    encode_copy_data,
+    encode_copy_rows,
+    encode_data_rows,
+    get_binary_types,
+)
+
+
+class TestPostgresResultEncoder:
+
+    def test_binary_values(self):
+        column = pd.Series([1, None, -5])
+        cells = encode_column(column, POSTGRES_TYPES.LONG, BINARY_FORMAT)
+        assert cells == [
+            struct.pack('!iq', 8, 1),
+            struct.pack('!i', -1),
+            struct.pack('!iq', 8, -5),
+        ]
+
+        column = pd.Series([dt.datetime(2000, 1, 2, 0, 0, 1)])
+        cells = encode_column(column, POSTGRES_TYPES.DATETIME, BINARY_FORMAT)
+        assert cells == [struct.pack('!iq', 8, (24 * 3600 + 1) * 10 ** 6)]
+
+        column = pd.Series([True, False])
+        cells = encode_column(column, POSTGRES_TYPES.BOOL, BINARY_FORMAT)
+        assert cells == [b'\x00\x00\x00\x01\x01', b'\x00\x00\x00\x01\x00']
+
+    def test_binary_types(self):
+        df = pd.DataFrame({
+            'int': [1, 2],
+            'float': [1.5, 2.0],
+            'str': ['a', 'b'],
+            'mixed': [1, 'b'],
+            'int_obj': pd.Series([1, None], dtype=object),
+            'dt': [dt.datetime(2020, 1, 1), dt.datetime(2020, 1, 2)],
+        })
+        declared = [
+            POSTGRES_TYPES.INT,  # is derived from dtype
+            POSTGRES_TYPES.LONG,  # float values are not truncated
+            POSTGRES_TYPES.INT,  # strings are not coerced to null
+            POSTGRES_TYPES.LONG,
+            POSTGRES_TYPES.LONG,
+            POSTGRES_TYPES.VARCHAR,
+        ]
+        assert get_binary_types(df, declared) == [
+            POSTGRES_TYPES.LONG,
+            POSTGRES_TYPES.DOUBLE,
+            POSTGRES_TYPES.VARCHAR,
+            POSTGRES_TYPES.VARCHAR,
+            POSTGRES_TYPES.LONG,
+            POSTGRES_TYPES.DATETIME,
+        ]
+        # no data yet
+        assert get_binary_types(None, declared) == declared
+
+        # values which can't be converted without loss are not encoded
+        with pytest.raises(ValueError):
+            encode_column(df['str'], POSTGRES_TYPES.INT, BINARY_FORMAT)
+        with pytest.raises(ValueError):
+            encode_column(df['float'], POSTGRES_TYPES.LONG, BINARY_FORMAT)
+        with pytest.raises(ValueError):
+            encode_column(pd.Series([2 ** 40]), POSTGRES_TYPES.INT, BINARY_FORMAT)
+
+        cells = encode_column(df['str'], POSTGRES_TYPES.VARCHAR, BINARY_FORMAT)
+        assert cells == [struct.pack('!i', 1) + b'a', struct.pack('!i', 1) + b'b']
+
+    def test_data_rows(self):
+        df = pd.DataFrame([[1, 'a'], [2, None]])
+        data = encode_data_rows(df, [POSTGRES_TYPES.INT, POSTGRES_TYPES.VARCHAR], [BINARY_FORMAT, TEXT_FORMAT])
+
+        row1 = struct.pack('!h', 2) + struct.pack('!ii', 4, 1) + struct.pack('!i', 1) + b'a'
+        row2 = struct.pack('!h', 2) + struct.pack('!ii', 4, 2) + struct.pack('!i', -1)
+        assert data == (
+            b'D' + struct.pack('!i', 4 + len(row1)) + row1
+            + b'D' + struct.pack('!i', 4 + len(row2)) + row2
+        )
+
+    def test_copy(self):
+        df = pd.DataFrame([[1, 'a,b'], [2, None], [3, 'x\ty']])
+        pg_types = [POSTGRES_TYPES.LONG, POSTGRES_TYPES.VARCHAR]
+
+        assert encode_copy_rows(df, 'csv', pg_types) == [b'1,"a,b"\n', b'2,\n', b'3,x\ty\n']
+        assert encode_copy_rows(df, 'text', pg_types) == [b'1\ta,b\n', b'2\t\\N\n', b'3\tx\\ty\n']
+
+        rows = encode_copy_rows(df.iloc[:2], 'binary', pg_types)
+        assert rows == [
+            struct.pack('!h', 2) + struct.pack('!iq', 8, 1) + struct.pack('!i', 3) + b'a,b',
+            struct.pack('!h', 2) + struct.pack('!iq', 8, 2) + struct.pack('!i', -1),
+        ]
+
+        data = encode_copy_data([b'1\n', b'22\n'])
+        assert data == b'd' + struct.pack('!i', 6) + b'1\n' + b'd' + struct.pack('!i', 7) + b'22\n'
@@ -0,0 +1,81 @@
+import threading
+
+import pandas as pd
+
+from mindsdb.integrations.libs.predict_batcher import PredictBatcher
+
+
+def run_concurrently(batcher, predict_fn, count, window=0.5, max_rows=1000):
+    results = [None] * count
+    barrier = threading.Barrier(count)
+
+    def request(i):
+        df = pd.DataFrame({'x': [i, i + 100]})
+        barrier.wait()
+        results[i] = batcher.predict('model', df, predict_fn, window=window, max_rows=max_rows)
+
+    threads = [threading.Thread(target=request, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+class TestPredictBatcher:
+
+    def test_batching(self):
+        calls = []
+
+        def predict_fn(df):
+            calls.append(len(df))
+            return pd.DataFrame({'y': df['x'] * 2})
+
+        results = run_concurrently(PredictBatcher(), predict_fn, 10)
+
+        assert len(calls) < 10
+        assert sum(calls) == 20
+        for i, predictions in enumerate(results):
+            assert list(predictions['y']) == [i * 2, (i + 100) * 2]
+
+    def test_max_rows(self):
+        calls = []
+
+        def predict_fn(df):
+            calls.append(len(df))
+            return pd.DataFrame({'y': df['x'] * 2})
+
+        run_concurrently(PredictBatcher(), predict_fn, 10, max_rows=4)
+
+        assert sum(calls) == 20
+        assert max(calls) <= 4
+
+    def test_rows_mismatch(self):
+        def predict_fn(df):
+            # one prediction for any input
+            return pd.DataFrame({'y': [df['x'].sum()]})
+
+        results = run_concurrently(PredictBatcher(), predict_fn, 5)
+
+        for i, predictions in enumerate(results):
+            assert list(predictions['y']) == [i * 2 + 100]
+
+    def test_error(self):
+        def predict_fn(df):
+            raise ValueError('predict error')
+
+        errors = []
+        batcher = PredictBatcher()
+
+        def request():
+            try:
+                batcher.predict('model', pd.DataFrame({'x': [1]}), predict_fn, window=0.2, max_rows=100)
+            except ValueError as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=request) for _ in range(3)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert len(errors) == 3
@@ -0,0 +1,82 @@
+import threading
+from concurrent.futures import Future
+
+import pytest
+
+from mindsdb.integrations.libs import process_cache as process_cache_module
+from mindsdb.integrations.libs.process_cache import ProcessCache
+from mindsdb.utilities.ml_task_queue.const import ML_TASK_TYPE
+
+
+class FakeProcess:
+    def __init__(self, *args, **kwargs):
+        self.task = None
+        self.last_usage_at = 0
+        self.markers = set()
+
+    def ready(self):
+        return self.task is None or self.task.done()
+
+    def has_marker(self, marker):
+        return marker in self.markers
+
+    def set_markers(self, markers):
+        self.markers = set(markers)
+
+    def apply_async(self, *args, **kwargs):
+        self.task = Future()
+        return self.task
+
+    def shutdown(self):
+        pass
+
+
+def make_payload():
+    return {
+        'handler_meta': {'module_path': 'handler', 'engine': 'engine', 'integration_id': 1},
+        'context': {'company_id': None},
+        'name': 'func',
+        'args': {},
+    }
+
+
+@pytest.fixture
+def cache(monkeypatch):
+    monkeypatch.setattr(process_cache_module, 'WarmProcess', FakeProcess)
+    monkeypatch.setattr(process_cache_module, 'get_residency_config', lambda: {'affinity_wait': 0})
+    monkeypatch.setattr(process_cache_module, 'get_pool_config', lambda engine: {
+        'min_size': 0, 'max_size': 1, 'max_queue': 1, 'queue_timeout': 5, 'max_process_memory': None
+    })
+    cache = ProcessCache()
+    yield cache
+    cache._stop_clean()
+
+
+class TestProcessCache:
+
+    def test_queue(self, cache):
+        first = cache.apply_async(ML_TASK_TYPE.FUNC_CALL, None, make_payload())
+        process = cache.cache['engine']['processes'][0]
+
+        results = []
+        thread = threading.Thread(
+            target=lambda: results.append(cache.apply_async(ML_TASK_TYPE.FUNC_CALL, None, make_payload()))
+        )
+        thread.start()
+        thread.join(0.5)
+        # the second task waits for the process
+        assert thread.is_alive()
+        assert len(cache.cache['engine']['processes']) == 1
+
+        # queue is full
+        with pytest.raises(Exception, match='waiting'):
+            cache.apply_async(ML_TASK_TYPE.FUNC_CALL, None, make_payload())
+
+        process.task.set_result(('result', [1]))
+        assert first.result() == 'result'
+        assert process.has_marker(1)
+
+        thread.join(5)
+        assert len(results) == 1
+        process.task.set_result(('second', []))
+        assert results[0].result() == 'second'